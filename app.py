@@ -1,13 +1,15 @@
+import os
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
+from datetime import datetime, date, time, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+from data.fetch_all import fetch_all
 from data.fetch_prices import get_stock_data
 from data.fetch_news import get_news_sentiment
 from data.fetch_reddit import get_reddit_sentiment
@@ -15,6 +17,7 @@ from models.sentiment_aggregator import aggregate_sentiment
 from models.signal_generator import generate_signal
 from models.backtest import run_backtest
 from utils.metrics import compute_metrics
+from utils.perf import trace, stage, peak_rss_mb
 
 st.set_page_config(
     page_title="SentimentEdge",
@@ -23,6 +26,26 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# ─── CACHE ────────────────────────────────────────────────────────────────────
+# Collecte mémorisée pour tout le process (toutes sessions), par (ticker,
+# début, fin) : changer le seuil ne relance que agrégation, signal, backtest
+# et métriques. Durée de vie propre à chaque source, en secondes.
+# L'agrégation (quelques ms) n'est pas mise en cache : recalculée à chaque
+# run, elle suit toujours les données servies par les caches ci-dessous.
+CACHE_TTL = {
+    'prices': int(os.getenv("CACHE_TTL_PRICES", "3600")),
+    'news': int(os.getenv("CACHE_TTL_NEWS", "1800")),
+    'reddit': int(os.getenv("CACHE_TTL_REDDIT", "900")),
+}
+
+# Appelées depuis les threads de fetch_all : pas de spinner (hors contexte Streamlit)
+CACHED_FETCHERS = {
+    'prices': st.cache_data(ttl=CACHE_TTL['prices'], max_entries=64, show_spinner=False)(get_stock_data),
+    'news': st.cache_data(ttl=CACHE_TTL['news'], max_entries=64, show_spinner=False)(get_news_sentiment),
+    'reddit': st.cache_data(ttl=CACHE_TTL['reddit'], max_entries=64, show_spinner=False)(get_reddit_sentiment),
+}
+
+
 # ─── STYLES ───────────────────────────────────────────────────────────────────
 st.markdown("""
 <style>
@@ -149,6 +172,10 @@ with st.sidebar:
 
     st.divider()
     run = st.button("⚡ Analyser", use_container_width=True)
+    if run:
+        # Paramètres de collecte figés au clic ; le seuil reste modifiable ensuite
+        st.session_state['analysis'] = dict(ticker=ticker, lookback=lookback,
+                                            use_news=use_news, use_reddit=use_reddit)
 
     st.markdown("""
     <div style='margin-top: 32px; font-size: 11px; color: #6b7280; line-height: 1.8;'>
@@ -159,6 +186,11 @@ with st.sidebar:
     </div>
     """, unsafe_allow_html=True)
 
+analysis = st.session_state.get('analysis')
+if analysis:
+    ticker, lookback = analysis['ticker'], analysis['lookback']
+    use_news, use_reddit = analysis['use_news'], analysis['use_reddit']
+
 # ─── HEADER ───────────────────────────────────────────────────────────────────
 col_title, col_badge = st.columns([3, 1])
 with col_title:
@@ -170,25 +202,35 @@ with col_badge:
 st.divider()
 
 # ─── MAIN LOGIC ───────────────────────────────────────────────────────────────
-if run:
-    with st.spinner("Récupération des données..."):
-        end_date = datetime.today()
-        start_date = end_date - timedelta(days=lookback)
-
-        prices_df = get_stock_data(ticker, start_date, end_date)
-
-        news_df = pd.DataFrame()
-        reddit_df = pd.DataFrame()
-
-        if use_news:
-            news_df = get_news_sentiment(ticker, start_date, end_date)
-        if use_reddit:
-            reddit_df = get_reddit_sentiment(ticker, start_date, end_date)
-
-        sentiment_df = aggregate_sentiment(news_df, reddit_df, prices_df)
-        signal_df = generate_signal(sentiment_df, threshold=signal_threshold)
-        backtest_df, perf = run_backtest(signal_df, prices_df)
-        metrics = compute_metrics(backtest_df)
+if analysis:
+    with st.spinner("Récupération des données..."), \
+            trace(ticker=ticker, lookback=lookback, threshold=signal_threshold) as run_trace:
+        # Fenêtre en jours entiers : la clé de cache reste stable dans la journée
+        today = date.today()
+        end_date = datetime.combine(today, time.max)
+        start_date = datetime.combine(today - timedelta(days=lookback), time.min)
+
+        # Prix, news et Reddit sont récupérés en parallèle
+        with stage("fetch") as record:
+            prices_df, news_df, reddit_df, fetch_errors = fetch_all(
+                ticker, start_date, end_date, use_news=use_news, use_reddit=use_reddit,
+                fetchers=CACHED_FETCHERS
+            )
+            if fetch_errors:
+                record['degraded'] = sorted(fetch_errors)
+        for source, err in fetch_errors.items():
+            st.warning(f"Source {source} indisponible ({err}) — analyse poursuivie sans elle.")
+
+        with stage("aggregate", days=len(prices_df)):
+            sentiment_df = aggregate_sentiment(news_df, reddit_df, prices_df)
+        with stage("signal"):
+            signal_df = generate_signal(sentiment_df, threshold=signal_threshold)
+        with stage("backtest"):
+            backtest_df, perf = run_backtest(signal_df, prices_df)
+        with stage("metrics"):
+            metrics = compute_metrics(backtest_df)
+    total_seconds = run_trace.elapsed
+    run_trace.emit()
 
     # ── Signal du jour ────────────────────────────────────────────────────────
     latest = signal_df.iloc[-1]
@@ -361,6 +403,28 @@ if run:
                 <div class="metric-value {color}" style="font-size:20px;">{value}</div>
             </div>""", unsafe_allow_html=True)
 
+    # ── Performance du pipeline ───────────────────────────────────────────────
+    with st.expander("Performance"):
+        records = run_trace.to_records()
+        fixed = {'run_id', 'stage', 'start', 'seconds', 'peak_rss_mb', *run_trace.meta}
+        perf_df = pd.DataFrame({
+            'Étape': [r['stage'] for r in records],
+            'Début (s)': [r['start'] for r in records],
+            'Durée (ms)': [r['seconds'] * 1e3 for r in records],
+            'Détails': [", ".join(f"{k}={v}" for k, v in r.items() if k not in fixed) for r in records],
+            'Pic mémoire (Mo)': [r['peak_rss_mb'] for r in records],
+        })
+        rss = peak_rss_mb()
+        st.caption(f"Analyse {run_trace.run_id} · {total_seconds:.2f} s au total"
+                   + (f" · pic mémoire du process {rss:.0f} Mo" if rss else ""))
+        st.dataframe(perf_df, use_container_width=True, hide_index=True,
+                     column_config={'Début (s)': st.column_config.NumberColumn(format="%.3f"),
+                                    'Durée (ms)': st.column_config.NumberColumn(format="%.1f"),
+                                    'Pic mémoire (Mo)': st.column_config.NumberColumn(format="%.0f")})
+        st.download_button("Exporter (JSONL)", run_trace.to_jsonl(),
+                           file_name=f"perf_{ticker}_{run_trace.run_id}.jsonl",
+                           mime="application/x-ndjson")
+
 else:
     # ── Landing state ─────────────────────────────────────────────────────────
     st.markdown("""
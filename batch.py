@@ -0,0 +1,183 @@
+"""
+Analyse en lot d'une watchlist, sans interface (runs nocturnes).
+
+    python batch.py AAPL MSFT NVDA --start 2024-01-01 --end 2024-12-31 -o results.parquet
+    python batch.py --tickers-file watchlist.txt --lookback 90 --threshold 0.4 -o results.csv
+
+Pour chaque ticker : prix + news + Reddit (fetch_all) → aggregate_sentiment →
+generate_signal → run_backtest → compute_metrics. Les tickers sont répartis
+sur un pool de threads (collecte surtout I/O ; le scoring FinBERT reste
+partagé, cf. SENTIMENT_WORKERS pour le répartir sur plusieurs process), ou
+de process avec --processes quand le calcul domine (données en cache ou
+simulées ; chaque process charge alors son propre FinBERT).
+Une ligne par ticker dans la table de sortie (Parquet ou CSV selon
+l'extension), y compris les tickers en échec (colonne error).
+
+N'importe ni streamlit ni plotly : démarrage rapide.
+"""
+import argparse
+import sys
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import pandas as pd
+
+from data.fetch_all import fetch_all
+from models.sentiment_aggregator import aggregate_sentiment
+from models.signal_generator import generate_signal
+from models.backtest import run_backtest
+from utils.metrics import compute_metrics
+from utils.perf import trace, stage
+
+
+def analyse_ticker(ticker: str, start_date: datetime, end_date: datetime, params: Dict) -> Dict:
+    """Pipeline complet pour un ticker ; les erreurs sont retournées, pas relevées."""
+    row = {'ticker': ticker, 'start': start_date.date(), 'end': end_date.date()}
+    with trace(ticker=ticker) as run_trace:
+        try:
+            with stage("fetch"):
+                prices_df, news_df, reddit_df, fetch_errors = fetch_all(
+                    ticker, start_date, end_date,
+                    use_news=params['use_news'], use_reddit=params['use_reddit']
+                )
+            with stage("aggregate"):
+                sentiment_df = aggregate_sentiment(news_df, reddit_df, prices_df,
+                                                   news_weight=params['news_weight'],
+                                                   reddit_weight=params['reddit_weight'])
+            with stage("signal"):
+                signal_df = generate_signal(sentiment_df, threshold=params['threshold'],
+                                            ma_window=params['ma_window'],
+                                            use_momentum=params['use_momentum'])
+            with stage("backtest"):
+                backtest_df, perf = run_backtest(signal_df, prices_df,
+                                                 transaction_cost=params['transaction_cost'])
+            with stage("metrics"):
+                metrics = compute_metrics(backtest_df, risk_free_rate=params['risk_free_rate'])
+
+            latest = signal_df.iloc[-1]
+            row.update({
+                'bars': len(prices_df),
+                'news_days': len(news_df),
+                'reddit_days': len(reddit_df),
+                'degraded': ",".join(sorted(fetch_errors)),
+                'last_close': float(prices_df['Close'].iloc[-1]),
+                'last_sentiment': float(latest['sentiment_score']),
+                'last_signal': latest['signal'],
+                'total_return_bh': perf['total_return_bh'],
+                **metrics,
+                'error': "",
+            })
+        except Exception as e:
+            row['error'] = f"{type(e).__name__}: {e}"
+    row['seconds'] = round(run_trace.elapsed, 3)
+    run_trace.emit()
+    return row
+
+
+def run_batch(tickers: List[str], start_date: datetime, end_date: datetime, params: Dict,
+              workers: int = 8, processes: bool = False, verbose: bool = True) -> pd.DataFrame:
+    """Analyse tous les tickers en parallèle ; une ligne par ticker, dans l'ordre d'entrée."""
+    if processes:
+        # spawn : pas de fork d'un process ayant déjà des threads (cf. sentiment_pool)
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"))
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch")
+
+    rows = {}
+    with executor:
+        futures = {executor.submit(analyse_ticker, t, start_date, end_date, params): t
+                   for t in tickers}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                row = future.result()
+            except Exception as e:
+                # Worker mort (BrokenProcessPool : OOM, crash de torch) : ligne en échec,
+                # les lignes déjà calculées et les autres tickers sont conservés
+                row = {'ticker': futures[future], 'start': start_date.date(), 'end': end_date.date(),
+                       'error': f"{type(e).__name__}: {e}", 'seconds': 0.0}
+            rows[row['ticker']] = row
+            if verbose:
+                status = row['error'] or f"{row['last_signal']} · sharpe {row['sharpe']:.2f}"
+                print(f"[{done}/{len(tickers)}] {row['ticker']:<6} {row['seconds']:6.1f}s  {status}")
+    return pd.DataFrame([rows[t] for t in tickers])
+
+
+def write_table(df: pd.DataFrame, path: str):
+    if path.endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    elif path.endswith(".csv"):
+        df.to_csv(path, index=False)
+    else:
+        raise ValueError(f"Format de sortie inconnu : {path!r} (.parquet ou .csv)")
+
+
+def _read_tickers(args) -> List[str]:
+    tickers = list(args.tickers)
+    if args.tickers_file:
+        with open(args.tickers_file) as f:
+            tickers += [line.split("#")[0].strip() for line in f]
+    # Dédoublonnage en conservant l'ordre
+    return list(dict.fromkeys(t.upper() for t in tickers if t))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("tickers", nargs="*", help="tickers à analyser")
+    parser.add_argument("--tickers-file", help="un ticker par ligne (# pour commenter)")
+    parser.add_argument("--start", help="date de début AAAA-MM-JJ (défaut : fin - lookback)")
+    parser.add_argument("--end", help="date de fin AAAA-MM-JJ (défaut : aujourd'hui)")
+    parser.add_argument("--lookback", type=int, default=90, help="jours si --start absent")
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--ma-window", type=int, default=7)
+    parser.add_argument("--no-momentum", action="store_true")
+    parser.add_argument("--transaction-cost", type=float, default=0.001)
+    parser.add_argument("--risk-free-rate", type=float, default=0.05)
+    parser.add_argument("--news-weight", type=float, default=0.6)
+    parser.add_argument("--reddit-weight", type=float, default=0.4)
+    parser.add_argument("--no-news", action="store_true")
+    parser.add_argument("--no-reddit", action="store_true")
+    parser.add_argument("--workers", type=int, default=8, help="tickers traités en parallèle")
+    parser.add_argument("--processes", action="store_true",
+                        help="pool de process plutôt que de threads (calcul intensif)")
+    parser.add_argument("-o", "--output", required=True, help="table de sortie .parquet ou .csv")
+    parser.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    tickers = _read_tickers(args)
+    if not tickers:
+        parser.error("aucun ticker (arguments ou --tickers-file)")
+
+    end_date = datetime.combine(pd.Timestamp(args.end or datetime.today()).date(), datetime.max.time())
+    start_date = (datetime.combine(pd.Timestamp(args.start).date(), datetime.min.time()) if args.start
+                  else datetime.combine(end_date.date() - timedelta(days=args.lookback),
+                                        datetime.min.time()))
+    params = {
+        'threshold': args.threshold,
+        'ma_window': args.ma_window,
+        'use_momentum': not args.no_momentum,
+        'transaction_cost': args.transaction_cost,
+        'risk_free_rate': args.risk_free_rate,
+        'news_weight': args.news_weight,
+        'reddit_weight': args.reddit_weight,
+        'use_news': not args.no_news,
+        'use_reddit': not args.no_reddit,
+    }
+
+    t0 = time.perf_counter()
+    results = run_batch(tickers, start_date, end_date, params, workers=args.workers,
+                        processes=args.processes, verbose=not args.quiet)
+    write_table(results, args.output)
+
+    failed = results[results['error'] != ""]
+    print(f"{len(results) - len(failed)}/{len(results)} ticker(s) analysé(s) en "
+          f"{time.perf_counter() - t0:.1f}s → {args.output}")
+    for _, row in failed.iterrows():
+        print(f"  échec {row['ticker']} : {row['error']}")
+    return 1 if len(failed) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Équivalence et benchmark du moteur de positions vectorisé de run_backtest().
+
+    python -m benchmarks.bench_backtest
+"""
+import time
+import numpy as np
+import pandas as pd
+
+from models.backtest import run_backtest
+
+
+def _legacy_run_backtest(signal_df, prices_df, transaction_cost=0.001, initial_capital=10_000.0):
+    """Implémentation d'origine (boucle Python + écriture .loc ligne à ligne)."""
+    common_idx = signal_df.index.intersection(prices_df.index)
+    sig = signal_df.loc[common_idx, 'signal']
+    prices = prices_df.loc[common_idx, 'Close']
+    daily_ret = prices.pct_change().fillna(0)
+
+    position = pd.Series(0, index=common_idx)
+    in_position = False
+    for date, signal in sig.items():
+        if signal == 'BUY' and not in_position:
+            in_position = True
+        elif signal == 'SELL' and in_position:
+            in_position = False
+        position.loc[date] = 1 if in_position else 0
+
+    position_shifted = position.shift(1).fillna(0)
+    trades = position_shifted.diff().abs()
+    strategy_ret = position_shifted * daily_ret - trades * transaction_cost
+    cumret_strategy = (1 + strategy_ret).cumprod() - 1
+    cumret_bh = (1 + daily_ret).cumprod() - 1
+    backtest_df = pd.DataFrame({
+        'position': position_shifted,
+        'daily_ret_bh': daily_ret,
+        'daily_ret_strategy': strategy_ret,
+        'cumret_strategy': cumret_strategy,
+        'cumret_bh': cumret_bh,
+        'portfolio_value': initial_capital * (1 + cumret_strategy)
+    })
+    perf = {
+        'total_return_strategy': float(cumret_strategy.iloc[-1]),
+        'total_return_bh': float(cumret_bh.iloc[-1]),
+        'nb_trades': int(trades.sum()),
+    }
+    return backtest_df, perf
+
+
+def make_inputs(n_days: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range("2000-01-03", periods=n_days)
+    signals = rng.choice(['BUY', 'SELL', 'HOLD'], size=n_days, p=[0.05, 0.05, 0.9])
+    signal_df = pd.DataFrame({'signal': signals}, index=idx)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_days)))
+    prices_df = pd.DataFrame({'Close': close}, index=idx)
+    return signal_df, prices_df
+
+
+def check_equivalence(sizes=(1, 2, 10, 252, 2520), seeds=range(5)):
+    for n in sizes:
+        for seed in seeds:
+            signal_df, prices_df = make_inputs(n, seed)
+            new_df, new_perf = run_backtest(signal_df, prices_df)
+            old_df, old_perf = _legacy_run_backtest(signal_df, prices_df)
+            pd.testing.assert_frame_equal(new_df, old_df, check_exact=True)
+            assert pd.Series(new_perf).equals(pd.Series(old_perf)), (n, seed)
+
+
+def _time(fn, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    check_equivalence()
+    print("équivalence OK (sorties identiques à l'implémentation d'origine)")
+
+    for n_days in (252, 2520, 12600):
+        signal_df, prices_df = make_inputs(n_days)
+        t_new = _time(run_backtest, signal_df, prices_df)
+        t_old = _time(_legacy_run_backtest, signal_df, prices_df, repeat=1)
+        print(f"{n_days:>6} barres : origine {t_old * 1e3:8.1f} ms | "
+              f"vectorisé {t_new * 1e3:6.1f} ms | x{t_old / t_new:.0f}")
+
+
+if __name__ == "__main__":
+    main()
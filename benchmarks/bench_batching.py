@@ -0,0 +1,117 @@
+"""
+Batching par longueur sous budget de tokens (models/sentiment_backends.py)
+contre des batchs de taille fixe, sur un mélange titres de news / posts Reddit.
+
+    python -m benchmarks.bench_batching              # BERT réduit, poids aléatoires
+    python -m benchmarks.bench_batching --full       # dimensions de FinBERT (BERT-base)
+    python -m benchmarks.bench_batching --model ProsusAI/finbert
+
+Sans --model, le modèle est construit localement (aucun téléchargement) : les
+scores n'ont pas de sens, seul le coût de calcul et l'ordre des sorties comptent.
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+
+from models.sentiment_backends import TorchBackend, MAX_LENGTH, TOKEN_BUDGET, plan_batches
+
+WORDS = ("apple tesla nvidia shares stock earnings revenue guidance beat miss estimates "
+         "quarter growth margin buy sell calls puts moon crash dip rally bullish bearish "
+         "analyst upgrade downgrade fed rates inflation dividend buyback iphone chips ai "
+         "demand supply cloud ads china tariffs lawsuit ceo holding position yolo hedge").split()
+
+
+def build_model(path: str, full: bool = False):
+    """BERT à 3 classes (positive / negative / neutral) et tokenizer WordPiece locaux."""
+    import torch
+    from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + WORDS
+    vocab += list("abcdefghijklmnopqrstuvwxyz0123456789.,!?$%'-")
+    vocab += [f"##{c}" for c in "abcdefghijklmnopqrstuvwxyz0123456789"]
+    with open(os.path.join(path, "vocab.txt"), "w") as f:
+        f.write("\n".join(vocab))
+    BertTokenizerFast(os.path.join(path, "vocab.txt"), model_max_length=MAX_LENGTH).save_pretrained(path)
+
+    size = dict(hidden_size=768, num_hidden_layers=12, num_attention_heads=12,
+                intermediate_size=3072) if full else \
+        dict(hidden_size=256, num_hidden_layers=4, num_attention_heads=4, intermediate_size=1024)
+    config = BertConfig(vocab_size=len(vocab), num_labels=3, max_position_embeddings=MAX_LENGTH,
+                        id2label={0: "positive", 1: "negative", 2: "neutral"},
+                        label2id={"positive": 0, "negative": 1, "neutral": 2}, **size)
+    torch.manual_seed(0)
+    BertForSequenceClassification(config).save_pretrained(path)
+
+
+def make_texts(n: int, reddit_share: float = 0.3, seed: int = 0):
+    """Titres courts (10-20 mots) et posts avec selftext (80-600 mots), mélangés."""
+    rng = np.random.default_rng(seed)
+    texts = []
+    for _ in range(n):
+        words = rng.integers(80, 600) if rng.random() < reddit_share else rng.integers(10, 20)
+        texts.append(" ".join(rng.choice(WORDS, size=words)))
+    return texts
+
+
+def fixed_batches(backend, texts, batch_size: int = 16):
+    """Référence : batchs de batch_size textes dans l'ordre d'arrivée, paddés au plus long."""
+    out, padded = [], 0
+    for start in range(0, len(texts), batch_size):
+        encoded = backend.tokenizer(texts[start:start + batch_size], padding=True, truncation=True,
+                                    max_length=backend.max_length, return_tensors="np")
+        padded += encoded['input_ids'].size
+        out.append(backend.logits(dict(encoded)))
+    return np.concatenate(out), padded
+
+
+def bucketed(backend, texts, batch_size: int, token_budget: int):
+    results = backend(texts, batch_size=batch_size, token_budget=token_budget)
+    return np.array([[r['score'] for r in row] for row in results])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--texts", type=int, default=256)
+    parser.add_argument("--reddit-share", type=float, default=0.3)
+    parser.add_argument("--full", action="store_true", help="dimensions BERT-base (plus lent)")
+    parser.add_argument("--model", help="modèle HuggingFace à utiliser au lieu du modèle local")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--token-budget", type=int, default=TOKEN_BUDGET)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.model:
+            build_model(tmp, full=args.full)
+        backend = TorchBackend(args.model or tmp, "main")
+    texts = make_texts(args.texts, args.reddit_share)
+    lengths = [len(ids) for ids in backend.encode(texts)['input_ids']]
+    batches = plan_batches(lengths, args.token_budget, args.batch_size)
+    print(f"{len(texts)} textes ({args.reddit_share:.0%} de posts longs), "
+          f"{sum(lengths):,} tokens utiles, {len(batches)} batchs par longueur")
+
+    backend(texts[:8])  # préchauffage
+    t0 = time.perf_counter()
+    ref_logits, padded_fixed = fixed_batches(backend, texts)
+    t_fixed = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    probs = bucketed(backend, texts, args.batch_size, args.token_budget)
+    t_bucketed = time.perf_counter() - t0
+
+    # Mêmes sorties, dans l'ordre d'entrée (le padding masqué ne change que l'arrondi)
+    ref = np.exp(ref_logits - ref_logits.max(axis=1, keepdims=True))
+    ref /= ref.sum(axis=1, keepdims=True)
+    drift = float(np.abs(probs - ref).max())
+    assert drift < 1e-4, f"écart de probabilité {drift:.2e}"
+
+    padded_bucketed = sum(len(b) * lengths[b[-1]] for b in batches)
+    print(f"  batchs fixes de 16 : {t_fixed:6.2f} s  {len(texts) / t_fixed:7.1f} textes/s  "
+          f"{padded_fixed:>9,} tokens paddés")
+    print(f"  par longueur       : {t_bucketed:6.2f} s  {len(texts) / t_bucketed:7.1f} textes/s  "
+          f"{padded_bucketed:>9,} tokens paddés  (x{t_fixed / t_bucketed:.1f}, "
+          f"écart max {drift:.1e})")
+
+
+if __name__ == "__main__":
+    main()
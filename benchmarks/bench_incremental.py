@@ -0,0 +1,103 @@
+"""
+Équivalence et benchmark du moteur incrémental (models/incremental.py)
+par rapport au recalcul complet aggregate_sentiment → generate_signal.
+
+    python -m benchmarks.bench_incremental
+"""
+import json
+import time
+import numpy as np
+import pandas as pd
+
+from data.synthetic import simulate_news, simulate_reddit_posts, simulate_prices
+from data.fetch_news import aggregate_daily as aggregate_news
+from data.fetch_reddit import aggregate_daily as aggregate_reddit
+from models.sentiment_aggregator import aggregate_sentiment
+from models.signal_generator import generate_signal
+from models.incremental import IncrementalEngine
+
+
+def make_inputs(start: str, end: str, ticker: str = "AAPL", seed: int = 5):
+    """News avec trous (report limité à 3 jours), posts de week-end, jours fériés."""
+    rng = np.random.default_rng(seed)
+    prices = simulate_prices(ticker, start, end)
+    prices = prices[rng.random(len(prices)) > 0.03]  # jours fériés : hors calendrier
+
+    news = simulate_news(ticker, start, end).set_index("date")
+    news = news[rng.random(len(news)) > 0.4]         # jours sans article
+
+    posts = simulate_reddit_posts(ticker, start, end).set_index("date")
+    weekend = posts.sample(frac=0.05, random_state=seed)
+    weekend.index = weekend.index + pd.to_timedelta(5 - weekend.index.dayofweek, unit="D")  # samedi
+    posts = pd.concat([posts, weekend]).sort_index()
+    return prices, news, posts
+
+
+def batch(prices, news, posts, threshold):
+    sentiment = aggregate_sentiment(aggregate_news(news), aggregate_reddit(posts), prices)
+    signals = generate_signal(sentiment, threshold=threshold)
+    signals['mention_count'] = sentiment['mention_count']
+    return signals
+
+
+def incremental(prices, news, posts, threshold, chunks: int = 3, checkpoint_every: int = 50):
+    """Rejoue les éléments jour par jour, en plusieurs arrivées, avec reprises JSON."""
+    engine = IncrementalEngine(threshold=threshold)
+    days = prices.index
+    # Éléments arrivant pendant le jour de bourse d (datés entre la veille exclue et d)
+    news_slot = days.searchsorted(news.index.normalize())
+    posts_slot = days.searchsorted(posts.index.normalize())
+
+    rows = []
+    for i, day in enumerate(days):
+        n_day, p_day = news[news_slot == i], posts[posts_slot == i]
+        for k in range(chunks):
+            engine.update(day, news=n_day.iloc[k::chunks], posts=p_day.iloc[k::chunks])
+        if i % checkpoint_every == 0:
+            engine = IncrementalEngine.from_dict(json.loads(json.dumps(engine.to_dict())))
+        rows.append(engine.close_day(day))
+    return pd.DataFrame(rows).set_index('date')
+
+
+def check_equivalence():
+    prices, news, posts = make_inputs("2022-01-01", "2024-12-31")
+    for threshold in (0.05, 0.1, 0.6):
+        ref = batch(prices, news, posts, threshold)
+        out = incremental(prices, news, posts, threshold)
+        assert out.index.equals(ref.index)
+        for col in ('sentiment_score', 'sentiment_ma', 'sentiment_zscore'):
+            a, b = out[col].to_numpy(dtype=float), ref[col].to_numpy(dtype=float)
+            assert (np.isnan(a) == np.isnan(b)).all(), col
+            assert np.allclose(a, b, rtol=0, atol=1e-12, equal_nan=True), (col, np.nanmax(np.abs(a - b)))
+        assert (out['signal'].to_numpy() == ref['signal'].to_numpy()).all()
+        assert (out['mention_count'].to_numpy() == ref['mention_count'].to_numpy()).all()
+
+
+def main():
+    check_equivalence()
+    print("équivalence OK (incrémental = recalcul complet, 3 seuils, reprises JSON)")
+
+    # Coût d'un rafraîchissement : recalcul complet vs mise à jour du jour courant
+    prices, news, posts = make_inputs("2015-01-01", "2024-12-31")
+    t0 = time.perf_counter()
+    for _ in range(10):
+        batch(prices, news, posts, 0.1)
+    t_batch = (time.perf_counter() - t0) / 10
+
+    engine = IncrementalEngine(threshold=0.1)
+    for day in prices.index[:-1]:
+        engine.close_day(day)
+    last = prices.index[-1]
+    chunk_news, chunk_posts = news.iloc[-1:], posts.iloc[-8:]
+    t0 = time.perf_counter()
+    for _ in range(200):
+        engine.update(last, news=chunk_news, posts=chunk_posts)
+    t_inc = (time.perf_counter() - t0) / 200
+
+    print(f"10 ans ({len(prices)} jours, {len(posts):,} posts) : recalcul complet "
+          f"{t_batch * 1e3:.1f} ms | mise à jour incrémentale {t_inc * 1e3:.2f} ms "
+          f"| x{t_batch / t_inc:.0f}")
+
+
+if __name__ == "__main__":
+    main()
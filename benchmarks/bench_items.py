@@ -0,0 +1,125 @@
+"""
+Mémoire de la table compacte (data/items.py) contre les listes de dicts puis
+DataFrames d'origine, sur un backfill de posts Reddit scorés pour un univers
+de tickers, et temps de l'agrégation journalière sur chaque représentation.
+
+    python -m benchmarks.bench_items
+    python -m benchmarks.bench_items --posts 3000000
+
+Chaque représentation est construite dans un process neuf : mémoire retenue
+(DataFrame.memory_usage(deep=True), table.nbytes) et pic RSS du process
+pendant la construction, au-dessus de l'état après imports. tracemalloc ne
+voit pas les chaînes Arrow de pandas 3, d'où ces deux mesures.
+"""
+import argparse
+import multiprocessing as mp
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from data.fetch_reddit import aggregate_daily
+from data.items import ItemTable
+from utils.perf import peak_rss_mb
+
+WORDS = ("shares stock earnings revenue guidance beat miss calls puts moon crash dip rally "
+         "bullish bearish analyst upgrade downgrade fed rates dividend buyback chips ai").split()
+SUBREDDITS = ("wallstreetbets", "stocks", "investing")
+CHUNK = 5_000  # posts par ticker et par appel, comme un fetch
+
+
+def make_chunks(n_posts: int, n_tickers: int, seed: int = 0):
+    """Posts bruts par ticker : (ticker, dates, titres, scores, upvotes, commentaires, subreddits)."""
+    rng = np.random.default_rng(seed)
+    start = datetime(2023, 1, 2)
+    words = np.array(WORDS)
+    for k in range(0, n_posts, CHUNK):
+        n = min(CHUNK, n_posts - k)
+        ticker = f"T{(k // CHUNK) % n_tickers:03d}"
+        seconds = np.sort(rng.integers(0, 365 * 86_400, n))
+        lengths = rng.integers(8, 30, n)
+        picks = rng.integers(0, len(words), lengths.sum())
+        titles = [" ".join(ws) for ws in np.split(words[picks], np.cumsum(lengths)[:-1])]
+        yield (ticker, [start + timedelta(seconds=int(s)) for s in seconds], titles,
+               rng.normal(0, 0.4, n).astype(np.float32).tolist(), rng.exponential(50, n).astype(int).tolist(),
+               rng.poisson(8, n).tolist(), [SUBREDDITS[i] for i in rng.integers(0, 3, n)])
+
+
+def build_frame(chunks) -> pd.DataFrame:
+    """Chemin d'origine : un dict par post, un DataFrame par ticker, puis concat."""
+    frames = []
+    for ticker, dates, titles, scores, upvotes, comments, subs in chunks:
+        posts = [{
+            "date": date.date(),
+            "text": title[:200],
+            "sentiment_score": score,
+            "upvotes": up,
+            "num_comments": nc,
+            "source": f"reddit/{sub}",
+            "ticker": ticker,
+        } for date, title, score, up, nc, sub in zip(dates, titles, scores, upvotes, comments, subs)]
+        df = pd.DataFrame(posts)
+        df['date'] = pd.to_datetime(df['date'])
+        frames.append(df.set_index('date'))
+    return pd.concat(frames)
+
+
+def build_table(chunks, keep_text: bool) -> ItemTable:
+    tables = []
+    for ticker, dates, titles, scores, upvotes, comments, subs in chunks:
+        tables.append(ItemTable.build(dates, scores, [f"reddit/{sub}" for sub in subs], ticker=ticker,
+                                      texts=titles, keep_text=keep_text,
+                                      upvotes=upvotes, num_comments=comments))
+    return ItemTable.concat(tables)
+
+
+def run(variant: str, n_posts: int, n_tickers: int):
+    """Dans un process neuf : (Mo retenus, Mo de pic RSS, s de construction, s d'agrégation, agrégat)."""
+    base = peak_rss_mb()
+    chunks = make_chunks(n_posts, n_tickers)
+    t0 = time.perf_counter()
+    if variant == "frame":
+        data = build_frame(chunks)
+        retained = data.memory_usage(deep=True).sum()
+    else:
+        data = build_table(chunks, keep_text=variant == "table+text")
+        retained = data.nbytes
+    t_build = time.perf_counter() - t0
+    peak = peak_rss_mb() - base
+
+    t0 = time.perf_counter()
+    daily = aggregate_daily(data, weighting='upvotes')
+    return retained / 2**20, peak, t_build, time.perf_counter() - t0, daily
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--tickers", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    labels = {"frame": "dicts → DataFrame", "table+text": "table + texte", "table": "table sans texte"}
+    results = {}
+    for variant in labels:
+        with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as executor:
+            results[variant] = executor.submit(run, variant, args.posts, args.tickers).result()
+
+    print(f"{args.posts:,} posts, {args.tickers} tickers")
+    for variant, label in labels.items():
+        retained, peak, t_build, t_agg, _ = results[variant]
+        print(f"  {label:<18} {retained:8.1f} Mo retenus ({retained * 2**20 / args.posts:4.0f} o/post)  "
+              f"pic RSS +{peak:7.1f} Mo  construction {t_build:5.1f} s  aggregate_daily {t_agg * 1e3:5.0f} ms")
+
+    # Même agrégat (ticker, jour), à l'arrondi float32 des scores près
+    ref, out = results["frame"][-1], results["table"][-1]
+    assert (ref.index == out.index).all()
+    assert (ref['mention_count'].to_numpy() == out['mention_count'].to_numpy()).all()
+    drift = float(np.abs(ref['sentiment_score'].to_numpy() - out['sentiment_score'].to_numpy()).max())
+    assert drift < 1e-6, drift
+    print(f"agrégats identiques ({len(out):,} lignes ticker × jour, écart max {drift:.1e})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Équivalence et benchmark des métriques en flux (utils/metrics.StreamingMetrics)
+par rapport à compute_metrics().
+
+    python -m benchmarks.bench_metrics
+"""
+import time
+from functools import reduce
+import numpy as np
+
+from models.backtest import run_backtest
+from models.portfolio import run_portfolio_backtest
+from utils.metrics import compute_metrics, StreamingMetrics
+from benchmarks.bench_portfolio import make_inputs
+
+
+def backtests(n_days: int = 2520, n_tickers: int = 6):
+    """Un backtest par ticker + le portefeuille, sur les entrées de bench_portfolio."""
+    signals, closes, scores = make_inputs(n_days, n_tickers)
+    labels = signals.replace({1: 'BUY', -1: 'SELL', 0: 'HOLD'}).astype(object)
+    for ticker in closes.columns:
+        yield run_backtest(labels[[ticker]].rename(columns={ticker: 'signal'}),
+                           closes[[ticker]].rename(columns={ticker: 'Close'}))[0]
+    yield run_portfolio_backtest(signals, closes)[0]
+    yield run_portfolio_backtest(signals, closes, weighting='score', scores=scores)[0]
+
+
+def variants(df):
+    """Même backtest accumulé jour par jour, par tranches, et par tranches fusionnées."""
+    ret, bh, pos = (df[c].to_numpy(dtype=float) for c in ('daily_ret_strategy', 'daily_ret_bh', 'position'))
+    step = StreamingMetrics()
+    for r, b, p in zip(ret, bh, pos):
+        step.update(r, b, p)
+
+    bounds = np.linspace(0, len(df), 8).astype(int)
+    chunked = StreamingMetrics()
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        chunked.update_arrays(ret[a:b], bh[a:b], pos[a:b])
+
+    parts = [StreamingMetrics.from_backtest(df.iloc[a:b]) for a, b in zip(bounds[:-1], bounds[1:])]
+    merged = reduce(StreamingMetrics.merge, parts)
+    return {'jour par jour': step, 'par tranches': chunked, 'tranches fusionnées': merged}
+
+
+def check_equivalence(tol: float = 1e-12):
+    worst = 0.0
+    for df in backtests():
+        for df_ in (df, df.iloc[:1], df.iloc[:2]):
+            ref = compute_metrics(df_)
+            for label, m in variants(df_).items():
+                got = m.result()
+                assert got.keys() == ref.keys()
+                for key, value in ref.items():
+                    if np.isnan(value):
+                        assert np.isnan(got[key]), (label, key)
+                        continue
+                    err = abs(got[key] - value) / max(1.0, abs(value))
+                    assert err <= tol, (label, key, got[key], value)
+                    worst = max(worst, err)
+    return worst
+
+
+def main():
+    worst = check_equivalence()
+    print(f"équivalence OK (écart relatif max {worst:.1e} : jour par jour, tranches, fusion)")
+
+    df = next(backtests(n_days=2520 * 4, n_tickers=1))
+    ret, bh, pos = (df[c].to_numpy(dtype=float) for c in ('daily_ret_strategy', 'daily_ret_bh', 'position'))
+    timings = {}
+    t0 = time.perf_counter()
+    for _ in range(20):
+        compute_metrics(df)
+    timings['compute_metrics'] = (time.perf_counter() - t0) / 20
+    t0 = time.perf_counter()
+    for _ in range(20):
+        StreamingMetrics().update_arrays(ret, bh, pos)
+    timings['StreamingMetrics (tableau)'] = (time.perf_counter() - t0) / 20
+    m = StreamingMetrics()
+    m.update_arrays(ret[:-1], bh[:-1], pos[:-1])
+    t0 = time.perf_counter()
+    for _ in range(1000):
+        m.update(ret[-1], bh[-1], pos[-1])
+    timings['StreamingMetrics.update (1 jour)'] = (time.perf_counter() - t0) / 1000
+
+    print(f"{len(df)} barres :")
+    for label, seconds in timings.items():
+        print(f"  {label:<34} {seconds * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Client NewsAPI (data/news_client.py) contre le serveur local data/newsapi_stub.py :
+pagination, nouvelles tentatives, cache, répartition du quota, et coût des
+connexions réutilisées par rapport à un requests.get par page.
+
+    python -m benchmarks.bench_newsapi
+
+Sur la boucle locale (HTTP sans TLS), ouvrir une connexion ne coûte presque
+rien et les temps sont dominés par le serveur : le gain de la session se lit
+au nombre de connexions, chacune coûtant une poignée de main TLS (1 à 2
+allers-retours) vers newsapi.org.
+"""
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import requests
+
+from data.news_client import NewsApiClient, RequestBudget, ResponseCache, BudgetExhausted
+from data.newsapi_stub import start_stub
+
+TICKERS = [f"T{i:02d}" for i in range(40)]
+END = datetime(2024, 6, 28)
+START = END - timedelta(days=29)
+
+
+def make_client(server, state: str, **budget):
+    return NewsApiClient("test", base_url=server.base_url, retries=2, backoff=0.01,
+                         budget=RequestBudget(state, **budget), cache=ResponseCache(state))
+
+
+def check_behaviour(tmp: str):
+    server, _ = start_stub(articles_per_day=8, max_results=1000)
+    try:
+        client = make_client(server, os.path.join(tmp, "check.sqlite"), limit=1000)
+
+        # Pagination : 30 jours × 8 articles = 240 → 3 pages
+        articles, info = client.everything("AAPL", START, END)
+        assert len(articles) == 240 and info['pages'] == 3, info
+        expected = server.articles("AAPL", START.strftime("%Y-%m-%d"), END.strftime("%Y-%m-%d"))
+        assert articles == expected
+
+        # Cache : même requête, aucun appel réseau
+        before = server.requests
+        again, info = client.everything("AAPL", START, END)
+        assert again == articles and info['cached'] and server.requests == before
+
+        # Pannes transitoires : 2 × 503 puis succès
+        server.fail_next(2, 503)
+        articles, info = client.everything("MSFT", START, START + timedelta(days=2))
+        assert info['retries'] == 2 and len(articles) == 24, info
+    finally:
+        server.shutdown()
+
+    # Plan gratuit : 100 résultats max, la page 2 n'est pas servie
+    server, _ = start_stub(articles_per_day=8, max_results=100)
+    try:
+        client = make_client(server, os.path.join(tmp, "free.sqlite"), limit=1000)
+        articles, info = client.everything("AAPL", START, END)
+        assert len(articles) == 100 and info['pages'] == 1 and not info['truncated'], info
+    finally:
+        server.shutdown()
+
+
+def check_budget(tmp: str, limit: int = 50, reserve: int = 30):
+    """Quota serré : chaque ticker obtient sa 1re page avant les pages suivantes des autres."""
+    server, _ = start_stub(articles_per_day=8, max_results=1000)
+    try:
+        state = os.path.join(tmp, "budget.sqlite")
+        client = make_client(server, state, limit=limit, reserve=reserve)
+        served, truncated, extra_pages = 0, 0, 0
+        for ticker in TICKERS:
+            try:
+                _, info = client.everything(ticker, START, END)
+                served += 1
+                truncated += info['truncated']
+                extra_pages += info['pages'] - 1
+            except BudgetExhausted:
+                pass
+        usage = RequestBudget(state, limit=limit).usage()
+        assert usage['used'] == server.requests == limit
+        # Pages suivantes seulement hors réserve ; la réserve sert des 1res pages
+        assert extra_pages <= limit - reserve and served == limit - extra_pages
+
+        # Persistant : un nouveau process (nouvel objet) voit le même compteur
+        with_new_state = make_client(server, state, limit=limit, reserve=reserve)
+        try:
+            with_new_state.everything("ZZZ", START, END)
+            raise AssertionError("quota du jour dépassé")
+        except BudgetExhausted:
+            pass
+        return served, truncated, usage
+    finally:
+        server.shutdown()
+
+
+def bench_connections(tmp: str):
+    server, _ = start_stub(articles_per_day=8, max_results=1000)
+    try:
+        params = {"from": START.strftime("%Y-%m-%d"), "to": END.strftime("%Y-%m-%d"),
+                  "pageSize": 100, "language": "en", "sortBy": "publishedAt"}
+        t0 = time.perf_counter()
+        for ticker in TICKERS:
+            for page in (1, 2, 3):
+                requests.get(f"{server.base_url}/everything", params={**params, "q": ticker, "page": page},
+                             headers={"X-Api-Key": "test"}, timeout=10).json()
+        naive = (time.perf_counter() - t0, server.requests, server.connections)
+
+        server.requests = server.connections = 0
+        client = make_client(server, os.path.join(tmp, "bench.sqlite"), limit=10_000)
+        t0 = time.perf_counter()
+        for ticker in TICKERS:
+            client.everything(ticker, START, END)
+        pooled = (time.perf_counter() - t0, server.requests, server.connections)
+
+        server.requests = 0
+        t0 = time.perf_counter()
+        for ticker in TICKERS:
+            client.everything(ticker, START, END)
+        cached = (time.perf_counter() - t0, server.requests, 0)
+        return naive, pooled, cached
+    finally:
+        server.shutdown()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        check_behaviour(tmp)
+        print("comportement OK (pagination, limite du plan gratuit, cache, nouvelles tentatives)")
+
+        served, truncated, usage = check_budget(tmp)
+        print(f"quota de 50 requêtes (réserve 30) pour {len(TICKERS)} tickers × 3 pages : {served} tickers servis, "
+              f"{truncated} tronqués, {usage['used']} requêtes ; refus au-delà, même après reprise")
+
+        labels = ("requests.get par page", "session partagée", "cache local")
+        for label, (seconds, n_requests, connections) in zip(labels, bench_connections(tmp)):
+            print(f"  {label:<22} {seconds * 1e3:7.0f} ms  {n_requests:4d} requêtes  "
+                  f"{connections:4d} connexions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Benchmark de bout en bout des étapes du pipeline, sur données synthétiques fixes.
+
+    python -m benchmarks.bench_pipeline --output bench.json
+    python -m benchmarks.bench_pipeline --baseline bench.json --threshold 0.2
+    python -m benchmarks.bench_pipeline --scoring
+
+Tailles : 90d (1 ticker, 90 jours), 10y (1 ticker, 10 ans), 500t (500 tickers,
+1 an, étapes exécutées ticker par ticker comme dans l'app). Chaque étape est
+chronométrée (min et médiane sur --repeat passes) puis mesurée en mémoire
+(pic tracemalloc, passe séparée). Les étapes *_aggregation partent, comme
+get_news_sentiment / get_reddit_sentiment, de tables compactes (ItemTable,
+cf. data/items.py) triées. tracemalloc ne voit que les allocations Python et
+numpy, pas les chaînes Arrow de pandas 3 (colonne source des DataFrames) : le
+pic est sous-estimé pour les étapes qui en créent. Le scoring FinBERT, bien plus lent, n'est
+mesuré qu'avec --scoring (textes/s, cache désactivé).
+
+Avec --baseline, une étape est en régression si son temps minimal dépasse
+celui de la référence de plus de --threshold (code de sortie 1).
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from data.synthetic import simulate_news, simulate_prices, simulate_reddit_posts
+from data.fetch_news import aggregate_daily as aggregate_news
+from data.fetch_reddit import aggregate_daily as aggregate_reddit
+from data.items import ItemTable
+from models.sentiment_aggregator import aggregate_sentiment
+from models.signal_generator import generate_signal
+from models.backtest import run_backtest
+from utils.metrics import compute_metrics
+
+END_DATE = pd.Timestamp("2025-12-31")
+
+# nom → (nombre de tickers, nombre de jours ouvrés)
+SIZES = {
+    "90d": (1, 90),
+    "10y": (1, 2520),
+    "500t": (500, 252),
+}
+
+def make_inputs(n_tickers: int, n_days: int) -> List[Dict[str, object]]:
+    """Entrées de chaque étape, par ticker (sorties de l'étape précédente) ; articles et posts en ItemTable."""
+    start = END_DATE - pd.offsets.BDay(n_days - 1)
+    inputs = []
+    for i in range(n_tickers):
+        ticker = f"T{i:03d}"
+        news = ItemTable.from_frame(simulate_news(ticker, start, END_DATE), ticker=ticker).sort()
+        posts = ItemTable.from_frame(simulate_reddit_posts(ticker, start, END_DATE), ticker=ticker).sort()
+        prices = simulate_prices(ticker, start, END_DATE)
+        news_daily = aggregate_news(news).droplevel('ticker')
+        reddit_daily = aggregate_reddit(posts).droplevel('ticker')
+        sentiment = aggregate_sentiment(news_daily, reddit_daily, prices)
+        signals = generate_signal(sentiment)
+        backtest_df, _ = run_backtest(signals, prices)
+        inputs.append({
+            "news": news, "posts": posts, "prices": prices,
+            "news_daily": news_daily, "reddit_daily": reddit_daily,
+            "sentiment": sentiment, "signals": signals, "backtest": backtest_df,
+        })
+    return inputs
+
+
+def stage_functions(inputs: List[Dict[str, object]]) -> Dict[str, Callable[[], None]]:
+    def each(fn):
+        return lambda: [fn(x) for x in inputs]
+
+    return {
+        "news_aggregation": each(lambda x: aggregate_news(x["news"]).droplevel('ticker')),
+        "reddit_aggregation": each(lambda x: aggregate_reddit(x["posts"]).droplevel('ticker')),
+        "aggregate_sentiment": each(lambda x: aggregate_sentiment(x["news_daily"],
+                                                                  x["reddit_daily"], x["prices"])),
+        "generate_signal": each(lambda x: generate_signal(x["sentiment"])),
+        "run_backtest": each(lambda x: run_backtest(x["signals"], x["prices"])),
+        "compute_metrics": each(lambda x: compute_metrics(x["backtest"])),
+    }
+
+
+def measure(fn: Callable[[], None], repeat: int) -> Dict[str, float]:
+    """Temps (min, médiane) sur repeat passes, puis pic mémoire sur une passe."""
+    fn()  # échauffement (imports paresseux, caches pandas)
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": min(times),
+        "median_seconds": statistics.median(times),
+        "peak_mb": peak / 2**20,
+        "repeat": repeat,
+    }
+
+
+def make_texts(n: int, seed: int = 0) -> List[str]:
+    """Titres financiers synthétiques de longueurs variées."""
+    rng = np.random.default_rng(seed)
+    subjects = ["Apple", "Tesla", "Nvidia", "Microsoft", "Amazon", "the Fed", "Analysts"]
+    verbs = ["beats expectations", "misses revenue estimates", "raises guidance",
+             "cuts its outlook", "announces buyback", "faces regulatory probe"]
+    tails = ["as demand for AI chips keeps growing", "amid supply chain concerns",
+             "after a volatile trading session", "while margins remain under pressure"]
+    texts = []
+    for _ in range(n):
+        parts = [rng.choice(subjects), rng.choice(verbs)]
+        parts += list(rng.choice(tails, rng.integers(0, 8)))
+        texts.append(" ".join(parts) + ".")
+    return texts
+
+
+def bench_scoring(n_texts: int, repeat: int) -> Dict:
+    from models.sentiment_model import get_finbert, model_id, score_texts
+
+    try:
+        get_finbert()  # chargement hors chronométrage
+    except Exception as e:
+        return {"error": f"chargement FinBERT : {e}"}
+
+    texts = make_texts(n_texts)
+    _, errors = score_texts(texts, use_cache=False)
+    if errors:
+        return {"error": next(iter(errors.values()))}
+    result = measure(lambda: score_texts(texts, use_cache=False), repeat)
+    result["texts"] = n_texts
+    result["texts_per_sec"] = n_texts / result["seconds"]
+    result["model"] = model_id()
+    return result
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Étapes dont le temps minimal dépasse la référence de plus de threshold."""
+    regressions = []
+    for key, cur in results["results"].items():
+        ref = baseline.get("results", {}).get(key)
+        if not ref or "seconds" not in ref or "seconds" not in cur:
+            continue
+        ratio = cur["seconds"] / ref["seconds"]
+        flag = "REGRESSION" if ratio > 1 + threshold else "ok"
+        print(f"  {key:<32} {ref['seconds'] * 1e3:9.2f} ms → {cur['seconds'] * 1e3:9.2f} ms "
+              f"(x{ratio:.2f}) {flag}")
+        if ratio > 1 + threshold:
+            regressions.append(key)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="passes chronométrées (moitié pour 500t)")
+    parser.add_argument("--output", help="fichier JSON des résultats")
+    parser.add_argument("--baseline", help="résultats JSON de référence à comparer")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="ralentissement toléré (0.2 = +20 %%)")
+    parser.add_argument("--scoring", action="store_true", help="mesure aussi le scoring FinBERT")
+    parser.add_argument("--scoring-texts", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    results = {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+
+    for size in args.sizes:
+        n_tickers, n_days = SIZES[size]
+        inputs = make_inputs(n_tickers, n_days)
+        repeat = args.repeat if n_tickers == 1 else max(1, args.repeat // 2)
+        for stage, fn in stage_functions(inputs).items():
+            r = measure(fn, repeat)
+            results["results"][f"{stage}/{size}"] = r
+            print(f"{stage:<20} {size:>5} : {r['seconds'] * 1e3:9.2f} ms "
+                  f"(médiane {r['median_seconds'] * 1e3:.2f}) | pic {r['peak_mb']:.2f} Mo")
+
+    if args.scoring:
+        r = bench_scoring(args.scoring_texts, max(1, args.repeat // 2))
+        results["results"]["score_texts"] = r
+        if "error" in r:
+            print(f"score_texts : ignoré ({r['error']})")
+        else:
+            print(f"score_texts : {r['texts_per_sec']:.1f} textes/s ({r['model']})")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"résultats écrits dans {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"comparaison avec {args.baseline} (seuil +{args.threshold:.0%}) :")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} régression(s) : {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Équivalence et benchmark du backtest multi-tickers (models/portfolio.py).
+
+    python -m benchmarks.bench_portfolio
+"""
+import time
+import numpy as np
+import pandas as pd
+
+from models.backtest import run_backtest
+from models.portfolio import run_portfolio_backtest
+
+
+def make_inputs(n_days: int, n_tickers: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range("2015-01-01", periods=n_days)
+    tickers = [f"T{i:03d}" for i in range(n_tickers)]
+    codes = rng.choice(np.array([1, -1, 0], dtype=np.int8), size=(n_days, n_tickers),
+                       p=[0.05, 0.05, 0.9])
+    signals = pd.DataFrame(codes, index=idx, columns=tickers)
+    closes = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.015, (n_days, n_tickers)), axis=0)),
+                          index=idx, columns=tickers)
+    scores = pd.DataFrame(rng.normal(0, 0.3, (n_days, n_tickers)), index=idx, columns=tickers)
+    return signals, closes, scores
+
+
+def check_equivalence():
+    """Avec un seul ticker, le portefeuille doit reproduire run_backtest()."""
+    signals, closes, _ = make_inputs(2520, 1)
+    labels = signals.replace({1: 'BUY', -1: 'SELL', 0: 'HOLD'}).astype(object)
+    ticker = closes.columns[0]
+    expected, perf = run_backtest(labels.rename(columns={ticker: 'signal'}),
+                                  closes.rename(columns={ticker: 'Close'}))
+    got, _, got_perf = run_portfolio_backtest(labels, closes)
+    pd.testing.assert_frame_equal(got[expected.columns], expected, check_freq=False)
+    for key in perf:
+        assert np.isclose(perf[key], got_perf[key], rtol=0, atol=1e-12), key
+
+
+def check_float_codes():
+    """Codes passés en float64 par un reindex (NaN = HOLD) : même résultat que les codes int8."""
+    signals, closes, _ = make_inputs(500, 20)
+    holed = signals.astype(float).reindex(signals.index.insert(100, pd.Timestamp("2015-05-23")))
+    holed.iloc[::7, ::3] = np.nan
+    expected = signals.where(holed.reindex(signals.index).notna(), 0).astype(np.int8)
+    ref, _, ref_perf = run_portfolio_backtest(expected, closes)
+    got, _, got_perf = run_portfolio_backtest(holed, closes)
+    assert ref_perf['nb_trades'] > 0
+    pd.testing.assert_frame_equal(got, ref, check_freq=False)
+    assert got_perf == ref_perf
+
+
+def main():
+    check_equivalence()
+    check_float_codes()
+    print("équivalence OK (1 ticker = run_backtest ; codes float avec NaN = codes int8)")
+
+    for n_days, n_tickers in ((2520, 50), (2520, 500)):
+        signals, closes, scores = make_inputs(n_days, n_tickers)
+        for weighting in ('equal', 'score'):
+            t0 = time.perf_counter()
+            run_portfolio_backtest(signals, closes, weighting=weighting, scores=scores)
+            elapsed = time.perf_counter() - t0
+            print(f"{n_tickers:>4} tickers × {n_days} jours ({weighting:>5}) : {elapsed * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Stockage local des prix (data/price_store.py) avec un provider hors-ligne :
+complétion en tête et en queue, dtypes stables, segments en échec non
+marqués couverts, puis temps de service depuis le disque.
+
+    python -m benchmarks.bench_price_store
+"""
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import pandas as pd
+
+from data.price_store import PriceStore, ProviderError, synthetic_provider, yfinance_provider
+
+FLOAT_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+
+class StubProvider:
+    """Prix simulés ; journal des segments demandés ; segments en échec à la demande."""
+
+    def __init__(self):
+        self.calls = []
+        self.fail = set()  # (start, end) qui lèvent ProviderError
+
+    def __call__(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        self.calls.append((start, end))
+        if (start, end) in self.fail:
+            raise ProviderError(f"échec simulé {start.date()} → {end.date()}")
+        return synthetic_provider(ticker, start, end)
+
+
+def ts(day: str) -> pd.Timestamp:
+    return pd.Timestamp(day)
+
+
+def check_store(root: str):
+    provider = StubProvider()
+    store = PriceStore(root, provider)
+
+    # Magasin vide, 1er téléchargement en échec : rien n'est marqué couvert
+    provider.fail.add((ts("2023-03-01"), ts("2023-04-01")))
+    assert store.get("AAPL", ts("2023-03-01"), ts("2023-04-01")).empty
+    assert store.coverage("AAPL") is None
+    provider.fail.clear()
+
+    # Nouvelle tentative : mêmes dtypes au 1er appel et depuis Parquet
+    first = store.get("AAPL", ts("2023-03-01"), ts("2023-04-01"))
+    assert len(provider.calls) == 2 and not first.empty
+    again = store.get("AAPL", ts("2023-03-01"), ts("2023-04-01"))
+    assert len(provider.calls) == 2, "fenêtre couverte : aucun téléchargement"
+    assert (first.dtypes == again.dtypes).all() and (first.dtypes[FLOAT_COLUMNS] == float).all()
+    assert store.coverage("AAPL") == (ts("2023-03-01"), ts("2023-04-01"))
+
+    # Tête : seul le segment manquant avant la plage connue est demandé
+    head = store.get("AAPL", ts("2023-02-01"), ts("2023-04-01"))
+    assert provider.calls[-1] == (ts("2023-02-01"), ts("2023-03-01"))
+    assert store.coverage("AAPL") == (ts("2023-02-01"), ts("2023-04-01"))
+    assert head.index.min() >= ts("2023-02-01") and head.index.is_monotonic_increasing
+
+    # Queue en échec : couverture inchangée, segment redemandé à l'appel suivant
+    tail = (ts("2023-04-01"), ts("2023-05-01"))
+    provider.fail.add(tail)
+    store.get("AAPL", ts("2023-02-01"), ts("2023-05-01"))
+    assert store.coverage("AAPL") == (ts("2023-02-01"), ts("2023-04-01"))
+    provider.fail.clear()
+    full = store.get("AAPL", ts("2023-02-01"), ts("2023-05-01"))
+    assert provider.calls[-1] == tail
+    assert store.coverage("AAPL") == (ts("2023-02-01"), ts("2023-05-01"))
+
+    # Queue vide confirmée (week-end) : couverte, plus redemandée
+    store.get("AAPL", ts("2023-02-01"), ts("2023-05-06"))  # jusqu'au vendredi 5 mai inclus
+    n_calls = len(provider.calls)
+    weekend = store.get("AAPL", ts("2023-05-06"), ts("2023-05-08"))
+    assert weekend.empty and provider.calls[-1] == (ts("2023-05-06"), ts("2023-05-08"))
+    store.get("AAPL", ts("2023-05-06"), ts("2023-05-08"))
+    assert len(provider.calls) == n_calls + 1
+    assert store.coverage("AAPL") == (ts("2023-02-01"), ts("2023-05-08"))
+
+    # Résultat = provider appelé sur toute la fenêtre
+    ref = synthetic_provider("AAPL", ts("2023-02-01"), ts("2023-05-01"))
+    pd.testing.assert_frame_equal(full, ref, check_freq=False)
+    return provider
+
+
+def check_yfinance_empty(root: str):
+    """yfinance sans réponse (module simulé) : week-end couvert, jour ouvré en échec."""
+    calls = []
+
+    def download(ticker, start, end, **kwargs):
+        calls.append((start, end))
+        return pd.DataFrame()
+
+    real = sys.modules.get("yfinance")
+    sys.modules["yfinance"] = SimpleNamespace(download=download)
+    try:
+        store = PriceStore(root, yfinance_provider)
+        weekend = (ts("2023-05-06"), ts("2023-05-08"))  # samedi → lundi exclu
+        assert store.get("AAPL", *weekend).empty
+        assert store.coverage("AAPL") == weekend
+        store.get("AAPL", *weekend)
+        assert len(calls) == 1, "week-end couvert : aucun téléchargement"
+
+        weekday = (ts("2023-05-08"), ts("2023-05-09"))
+        assert store.get("MSFT", *weekday).empty and store.coverage("MSFT") is None
+    finally:
+        if real is None:
+            del sys.modules["yfinance"]
+        else:
+            sys.modules["yfinance"] = real
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        check_store(root)
+        check_yfinance_empty(root + "/yf")
+        print("stockage OK (tête, queue, échec non couvert, vide confirmé, week-end yfinance, dtypes stables)")
+
+        store = PriceStore(root, StubProvider())
+        start, end = ts("2014-01-01"), ts("2024-01-01")
+        t0 = time.perf_counter()
+        store.get("MSFT", start, end)
+        t_download = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        store.get("MSFT", start, end)
+        t_disk = time.perf_counter() - t0
+        print(f"10 ans de barres : 1er appel (provider + écriture) {t_download * 1e3:.0f} ms | "
+              f"depuis le disque {t_disk * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Équivalence et benchmark de l'agrégation journalière Reddit vectorisée.
+
+    python -m benchmarks.bench_reddit_aggregation
+"""
+import time
+import numpy as np
+import pandas as pd
+
+from data.fetch_reddit import aggregate_daily
+
+
+def _legacy_aggregate(df: pd.DataFrame) -> pd.DataFrame:
+    """Implémentation d'origine : groupby.apply + np.average par jour."""
+    daily = df.groupby(df.index.date).apply(
+        lambda g: pd.Series({
+            'sentiment_score': np.average(g['sentiment_score'],
+                                          weights=g.get('upvotes', pd.Series([1]*len(g))).clip(lower=1).values),
+            'mention_count': len(g),
+            'source': 'reddit'
+        })
+    )
+    daily.index = pd.to_datetime(daily.index)
+    return daily
+
+
+def make_posts(n_posts: int, n_days: int, n_tickers: int = 1, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range("2015-01-01", periods=n_days)
+    seconds = rng.integers(0, 86_400, n_posts)
+    dates = days[rng.integers(0, n_days, n_posts)] + pd.to_timedelta(seconds, unit='s')
+    df = pd.DataFrame({
+        'sentiment_score': np.clip(rng.normal(0, 0.4, n_posts), -1, 1).round(4),
+        'upvotes': rng.exponential(50, n_posts).astype(int),
+        'num_comments': rng.poisson(8, n_posts),
+    }, index=pd.DatetimeIndex(dates, name='date')).sort_index()
+    if n_tickers > 1:
+        df['ticker'] = np.array([f"T{i:03d}" for i in range(n_tickers)])[rng.integers(0, n_tickers, n_posts)]
+    return df
+
+
+def check_equivalence():
+    df = make_posts(20_000, 250)
+    new = aggregate_daily(df, weighting='upvotes')
+    old = _legacy_aggregate(df)
+    assert new.index.equals(old.index)
+    assert np.allclose(new['sentiment_score'], old['sentiment_score'].astype(float), rtol=0, atol=1e-12)
+    assert (new['mention_count'].to_numpy() == old['mention_count'].astype(int).to_numpy()).all()
+
+
+def _time(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - t0
+
+
+def main():
+    check_equivalence()
+    print("équivalence OK (pondération upvotes = implémentation d'origine)")
+
+    df = make_posts(1_000_000, 2520)
+    t_old = _time(_legacy_aggregate, df)
+    t_new = _time(aggregate_daily, df, weighting='upvotes')
+    print(f"1M posts, 1 ticker, 2520 jours : origine {t_old:.2f} s | vectorisé {t_new * 1e3:.0f} ms "
+          f"| x{t_old / t_new:.0f}")
+
+    df = make_posts(1_000_000, 250, n_tickers=200)
+    for weighting in ('upvotes', 'log_upvotes', 'comments'):
+        t_new = _time(aggregate_daily, df, weighting=weighting)
+        print(f"1M posts, 200 tickers × 250 jours ({weighting}) : {t_new * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Collecte Reddit hors-ligne (data/fetch_reddit.py) sur des recherches
+enregistrées (benchmarks/fixtures/reddit_aapl.json, cf. data/reddit_replay.py) :
+sentiment journalier de get_reddit_sentiment contre une référence pandas, puis
+recherches des subreddits en série / en parallèle avec une latence simulée.
+
+    python -m benchmarks.bench_reddit_replay
+    python -m benchmarks.bench_reddit_replay --latency 0.5
+
+FinBERT n'est pas chargé : les textes sont scorés par un lexique déterministe.
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FIXTURE = Path(__file__).parent / "fixtures" / "reddit_aapl.json"
+QUERY = "AAPL stock"
+START, END = datetime(2024, 6, 1), datetime(2024, 6, 30)
+
+BULLISH = ("ripping", "breaking", "highs", "rebounding", "upgrade", "record", "calls", "long", "growing")
+BEARISH = ("dumping", "sliding", "softens", "support", "puts", "stretched", "slip", "trimmed")
+
+
+class LexiconScorer:
+    """Remplaçant de score_texts : score déterministe, journal des textes scorés."""
+
+    def __init__(self):
+        self.texts = []
+
+    def __call__(self, texts):
+        self.texts.extend(texts)
+        scores = [np.tanh(sum(w in t.lower() for w in BULLISH) - sum(w in t.lower() for w in BEARISH))
+                  for t in texts]
+        return np.asarray(scores), {}
+
+
+def load_posts() -> pd.DataFrame:
+    """Posts de la fixture dans la fenêtre, indexés par date UTC."""
+    with open(FIXTURE, encoding="utf-8") as f:
+        data = json.load(f)
+    rows = [dict(post, sub=sub) for sub, queries in data.items() for post in queries.get(QUERY, [])]
+    df = pd.DataFrame(rows)
+    df.index = pd.to_datetime(df['created_utc'], unit="s")
+    return df[(df.index >= START) & (df.index <= END)]
+
+
+def check_sentiment(fetch_reddit, dedup):
+    """Sans dédoublonnage = moyenne pondérée par upvotes ; avec : mêmes jours et mentions."""
+    posts = load_posts()
+    scorer = LexiconScorer()
+    fetch_reddit._score_texts = scorer
+
+    ref_scores, _ = scorer([f"{t} {s[:300]}" for t, s in zip(posts['title'], posts['selftext'])])
+    weights = np.clip(posts['score'].to_numpy(dtype=float), 1, None)
+    day = posts.index.normalize()
+    ref = pd.DataFrame({'w': weights * ref_scores, 'n': weights, 'm': 1}).groupby(day).sum()
+
+    enabled = dedup.ENABLED
+    try:
+        dedup.ENABLED = False
+        plain = fetch_reddit.get_reddit_sentiment("AAPL", START, END)
+    finally:
+        dedup.ENABLED = enabled
+    assert plain.index.equals(pd.DatetimeIndex(ref.index)), "jours"
+    assert (plain['source'] == 'reddit').all()
+    assert (plain['mention_count'].to_numpy() == ref['m'].to_numpy()).all()
+    assert np.allclose(plain['sentiment_score'].to_numpy(), (ref['w'] / ref['n']).to_numpy(), atol=1e-6)
+
+    # Cross-posts (même titre dans les trois subreddits) : scorés une fois, comptés trois fois
+    scorer.texts.clear()
+    daily = fetch_reddit.get_reddit_sentiment("AAPL", START, END)
+    assert daily.index.equals(plain.index)
+    assert (daily['mention_count'].to_numpy() == plain['mention_count'].to_numpy()).all()
+    assert daily['sentiment_score'].between(-1, 1).all()
+    cross = posts['title'].value_counts()
+    cross = cross[cross == 3].index
+    assert len(cross) and all(sum(t.startswith(c) for t in scorer.texts) == 1 for c in cross)
+    return len(posts), len(scorer.texts), daily
+
+
+def time_searches(fetch_reddit, repeat: int = 3):
+    """(s en série, s via _search_all) pour une recherche dans chaque subreddit."""
+    subreddits = fetch_reddit.SUBREDDITS
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        serial = [hit for name, limit in subreddits.items()
+                  for hit in fetch_reddit._search_subreddit(name, QUERY, limit)]
+    t_serial = (time.perf_counter() - t0) / repeat
+    fetch_reddit._search_all(QUERY, subreddits)  # clients des threads créés
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        parallel = fetch_reddit._search_all(QUERY, subreddits)
+    t_parallel = (time.perf_counter() - t0) / repeat
+    assert [(n, p.title) for n, p in serial] == [(n, p.title) for n, p in parallel], "ordre conservé"
+    return t_serial, t_parallel
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.2, help="secondes par recherche")
+    args = parser.parse_args(argv)
+
+    os.environ["REDDIT_REPLAY_FILE"] = str(FIXTURE)
+    os.environ["REDDIT_REPLAY_LATENCY"] = str(args.latency)
+    from data import fetch_reddit
+    from models import dedup
+
+    n_posts, n_scored, daily = check_sentiment(fetch_reddit, dedup)
+    print(f"get_reddit_sentiment OK : {n_posts} posts sur {len(daily)} jours, {n_scored} textes scorés "
+          f"(cross-posts une fois), {int(daily['mention_count'].sum())} mentions")
+
+    t_serial, t_parallel = time_searches(fetch_reddit)
+    print(f"{len(fetch_reddit.SUBREDDITS)} subreddits, latence {args.latency * 1e3:.0f} ms/recherche : "
+          f"en série {t_serial * 1e3:.0f} ms | en parallèle ({fetch_reddit.MAX_WORKERS} threads) "
+          f"{t_parallel * 1e3:.0f} ms (x{t_serial / t_parallel:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Équivalence et benchmark du balayage de paramètres vectorisé (models/sweep.py).
+
+    python -m benchmarks.bench_sweep
+"""
+import time
+import numpy as np
+import pandas as pd
+
+from models.sweep import run_sweep
+from models.signal_generator import generate_signal
+from models.backtest import run_backtest
+from utils.metrics import compute_metrics
+
+
+def make_inputs(n_days: int = 2520, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range("2015-01-01", periods=n_days)
+    prices_df = pd.DataFrame({'Close': 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_days)))},
+                             index=idx)
+    score = np.clip(np.cumsum(rng.normal(0, 0.05, n_days)) * 0.1, -1, 1)
+    sentiment_df = pd.DataFrame({'sentiment_score': score}, index=idx)
+    return sentiment_df, prices_df
+
+
+def check_equivalence(tol: float = 1e-9):
+    """Compare chaque ligne du balayage au pipeline generate_signal → run_backtest → compute_metrics."""
+    sentiment_df, prices_df = make_inputs()
+    results = run_sweep(sentiment_df, prices_df, thresholds=[0.0, 0.05, 0.1, 0.2],
+                        ma_windows=[3, 7, 14], momentum=[True, False], costs=[0.0, 0.001])
+    worst = 0.0
+    for row in results.itertuples(index=False):
+        signal_df = generate_signal(sentiment_df, threshold=row.threshold,
+                                    ma_window=row.ma_window, use_momentum=row.use_momentum)
+        backtest_df, _ = run_backtest(signal_df, prices_df, transaction_cost=row.transaction_cost)
+        for name, value in compute_metrics(backtest_df).items():
+            worst = max(worst, abs(value - getattr(row, name)))
+    assert worst <= tol, f"écart max {worst:.3g} > {tol}"
+    return worst
+
+
+def main():
+    worst = check_equivalence()
+    print(f"équivalence OK (écart max {worst:.1e} vs pipeline par combinaison)")
+
+    sentiment_df, prices_df = make_inputs()
+    grid = dict(thresholds=np.linspace(0, 0.5, 51), ma_windows=range(2, 22),
+                momentum=[True, False], costs=[0.0, 0.0005, 0.001, 0.002])
+    t0 = time.perf_counter()
+    results = run_sweep(sentiment_df, prices_df, **grid)
+    elapsed = time.perf_counter() - t0
+    print(f"{len(results)} combinaisons × {len(prices_df)} barres : {elapsed:.2f} s "
+          f"({len(results) / elapsed:.0f} combinaisons/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Déterminisme et débit du générateur de données synthétiques.
+
+    python -m benchmarks.bench_synthetic
+"""
+import os
+import subprocess
+import sys
+import time
+import pandas as pd
+
+from data.synthetic import simulate_news, simulate_prices, simulate_reddit_posts, simulate_universe
+
+_DIGEST = (
+    "import pandas as pd; from data.synthetic import simulate_reddit_posts as f; "
+    "print(pd.util.hash_pandas_object(f('AAPL', '2024-01-01', '2024-06-30')).sum())"
+)
+
+
+def check_processes():
+    """Même sortie quel que soit PYTHONHASHSEED (seed SHA-256, pas hash())."""
+    digests = set()
+    for seed in ("0", "1", "12345"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        out = subprocess.run([sys.executable, "-c", _DIGEST], env=env, check=True,
+                             capture_output=True, text=True)
+        digests.add(out.stdout.strip())
+    assert len(digests) == 1, digests
+
+
+def check_windows():
+    """Une date a la même valeur quelle que soit la fenêtre demandée."""
+    lo, hi = pd.Timestamp("2024-06-01"), pd.Timestamp("2024-10-01")
+    for fn, on_index in ((simulate_prices, True), (simulate_news, False),
+                         (simulate_reddit_posts, False)):
+        a = fn("AAPL", "2024-01-01", "2024-09-30")
+        b = fn("AAPL", "2024-06-01", "2025-03-31")
+        if on_index:
+            a, b = a[(a.index >= lo) & (a.index < hi)], b[(b.index >= lo) & (b.index < hi)]
+        else:
+            a = a[(a['date'] >= lo) & (a['date'] < hi)].reset_index(drop=True)
+            b = b[(b['date'] >= lo) & (b['date'] < hi)].reset_index(drop=True)
+        assert a.equals(b), fn.__name__
+
+
+def main():
+    check_processes()
+    print("déterminisme OK (PYTHONHASHSEED 0 / 1 / 12345)")
+    check_windows()
+    print("indépendance à la fenêtre OK (prix, news, Reddit)")
+
+    for n_tickers, years in ((50, 10), (300, 10)):
+        tickers = [f"T{i:03d}" for i in range(n_tickers)]
+        t0 = time.perf_counter()
+        u = simulate_universe(tickers, f"{2026 - years}-01-01", "2025-12-31")
+        elapsed = time.perf_counter() - t0
+        print(f"{n_tickers} tickers × {years} ans : {len(u['posts']):,} posts, "
+              f"{u['closes'].size:,} clôtures en {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
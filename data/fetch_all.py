@@ -0,0 +1,85 @@
+import os
+import time
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime
+from typing import Callable, Dict, Tuple
+
+from data.fetch_prices import get_stock_data
+from data.fetch_news import get_news_sentiment
+from data.fetch_reddit import get_reddit_sentiment
+from utils.perf import in_context
+
+# Timeout par source, en secondes depuis le lancement de la collecte
+TIMEOUTS = {
+    'prices': float(os.getenv("FETCH_TIMEOUT_PRICES", "30")),
+    'news': float(os.getenv("FETCH_TIMEOUT_NEWS", "90")),
+    'reddit': float(os.getenv("FETCH_TIMEOUT_REDDIT", "90")),
+}
+
+
+def fetch_all(
+    ticker: str,
+    start_date: datetime,
+    end_date: datetime,
+    use_news: bool = True,
+    use_reddit: bool = True,
+    timeouts: Dict[str, float] = None,
+    fetchers: Dict[str, Callable] = None
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, Dict[str, str]]:
+    """
+    Récupère prix, news et Reddit en parallèle (sources I/O indépendantes).
+
+    La latence totale est celle de la source la plus lente, bornée par son
+    timeout. Les prix sont indispensables : une erreur ou un dépassement de
+    délai côté prix est relevé. Une source de sentiment en échec ou en
+    retard est remplacée par un DataFrame vide et signalée dans errors.
+
+    Paramètres
+    ----------
+    ticker, start_date, end_date : comme get_stock_data()
+    use_news, use_reddit         : sources de sentiment à interroger
+    timeouts                     : {'prices' | 'news' | 'reddit': secondes}, complète TIMEOUTS
+    fetchers                     : {'prices' | 'news' | 'reddit': fonction}, remplace
+                                   get_stock_data & co. (même signature), ex. versions en cache
+
+    Retourne
+    --------
+    (prices_df, news_df, reddit_df, errors)
+    errors : dict {source: message} des sources dégradées
+    """
+    timeouts = {**TIMEOUTS, **(timeouts or {})}
+    fetchers = {'prices': get_stock_data, 'news': get_news_sentiment,
+                'reddit': get_reddit_sentiment, **(fetchers or {})}
+    tasks = {'prices': fetchers['prices']}
+    if use_news:
+        tasks['news'] = fetchers['news']
+    if use_reddit:
+        tasks['reddit'] = fetchers['reddit']
+
+    executor = ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="fetch")
+    t0 = time.monotonic()
+    # in_context : les étapes instrumentées des threads rejoignent la trace courante
+    futures = {name: executor.submit(in_context(fn), ticker, start_date, end_date)
+               for name, fn in tasks.items()}
+
+    results = {'prices': None, 'news': pd.DataFrame(), 'reddit': pd.DataFrame()}
+    errors = {}
+    try:
+        for name, future in futures.items():
+            remaining = max(0.0, timeouts[name] - (time.monotonic() - t0))
+            try:
+                results[name] = future.result(timeout=remaining)
+            except FutureTimeout:
+                if name == 'prices':
+                    raise TimeoutError(f"Prix {ticker} : pas de réponse après {timeouts[name]:g}s")
+                errors[name] = f"timeout après {timeouts[name]:g}s"
+            except Exception as e:
+                if name == 'prices':
+                    raise
+                errors[name] = f"{type(e).__name__}: {e}"
+    finally:
+        # Ne pas attendre les sources en retard : leurs threads finissent en arrière-plan
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results['prices'], results['news'], results['reddit'], errors
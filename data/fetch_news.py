@@ -1,99 +1,98 @@
 import os
-import pandas as pd
 import numpy as np
+import pandas as pd
 from datetime import datetime, timedelta
-from transformers import pipeline
-import requests
-
-# ── Chargement lazy du modèle FinBERT ─────────────────────────────────────────
-_finbert = None
-
-def _get_finbert():
-    global _finbert
-    if _finbert is None:
-        _finbert = pipeline(
-            "text-classification",
-            model="ProsusAI/finbert",
-            tokenizer="ProsusAI/finbert",
-            top_k=None,
-            device=-1  # CPU; remplace par 0 si tu as un GPU
-        )
-    return _finbert
-
-
-def _score_text(text: str) -> float:
-    """
-    Retourne un score entre -1 (très bearish) et +1 (très bullish).
-    FinBERT classe en : positive / negative / neutral.
-    """
-    if not text or len(text.strip()) < 10:
-        return 0.0
 
-    try:
-        finbert = _get_finbert()
-        result = finbert(text[:512])[0]  # limite tokens
-        scores = {r['label']: r['score'] for r in result}
-        score = scores.get('positive', 0) - scores.get('negative', 0)
-        return round(float(score), 4)
-    except Exception:
-        return 0.0
+from data.items import ItemTable, SOURCES, daily_index
+from data.news_client import get_client
+from data.synthetic import simulate_news
+from models.sentiment_model import score_texts as _score_texts
+from models import dedup
+from utils.perf import stage
 
 
-def get_news_sentiment(ticker: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+def get_news_items(ticker: str, start_date: datetime, end_date: datetime) -> ItemTable:
     """
-    Récupère les articles via NewsAPI et calcule leur score de sentiment.
+    Articles NewsAPI scorés, en table compacte (cf. data.items) triée par
+    date, doublons regroupés.
 
-    Nécessite : NEWSAPI_KEY dans les variables d'environnement.
-    Si pas de clé → génère des données simulées pour démonstration.
+    Nécessite : NEWSAPI_KEY dans les variables d'environnement. Les requêtes
+    passent par data.news_client (pagination, quota du jour, cache local).
+    Si pas de clé, ou quota épuisé → génère des données simulées pour démonstration.
     """
     api_key = os.getenv("NEWSAPI_KEY", "")
 
-    articles = []
+    table = None
 
     if api_key:
         try:
-            url = "https://newsapi.org/v2/everything"
-            params = {
-                "q": ticker,
-                "from": start_date.strftime("%Y-%m-%d"),
-                "to": end_date.strftime("%Y-%m-%d"),
-                "language": "en",
-                "sortBy": "publishedAt",
-                "pageSize": 100,
-                "apiKey": api_key
-            }
-            resp = requests.get(url, params=params, timeout=10)
-            data = resp.json()
-
-            for article in data.get("articles", []):
-                text = f"{article.get('title', '')} {article.get('description', '')}"
-                published = article.get("publishedAt", "")[:10]
-                score = _score_text(text)
-                articles.append({
-                    "date": pd.to_datetime(published),
-                    "text": text[:200],
-                    "sentiment_score": score,
-                    "source": "news"
-                })
+            with stage("news.api", ticker=ticker) as record:
+                raw, info = get_client(api_key).everything(ticker, start_date, end_date)
+                record.update(info)
+                record['articles'] = len(raw)
+
+            texts = [f"{a.get('title', '')} {a.get('description', '')}" for a in raw]
+            groups = np.arange(len(texts))
+            if dedup.ENABLED:
+                with stage("news.dedup", ticker=ticker, articles=len(texts)) as record:
+                    groups = dedup.group_duplicates(texts)
+                    record['groups'] = len(np.unique(groups))
+            scores, errors = dedup.score_groups(texts, groups, _score_texts)
+            if errors:
+                first = next(iter(errors.items()))
+                print(f"FinBERT error : {len(errors)}/{len(texts)} article(s) non scoré(s) "
+                      f"(article {first[0]} : {first[1]})")
+
+            if raw:
+                published = pd.to_datetime([a.get("publishedAt") or None for a in raw],
+                                           utc=True, errors="coerce").tz_localize(None)
+                table = ItemTable.build(published, scores, "news", ticker=ticker,
+                                        texts=texts, dup_group=groups)
         except Exception as e:
             print(f"NewsAPI error: {e}")
 
     # ── Fallback : données simulées réalistes ─────────────────────────────────
-    if not articles:
-        articles = _simulate_news_sentiment(ticker, start_date, end_date)
+    if table is None:
+        with stage("news.simulate", ticker=ticker) as record:
+            table = ItemTable.from_frame(simulate_news(ticker, start_date, end_date), ticker=ticker)
+            record['articles'] = len(table)
+
+    table = table.sort()
+    if table.dup_group is not None:
+        table = dedup.collapse_duplicates(table, table.dup_group)
+    return table
+
+
+def get_news_sentiment(ticker: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+    """
+    Sentiment news journalier d'un ticker : get_news_items → aggregate_daily.
+    """
+    table = get_news_items(ticker, start_date, end_date)
+    if table.empty:
+        return pd.DataFrame()
+
+    with stage("news.aggregate", ticker=ticker, articles=len(table)) as record:
+        daily = aggregate_daily(table).droplevel('ticker')
+        record['days'] = len(daily)
 
-    df = pd.DataFrame(articles)
-    if df.empty:
-        return df
+    return daily
 
-    df['date'] = pd.to_datetime(df['date'])
-    df = df.dropna(subset=['date', 'sentiment_score'])
-    df = df.set_index('date').sort_index()
 
-    # Agrégation journalière : moyenne pondérée
+def aggregate_daily(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrégation journalière des articles : moyenne du sentiment par jour.
+
+    df : articles indexés par date, colonnes sentiment_score, source et
+         éventuellement mentions (copies d'un article dédoublonné, cf. models.dedup) ;
+         ou ItemTable (par (ticker, jour) si la table a des tickers).
+    Retourne un DataFrame indexé par jour (sentiment_score, mention_count, source).
+    """
+    if isinstance(df, ItemTable):
+        return _aggregate_table(df)
+
     daily = df.groupby(df.index.date).agg(
         sentiment_score=('sentiment_score', 'mean'),
-        mention_count=('sentiment_score', 'count'),
+        mention_count=('mentions', 'sum') if 'mentions' in df.columns else ('sentiment_score', 'count'),
         source=('source', 'first')
     )
     daily.index = pd.to_datetime(daily.index)
@@ -101,28 +100,16 @@ def get_news_sentiment(ticker: str, start_date: datetime, end_date: datetime) ->
     return daily.reset_index().rename(columns={'index': 'date'}).set_index('date')
 
 
-def _simulate_news_sentiment(ticker: str, start_date: datetime, end_date: datetime) -> list:
-    """
-    Génère des données de sentiment simulées avec autocorrélation
-    (pour demo sans clé API).
-    """
-    dates = pd.date_range(start=start_date, end=end_date, freq='B')
-    np.random.seed(hash(ticker) % 1000)
-
-    # AR(1) process pour le sentiment
-    scores = []
-    s = 0.0
-    for _ in dates:
-        s = 0.6 * s + 0.4 * np.random.normal(0, 0.4)
-        s = np.clip(s, -1, 1)
-        scores.append(round(s, 4))
-
-    return [
-        {
-            "date": d,
-            "text": f"[Simulated] News about {ticker}",
-            "sentiment_score": s,
-            "source": "news (simulated)"
-        }
-        for d, s in zip(dates, scores)
-    ]
+def _aggregate_table(table: ItemTable) -> pd.DataFrame:
+    tickers, days, inverse = table.day_groups()
+    counts = np.bincount(inverse, minlength=len(days))
+    # Source du premier article de chaque jour, comme ('source', 'first')
+    first = np.full(len(days), len(table))
+    np.minimum.at(first, inverse, np.arange(len(table)))
+    daily = pd.DataFrame({
+        'sentiment_score': np.bincount(inverse, weights=table.score.astype(float), minlength=len(days)) / counts,
+        'mention_count': (counts if table.mentions is None
+                          else np.bincount(inverse, weights=table.mentions, minlength=len(days)).astype(np.int64)),
+        'source': SOURCES.decode(table.source[first])
+    }, index=daily_index(tickers, days, name='date'))
+    return daily if tickers is None else daily.sort_index()
@@ -1,23 +1,32 @@
-import yfinance as yf
+import os
 import pandas as pd
 from datetime import datetime
 
+from data.price_store import get_provider, get_store, window
+from utils.perf import stage
+
+# PRICE_STORE=0 désactive le stockage local (téléchargement direct)
+USE_STORE = os.getenv("PRICE_STORE", "1") != "0"
+
 
 def get_stock_data(ticker: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
     """
-    Télécharge les données OHLCV depuis Yahoo Finance.
+    Retourne les données OHLCV (Yahoo Finance par défaut, cf. PRICE_PROVIDER).
     Retourne un DataFrame avec colonnes : Open, High, Low, Close, Volume.
+
+    Les barres déjà téléchargées sont servies depuis le stockage Parquet local
+    (data/price_store.py) ; seuls les jours manquants sont re-téléchargés.
     """
-    df = yf.download(ticker, start=start_date, end=end_date, auto_adjust=True, progress=False)
+    start, end = window(start_date, end_date)
+
+    with stage("prices", ticker=ticker, store=USE_STORE) as record:
+        if USE_STORE:
+            df = get_store().get(ticker, start, end)
+        else:
+            df = get_provider()(ticker, start, end)
+        record['bars'] = len(df)
 
     if df.empty:
         raise ValueError(f"Aucune donnée trouvée pour {ticker}")
 
-    # Flatten multi-level columns si nécessaire
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.droplevel(1)
-
-    df = df[['Open', 'High', 'Low', 'Close', 'Volume']].dropna()
-    df.index = pd.to_datetime(df.index)
-
     return df
@@ -1,129 +1,234 @@
 import os
+import threading
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from transformers import pipeline
-
-# Réutilise le même modèle FinBERT (lazy load partagé)
-_finbert = None
-
-def _get_finbert():
-    global _finbert
-    if _finbert is None:
-        from transformers import pipeline as pl
-        _finbert = pl(
-            "text-classification",
-            model="ProsusAI/finbert",
-            tokenizer="ProsusAI/finbert",
-            top_k=None,
-            device=-1
-        )
-    return _finbert
-
-
-def _score_text(text: str) -> float:
-    if not text or len(text.strip()) < 10:
-        return 0.0
-    try:
-        result = _get_finbert()(text[:512])[0]
-        scores = {r['label']: r['score'] for r in result}
-        return round(float(scores.get('positive', 0) - scores.get('negative', 0)), 4)
-    except Exception:
-        return 0.0
-
-
-def get_reddit_sentiment(ticker: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+from typing import Dict, List, Tuple
+
+from data.items import ItemTable, WEIGHTING, daily_index, post_weights
+from data.synthetic import simulate_reddit_posts
+from models.sentiment_model import score_texts as _score_texts
+from models import dedup
+from utils.perf import stage
+
+# Subreddits interrogés et nombre max de posts par subreddit,
+# ex. REDDIT_SUBREDDITS="wallstreetbets:50,stocks:50,investing:50,options:25"
+DEFAULT_SUBREDDITS = "wallstreetbets:50,stocks:50,investing:50"
+MAX_WORKERS = int(os.getenv("REDDIT_MAX_WORKERS", "8"))
+
+
+def _parse_subreddits(spec: str) -> Dict[str, int]:
+    subs = {}
+    for item in spec.split(","):
+        name, _, limit = item.strip().partition(":")
+        if name:
+            subs[name] = int(limit) if limit else 50
+    return subs
+
+
+SUBREDDITS = _parse_subreddits(os.getenv("REDDIT_SUBREDDITS", DEFAULT_SUBREDDITS))
+
+# ── Clients Reddit longue durée ───────────────────────────────────────────────
+# PRAW n'est pas thread-safe : chaque thread du pool de recherche garde son
+# propre client, créé une fois puis réutilisé d'un appel à l'autre.
+_local = threading.local()
+_search_pool = None
+_search_pool_lock = threading.Lock()
+
+
+def _new_client():
+    replay_file = os.getenv("REDDIT_REPLAY_FILE", "")
+    if replay_file:
+        from data.reddit_replay import ReplayReddit
+        return ReplayReddit(replay_file)
+
+    import praw
+    return praw.Reddit(
+        client_id=os.getenv("REDDIT_CLIENT_ID", ""),
+        client_secret=os.getenv("REDDIT_CLIENT_SECRET", ""),
+        user_agent=os.getenv("REDDIT_USER_AGENT", "SentimentTrader/1.0")
+    )
+
+
+def _get_client():
+    client = getattr(_local, "client", None)
+    if client is None:
+        client = _local.client = _new_client()
+    return client
+
+
+def _get_search_pool() -> ThreadPoolExecutor:
+    global _search_pool
+    if _search_pool is None:
+        with _search_pool_lock:
+            if _search_pool is None:
+                _search_pool = ThreadPoolExecutor(max_workers=MAX_WORKERS,
+                                                  thread_name_prefix="reddit")
+    return _search_pool
+
+
+def _search_subreddit(sub_name: str, query: str, limit: int) -> List[Tuple[str, object]]:
+    subreddit = _get_client().subreddit(sub_name)
+    return [(sub_name, post)
+            for post in subreddit.search(query, sort="new", time_filter="month", limit=limit)]
+
+
+def _search_all(query: str, subreddits: Dict[str, int]) -> List[Tuple[str, object]]:
+    """Lance les recherches de tous les subreddits en parallèle (ordre conservé)."""
+    pool = _get_search_pool()
+    futures = [(name, pool.submit(_search_subreddit, name, query, limit))
+               for name, limit in subreddits.items()]
+    found = []
+    for name, future in futures:
+        try:
+            found.extend(future.result())
+        except Exception as e:
+            print(f"Reddit API error (r/{name}): {e}")
+    return found
+
+
+def get_reddit_items(ticker: str, start_date: datetime, end_date: datetime,
+                     subreddits: Dict[str, int] = None) -> ItemTable:
     """
-    Récupère les posts Reddit (r/wallstreetbets, r/stocks, r/investing)
-    et calcule leur score de sentiment.
+    Posts Reddit (par défaut r/wallstreetbets, r/stocks, r/investing, cf.
+    REDDIT_SUBREDDITS) scorés, en table compacte (cf. data.items) triée par
+    date, doublons regroupés. Les subreddits sont interrogés en parallèle.
 
     Nécessite dans les variables d'environnement :
       REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, REDDIT_USER_AGENT
+    ou REDDIT_REPLAY_FILE (rejoue des recherches enregistrées, cf. data/reddit_replay.py).
 
     Sans credentials → données simulées pour démonstration.
     """
     client_id = os.getenv("REDDIT_CLIENT_ID", "")
     client_secret = os.getenv("REDDIT_CLIENT_SECRET", "")
-    user_agent = os.getenv("REDDIT_USER_AGENT", "SentimentTrader/1.0")
+    subreddits = subreddits or SUBREDDITS
 
-    posts = []
+    table = None
 
-    if client_id and client_secret:
+    if (client_id and client_secret) or os.getenv("REDDIT_REPLAY_FILE"):
         try:
-            import praw
-            reddit = praw.Reddit(
-                client_id=client_id,
-                client_secret=client_secret,
-                user_agent=user_agent
-            )
-
-            subreddits = ["wallstreetbets", "stocks", "investing"]
             query = f"{ticker} stock"
 
-            for sub_name in subreddits:
-                subreddit = reddit.subreddit(sub_name)
-                for post in subreddit.search(query, sort="new", time_filter="month", limit=50):
-                    post_date = datetime.fromtimestamp(post.created_utc)
+            found = []
+            with stage("reddit.search", ticker=ticker, subreddits=len(subreddits)) as record:
+                for sub_name, post in _search_all(query, subreddits):
+                    # UTC, comme l'horodatage stocké : même jour pour le filtre et l'agrégation
+                    post_date = pd.to_datetime(post.created_utc, unit="s")
                     if start_date <= post_date <= end_date:
-                        text = f"{post.title} {post.selftext[:300]}"
-                        score = _score_text(text)
-                        posts.append({
-                            "date": post_date.date(),
-                            "text": post.title[:200],
-                            "sentiment_score": score,
-                            "upvotes": post.score,
-                            "source": f"reddit/{sub_name}"
-                        })
+                        found.append((sub_name, post, post_date))
+                record['posts'] = len(found)
+
+            texts = [f"{post.title} {post.selftext[:300]}" for _, post, _ in found]
+            groups = np.arange(len(texts))
+            if dedup.ENABLED:
+                with stage("reddit.dedup", ticker=ticker, posts=len(texts)) as record:
+                    groups = dedup.group_duplicates(texts)
+                    record['groups'] = len(np.unique(groups))
+            scores, errors = dedup.score_groups(texts, groups, _score_texts)
+            if errors:
+                first = next(iter(errors.items()))
+                print(f"FinBERT error : {len(errors)}/{len(texts)} post(s) non scoré(s) "
+                      f"(post {first[0]} : {first[1]})")
+
+            if found:
+                # Horodatage UTC complet, comme publishedAt côté news (barres intraday)
+                table = ItemTable.build(
+                    [post_date for _, _, post_date in found], scores,
+                    [f"reddit/{sub_name}" for sub_name, _, _ in found], ticker=ticker,
+                    texts=[post.title for _, post, _ in found],
+                    upvotes=[post.score for _, post, _ in found],
+                    num_comments=[post.num_comments for _, post, _ in found],
+                    dup_group=groups)
         except Exception as e:
             print(f"Reddit API error: {e}")
 
     # ── Fallback simulé ───────────────────────────────────────────────────────
-    if not posts:
-        posts = _simulate_reddit_sentiment(ticker, start_date, end_date)
-
-    df = pd.DataFrame(posts)
-    if df.empty:
-        return df
-
-    df['date'] = pd.to_datetime(df['date'])
-    df = df.dropna(subset=['date', 'sentiment_score'])
-    df = df.set_index('date').sort_index()
-
-    # Agrégation journalière (pondérée par upvotes si disponible)
-    def weighted_avg(group):
-        weights = group.get('upvotes', pd.Series([1] * len(group))).clip(lower=1)
-        return np.average(group['sentiment_score'], weights=weights)
-
-    daily = df.groupby(df.index.date).apply(
-        lambda g: pd.Series({
-            'sentiment_score': np.average(g['sentiment_score'],
-                                          weights=g.get('upvotes', pd.Series([1]*len(g))).clip(lower=1).values),
-            'mention_count': len(g),
-            'source': 'reddit'
-        })
-    )
-    daily.index = pd.to_datetime(daily.index)
+    if table is None:
+        with stage("reddit.simulate", ticker=ticker) as record:
+            table = ItemTable.from_frame(simulate_reddit_posts(ticker, start_date, end_date), ticker=ticker)
+            record['posts'] = len(table)
+
+    table = table.sort()
+    if table.dup_group is not None:
+        table = dedup.collapse_duplicates(table, table.dup_group)
+    return table
+
+
+def get_reddit_sentiment(ticker: str, start_date: datetime, end_date: datetime,
+                         subreddits: Dict[str, int] = None) -> pd.DataFrame:
+    """
+    Sentiment Reddit journalier d'un ticker : get_reddit_items → aggregate_daily.
+    """
+    table = get_reddit_items(ticker, start_date, end_date, subreddits)
+    if table.empty:
+        return pd.DataFrame()
 
+    with stage("reddit.aggregate", ticker=ticker, posts=len(table)) as record:
+        daily = aggregate_daily(table).droplevel('ticker')
+        record['days'] = len(daily)
+
+    return daily
+
+
+def aggregate_daily(df: pd.DataFrame, weighting: str = None) -> pd.DataFrame:
+    """
+    Agrégation journalière des posts : moyenne pondérée du sentiment.
+
+    Calculée en sommes groupées (Σ poids × score / Σ poids) plutôt qu'avec
+    une fonction Python par jour. Si df a une colonne 'ticker', l'agrégation
+    se fait par (ticker, jour).
+
+    Paramètres
+    ----------
+    df        : posts indexés par date, colonnes sentiment_score et
+                éventuellement upvotes, num_comments, ticker, mentions
+                (copies d'un post dédoublonné, cf. models.dedup) ; ou
+                ItemTable (par (ticker, jour) si la table a des tickers)
+    weighting : 'upvotes' (défaut, cf. REDDIT_WEIGHTING), 'log_upvotes',
+                'comments' ou 'none'
+
+    Retourne
+    --------
+    DataFrame indexé par jour (ou par (ticker, jour)) avec colonnes :
+      sentiment_score, mention_count, source
+    """
+    weights = post_weights(df, weighting or WEIGHTING)
+    if isinstance(df, ItemTable):
+        return _aggregate_table(df, weights)
+    scores = df['sentiment_score'].to_numpy(dtype=float)
+
+    day = pd.DatetimeIndex(df.index).normalize()
+    keys = [df['ticker'].to_numpy(), day] if 'ticker' in df.columns else [day]
+
+    sums = pd.DataFrame({
+        'weighted': weights * scores,
+        'weight': weights,
+        'mention_count': (df['mentions'].to_numpy(dtype=np.int64) if 'mentions' in df.columns
+                          else np.ones(len(df), dtype=np.int64)),
+    }).groupby(keys, sort=True).sum()
+
+    daily = pd.DataFrame({
+        'sentiment_score': sums['weighted'] / sums['weight'],
+        'mention_count': sums['mention_count'],
+        'source': 'reddit'
+    })
+    if 'ticker' in df.columns:
+        daily.index.names = ['ticker', None]
+    else:
+        daily.index.name = None
     return daily
 
 
-def _simulate_reddit_sentiment(ticker: str, start_date: datetime, end_date: datetime) -> list:
-    """Génère des données Reddit simulées avec plus de bruit que les news."""
-    dates = pd.date_range(start=start_date, end=end_date, freq='B')
-    np.random.seed((hash(ticker) + 42) % 1000)
-
-    posts = []
-    for d in dates:
-        n_posts = np.random.randint(2, 15)
-        s_base = 0.3 * np.random.normal(0, 0.5)
-        for _ in range(n_posts):
-            s = s_base + np.random.normal(0, 0.3)
-            posts.append({
-                "date": d,
-                "text": f"[Simulated] Reddit post about ${ticker}",
-                "sentiment_score": round(np.clip(s, -1, 1), 4),
-                "upvotes": int(np.random.exponential(50)),
-                "source": "reddit (simulated)"
-            })
-
-    return posts
+def _aggregate_table(table: ItemTable, weights: np.ndarray) -> pd.DataFrame:
+    tickers, days, inverse = table.day_groups()
+    mentions = np.ones(len(table)) if table.mentions is None else table.mentions
+    weighted = np.bincount(inverse, weights=weights * table.score.astype(float), minlength=len(days))
+    weight = np.bincount(inverse, weights=weights, minlength=len(days))
+    daily = pd.DataFrame({
+        'sentiment_score': weighted / weight,
+        'mention_count': np.bincount(inverse, weights=mentions, minlength=len(days)).astype(np.int64),
+        'source': 'reddit'
+    }, index=daily_index(tickers, days))
+    return daily if tickers is None else daily.sort_index()
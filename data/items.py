@@ -0,0 +1,309 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Optional, Sequence
+
+# ── Table compacte d'articles / posts scorés ──────────────────────────────────
+# Remplace les listes de dicts puis DataFrames d'objets (texte complet, libellés
+# de source en chaînes, pd.Timestamp) : une colonne NumPy typée par champ.
+#
+#   ts           int64    secondes depuis 1970-01-01 UTC (naïves, comme datetime64)
+#   score        float32  sentiment (FinBERT sort du float32)
+#   source       int16    code dans SOURCES (libellés internés, partagés)
+#   ticker       int32    code dans TICKERS, optionnel
+#   upvotes, num_comments, mentions  int32, optionnels
+#   dup_group    int32    groupe de doublons (cf. models.dedup), optionnel
+#   text         TextColumn (UTF-8 dans un seul buffer), optionnel : ITEMS_KEEP_TEXT=1
+#
+# Les vocabulaires étant communs au process, les codes de deux tables sont
+# compatibles et concat() n'a rien à recoder. Les agrégations (aggregate_daily
+# news et Reddit, IncrementalEngine) lisent la table directement.
+
+KEEP_TEXT = os.getenv("ITEMS_KEEP_TEXT", "0") == "1"
+TEXT_CHARS = 200  # texte conservé par élément, comme les DataFrames d'origine
+
+SECONDS_PER_DAY = 86_400
+
+
+class Vocabulary:
+    """Libellés internés : code entier stable pour la durée du process (thread-safe)."""
+
+    def __init__(self, dtype=np.int32):
+        self.dtype = np.dtype(dtype)
+        self._codes: Dict[str, int] = {}
+        self._labels: List[str] = []
+        self._lock = threading.Lock()
+
+    def code(self, label: str) -> int:
+        code = self._codes.get(label)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(label)
+                if code is None:
+                    if len(self._labels) > np.iinfo(self.dtype).max:
+                        raise OverflowError(f"Vocabulaire plein ({len(self._labels)} libellés)")
+                    code = self._codes[label] = len(self._labels)
+                    self._labels.append(label)
+        return code
+
+    def encode(self, labels) -> np.ndarray:
+        """Codes d'un libellé répété (str) ou d'une séquence de libellés."""
+        if isinstance(labels, str):
+            return np.array(self.code(labels), dtype=self.dtype)
+        uniq, inverse = np.unique(np.asarray(labels, dtype=object).astype(str), return_inverse=True)
+        codes = np.array([self.code(label) for label in uniq], dtype=self.dtype)
+        return codes[inverse.ravel()]
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return np.asarray(self.labels, dtype=object)[codes]
+
+    @property
+    def labels(self) -> List[str]:
+        return list(self._labels)
+
+    def __len__(self):
+        return len(self._labels)
+
+
+SOURCES = Vocabulary(np.int16)
+TICKERS = Vocabulary(np.int32)
+
+
+class TextColumn:
+    """
+    Textes UTF-8 concaténés dans un buffer uint8, avec offsets int64 : un seul
+    objet NumPy au lieu d'une chaîne Python par élément. texts[i] décode à la demande.
+    """
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, texts: Iterable[str], max_chars: Optional[int] = TEXT_CHARS) -> "TextColumn":
+        encoded = [(t or "")[:max_chars].encode("utf-8") for t in texts]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8).copy(), offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def tolist(self) -> List[str]:
+        return [self[i] for i in range(len(self))]
+
+    def take(self, idx: np.ndarray) -> "TextColumn":
+        starts, ends = self.offsets[idx], self.offsets[np.asarray(idx) + 1]
+        lengths = ends - starts
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # Position de chaque octet de sortie dans le buffer source
+        pos = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return TextColumn(self.data[pos], offsets)
+
+    @classmethod
+    def concat(cls, columns: Sequence["TextColumn"]) -> "TextColumn":
+        shifts = np.cumsum([0] + [len(c.data) for c in columns[:-1]])
+        offsets = np.concatenate([[0]] + [c.offsets[1:] + s for c, s in zip(columns, shifts)])
+        return cls(np.concatenate([c.data for c in columns]), offsets.astype(np.int64))
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + self.offsets.nbytes
+
+
+_DTYPES = {
+    'ts': np.int64, 'score': np.float32, 'source': np.int16, 'ticker': np.int32,
+    'upvotes': np.int32, 'num_comments': np.int32, 'mentions': np.int32, 'dup_group': np.int32,
+}
+_OPTIONAL = ('ticker', 'upvotes', 'num_comments', 'mentions', 'dup_group')
+
+
+def to_epoch(dates) -> np.ndarray:
+    """Dates (datetime, Timestamp, chaînes, datetime64) → secondes int64 ; NaT → -2^63."""
+    return pd.DatetimeIndex(pd.to_datetime(dates)).values.astype('datetime64[s]').astype(np.int64)
+
+
+def daily_index(tickers: Optional[np.ndarray], days: np.ndarray, name: str = None) -> pd.Index:
+    """Index des agrégats journaliers : jours (name), ou (ticker, jour) si tickers."""
+    dates = pd.DatetimeIndex((days * SECONDS_PER_DAY).astype('datetime64[s]').astype('datetime64[ns]'), name=name)
+    if tickers is None:
+        return dates
+    return pd.MultiIndex.from_arrays([TICKERS.decode(tickers), dates], names=['ticker', name])
+
+
+class ItemTable:
+    """
+    Articles ou posts scorés en colonnes typées (cf. en-tête du module).
+
+    Construction : ItemTable.build(dates, scores, source, ...) depuis des
+    listes ou tableaux, ItemTable.from_frame(df) depuis un DataFrame indexé
+    ou avec une colonne date (générateur synthétique, code existant).
+    """
+
+    __slots__ = tuple(_DTYPES) + ('text',)
+
+    def __init__(self, ts: np.ndarray, score: np.ndarray, source: np.ndarray,
+                 text: Optional[TextColumn] = None, **optional):
+        self.ts = np.asarray(ts, dtype=_DTYPES['ts'])
+        self.score = np.asarray(score, dtype=_DTYPES['score'])
+        self.source = np.broadcast_to(np.asarray(source, dtype=_DTYPES['source']), self.ts.shape).copy()
+        for name in _OPTIONAL:
+            values = optional.pop(name, None)
+            if values is not None:
+                values = np.broadcast_to(np.asarray(values, dtype=_DTYPES[name]), self.ts.shape).copy()
+            setattr(self, name, values)
+        if optional:
+            raise TypeError(f"Colonnes inconnues : {', '.join(optional)}")
+        self.text = text
+
+    # ── Construction ─────────────────────────────────────────────────────────
+    @classmethod
+    def build(cls, dates, scores, source, ticker=None, texts=None, keep_text: bool = None,
+              **optional) -> "ItemTable":
+        """
+        Table depuis des colonnes brutes : source et ticker en libellés (un
+        libellé ou un par élément), texts conservés seulement si keep_text
+        (défaut ITEMS_KEEP_TEXT). Les éléments sans date ou sans score sont
+        écartés, comme le dropna des agrégations.
+        """
+        keep_text = KEEP_TEXT if keep_text is None else keep_text
+        ts = to_epoch(dates)
+        scores = np.asarray(scores, dtype=float)
+        valid = (ts != np.iinfo(np.int64).min) & ~np.isnan(scores)
+        table = cls(ts, scores, SOURCES.encode(source),
+                    ticker=None if ticker is None else TICKERS.encode(ticker),
+                    text=TextColumn.from_strings(texts) if keep_text and texts is not None else None,
+                    **optional)
+        return table if valid.all() else table.take(np.flatnonzero(valid))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, ticker: str = None, keep_text: bool = None) -> "ItemTable":
+        """DataFrame d'articles / posts (index date ou colonne date) → table."""
+        dates = df['date'] if 'date' in df.columns else df.index
+        if ticker is None and 'ticker' in df.columns:
+            ticker = df['ticker'].to_numpy()
+        optional = {name: df[name].fillna(1).to_numpy() for name in _OPTIONAL[1:]
+                    if name in df.columns}
+        return cls.build(dates, df['sentiment_score'].to_numpy(), df['source'].to_numpy(),
+                         ticker=ticker, texts=df['text'] if 'text' in df.columns else None,
+                         keep_text=keep_text, **optional)
+
+    @classmethod
+    def concat(cls, tables: Sequence["ItemTable"]) -> "ItemTable":
+        """Concaténation (codes compatibles : vocabulaires communs) ; colonne optionnelle gardée si partout présente."""
+        tables = [t for t in tables if len(t)] or list(tables[:1])
+        if not tables:
+            return cls.empty_table()
+        optional = {}
+        for name in _OPTIONAL:
+            values = [getattr(t, name) for t in tables]
+            if all(v is not None for v in values):
+                optional[name] = np.concatenate(values)
+        texts = [t.text for t in tables]
+        return cls(np.concatenate([t.ts for t in tables]), np.concatenate([t.score for t in tables]),
+                   np.concatenate([t.source for t in tables]),
+                   text=TextColumn.concat(texts) if all(t is not None for t in texts) else None,
+                   **optional)
+
+    @classmethod
+    def empty_table(cls) -> "ItemTable":
+        return cls(np.empty(0, np.int64), np.empty(0, np.float32), np.empty(0, np.int16))
+
+    # ── Sélection ────────────────────────────────────────────────────────────
+    def take(self, idx: np.ndarray) -> "ItemTable":
+        optional = {name: getattr(self, name)[idx] for name in _OPTIONAL if getattr(self, name) is not None}
+        return ItemTable(self.ts[idx], self.score[idx], self.source[idx],
+                         text=None if self.text is None else self.text.take(idx), **optional)
+
+    def sort(self) -> "ItemTable":
+        """Tri chronologique stable (ordre d'arrivée conservé à date égale)."""
+        if (np.diff(self.ts) >= 0).all():
+            return self
+        return self.take(np.argsort(self.ts, kind='stable'))
+
+    def days(self) -> np.ndarray:
+        """Jour de chaque élément, en jours depuis 1970-01-01."""
+        return self.ts // SECONDS_PER_DAY
+
+    def day_groups(self):
+        """
+        Groupes (ticker, jour) des éléments, triés par code ticker puis jour
+        (par jour seul sans colonne ticker) : (tickers, jours, inverse), avec
+        inverse le groupe de chaque élément et tickers None sans colonne ticker.
+        """
+        days = self.days()
+        if self.ticker is None or len(days) == 0:
+            uniq, inverse = np.unique(days, return_inverse=True)
+            return None, uniq, inverse.ravel()
+        lo = days.min()
+        span = days.max() - lo + 1
+        uniq, inverse = np.unique(self.ticker.astype(np.int64) * span + (days - lo), return_inverse=True)
+        return (uniq // span).astype(np.int32), uniq % span + lo, inverse.ravel()
+
+    # ── Lecture ──────────────────────────────────────────────────────────────
+    def __len__(self):
+        return len(self.ts)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.ts) == 0
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self.ts.astype('datetime64[s]').astype('datetime64[ns]'))
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [getattr(self, name) for name in _DTYPES]
+        return sum(a.nbytes for a in arrays if a is not None) + (self.text.nbytes if self.text else 0)
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame indexé par date (sources et tickers en catégories), pour l'affichage."""
+        df = pd.DataFrame({'sentiment_score': self.score.astype(float)},
+                          index=pd.DatetimeIndex(self.dates, name='date'))
+        if self.text is not None:
+            df['text'] = self.text.tolist()
+        df['source'] = pd.Categorical.from_codes(self.source, categories=SOURCES.labels)
+        if self.ticker is not None:
+            df['ticker'] = pd.Categorical.from_codes(self.ticker, categories=TICKERS.labels)
+        for name in ('upvotes', 'num_comments', 'mentions'):
+            if getattr(self, name) is not None:
+                df[name] = getattr(self, name).astype(np.int64)
+        return df
+
+    def __repr__(self):
+        return f"ItemTable({len(self)} éléments, {self.nbytes / 2**20:.1f} Mo)"
+
+
+# ── Pondération des posts ─────────────────────────────────────────────────────
+# Poids d'un post dans les moyennes de sentiment (aggregate_daily Reddit,
+# IncrementalEngine, aggregate_intraday), cf. REDDIT_WEIGHTING.
+
+WEIGHTINGS = ("upvotes", "log_upvotes", "comments", "none")
+WEIGHTING = os.getenv("REDDIT_WEIGHTING", "upvotes")
+
+
+def post_weights(items, weighting: str) -> np.ndarray:
+    """Poids de chaque post selon le schéma de pondération (ItemTable ou DataFrame)."""
+    def col(name):
+        if isinstance(items, ItemTable):
+            values = getattr(items, name)
+            return np.ones(len(items)) if values is None else values.astype(float)
+        if name not in items.columns:
+            return np.ones(len(items))
+        return items[name].fillna(1).to_numpy(dtype=float)
+
+    if weighting == 'upvotes':
+        return np.clip(col('upvotes'), 1, None)
+    if weighting == 'log_upvotes':
+        return 1 + np.log1p(np.clip(col('upvotes'), 0, None))
+    if weighting == 'comments':
+        return np.clip(col('num_comments'), 1, None)
+    if weighting == 'none':
+        return np.ones(len(items))
+    raise ValueError(f"Pondération inconnue : {weighting!r} (choix : {', '.join(WEIGHTINGS)})")
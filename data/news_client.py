@@ -0,0 +1,326 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# ── Client NewsAPI ────────────────────────────────────────────────────────────
+# Session HTTP partagée (connexions réutilisées), nouvelles tentatives avec
+# backoff exponentiel sur erreurs réseau / 429 / 5xx, pagination, et deux
+# états persistants dans un même fichier SQLite :
+#   - budget de requêtes du jour (plan gratuit : 100 / jour), partagé entre
+#     threads et process : une part est réservée à la première page des
+#     tickers pas encore servis, les pages suivantes se partagent le reste ;
+#   - cache des réponses par (ticker, plage de dates) : une plage close (finie
+#     avant aujourd'hui) n'est plus jamais redemandée, une plage qui inclut
+#     aujourd'hui est resservie pendant NEWSAPI_CACHE_TTL secondes.
+#
+# NEWSAPI_BASE_URL permet de viser un serveur local (cf. data/newsapi_stub.py).
+
+BASE_URL = os.getenv("NEWSAPI_BASE_URL", "https://newsapi.org/v2").rstrip("/")
+STATE_PATH = os.path.expanduser(os.getenv(
+    "NEWSAPI_STATE_PATH", os.path.join("~", ".cache", "sentiment_trader", "newsapi.sqlite")
+))
+DAILY_LIMIT = int(os.getenv("NEWSAPI_DAILY_LIMIT", "100"))
+# Requêtes gardées pour la 1re page des tickers pas encore servis aujourd'hui
+RESERVE = int(os.getenv("NEWSAPI_RESERVE", "20"))
+MAX_PER_TICKER = int(os.getenv("NEWSAPI_MAX_PER_TICKER", "5"))
+MAX_PAGES = int(os.getenv("NEWSAPI_MAX_PAGES", "3"))
+CACHE_TTL = float(os.getenv("NEWSAPI_CACHE_TTL", "1800"))
+RETRIES = int(os.getenv("NEWSAPI_RETRIES", "3"))
+MAX_BACKOFF = 10.0  # secondes, même si Retry-After demande plus (timeout de fetch_all)
+PAGE_SIZE = 100
+
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class NewsApiError(Exception):
+    """Réponse d'erreur de NewsAPI (clé invalide, paramètres...)."""
+
+
+class BudgetExhausted(NewsApiError):
+    """Plus de requêtes disponibles aujourd'hui pour ce ticker."""
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # isolation_level=None : transactions explicites (BEGIN IMMEDIATE)
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+class RequestBudget:
+    """
+    Compteur persistant des requêtes NewsAPI du jour (UTC), par ticker.
+
+    Une requête est décomptée dès qu'elle est réservée, qu'elle aboutisse ou
+    non (NewsAPI compte les tentatives). Règles de try_reserve() :
+      - jamais plus de limit requêtes par jour ;
+      - la 1re page d'une recherche passe tant qu'il reste du quota ;
+      - les pages suivantes et les nouvelles tentatives ne passent que hors
+        de la réserve (limit - reserve) et sous max_per_ticker par ticker.
+    """
+
+    def __init__(self, path: str = STATE_PATH, limit: int = DAILY_LIMIT,
+                 reserve: int = RESERVE, max_per_ticker: int = MAX_PER_TICKER):
+        self.path = path
+        self.limit = limit
+        self.reserve = min(reserve, limit)
+        self.max_per_ticker = max_per_ticker
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = _connect(self.path)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS budget ("
+                " day TEXT NOT NULL, ticker TEXT NOT NULL, requests INTEGER NOT NULL,"
+                " PRIMARY KEY (day, ticker))"
+            )
+            self._conn = conn
+        return self._conn
+
+    def try_reserve(self, ticker: str, first_page: bool = True) -> bool:
+        """Décompte une requête pour ticker si les règles le permettent."""
+        day = _today()
+        with self._lock:
+            conn = self._db()
+            conn.execute("BEGIN IMMEDIATE")  # verrou d'écriture inter-process
+            try:
+                total = conn.execute("SELECT COALESCE(SUM(requests), 0) FROM budget WHERE day = ?",
+                                     (day,)).fetchone()[0]
+                row = conn.execute("SELECT requests FROM budget WHERE day = ? AND ticker = ?",
+                                   (day, ticker)).fetchone()
+                used = row[0] if row else 0
+                allowed = total < self.limit and (first_page or (
+                    total < self.limit - self.reserve and used < self.max_per_ticker))
+                if allowed:
+                    conn.execute(
+                        "INSERT INTO budget (day, ticker, requests) VALUES (?, ?, 1)"
+                        " ON CONFLICT (day, ticker) DO UPDATE SET requests = requests + 1",
+                        (day, ticker)
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return allowed
+
+    def exhaust(self):
+        """Le serveur signale le quota atteint : le compteur du jour passe à limit."""
+        day = _today()
+        with self._lock:
+            conn = self._db()
+            conn.execute("BEGIN IMMEDIATE")  # lecture + écriture sous le même verrou, comme try_reserve
+            try:
+                used = conn.execute("SELECT COALESCE(SUM(requests), 0) FROM budget WHERE day = ?",
+                                    (day,)).fetchone()[0]
+                if used < self.limit:
+                    conn.execute(
+                        "INSERT INTO budget (day, ticker, requests) VALUES (?, '*', ?)"
+                        " ON CONFLICT (day, ticker) DO UPDATE SET requests = requests + excluded.requests",
+                        (day, self.limit - used)
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def usage(self) -> Dict:
+        """Requêtes du jour : total, restantes et détail par ticker."""
+        with self._lock:
+            rows = self._db().execute("SELECT ticker, requests FROM budget WHERE day = ?",
+                                      (_today(),)).fetchall()
+        used = sum(n for _, n in rows)
+        return {'used': used, 'remaining': max(0, self.limit - used), 'per_ticker': dict(rows)}
+
+
+class ResponseCache:
+    """Articles déjà récupérés, par clé de requête (sans la clé d'API)."""
+
+    def __init__(self, path: str = STATE_PATH, ttl: float = CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = _connect(self.path)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, fetched_at REAL NOT NULL, closed INTEGER NOT NULL,"
+                " articles TEXT NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        try:
+            with self._lock:
+                row = self._db().execute(
+                    "SELECT fetched_at, closed, articles FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"NewsAPI cache error: {e}")
+            return None
+        if row is None:
+            return None
+        fetched_at, closed, articles = row
+        if not closed and time.time() - fetched_at > self.ttl:
+            return None
+        return json.loads(articles)
+
+    def put(self, key: str, articles: List[Dict], closed: bool):
+        try:
+            with self._lock:
+                self._db().execute(
+                    "INSERT OR REPLACE INTO responses (key, fetched_at, closed, articles)"
+                    " VALUES (?, ?, ?, ?)",
+                    (key, time.time(), int(closed), json.dumps(articles))
+                )
+        except sqlite3.Error as e:
+            print(f"NewsAPI cache error: {e}")
+
+
+class NewsApiClient:
+    """
+    Recherche /everything paginée, avec budget de requêtes et cache.
+
+    Exemple
+    -------
+    client = NewsApiClient(api_key)
+    articles, info = client.everything("AAPL", start_date, end_date)
+    info  # {'cached': False, 'pages': 2, 'requests': 2, 'retries': 0, 'truncated': False}
+    """
+
+    def __init__(self, api_key: str, base_url: str = BASE_URL, budget: RequestBudget = None,
+                 cache: ResponseCache = None, max_pages: int = MAX_PAGES,
+                 retries: int = RETRIES, backoff: float = 0.5, timeout: float = 10,
+                 pool_size: int = 8):
+        self.base_url = base_url.rstrip("/")
+        self.budget = budget or RequestBudget()
+        self.cache = cache or ResponseCache()
+        self.max_pages = max_pages
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        # En-tête plutôt que paramètre : la clé n'apparaît ni dans les URLs ni dans les logs
+        self.session.headers["X-Api-Key"] = api_key
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def everything(self, ticker: str, start_date: datetime,
+                   end_date: datetime) -> Tuple[List[Dict], Dict]:
+        """
+        Articles mentionnant ticker entre start_date et end_date (toutes pages).
+
+        Relève BudgetExhausted si la 1re page ne peut pas être demandée ;
+        si une page suivante ne peut pas l'être, retourne les pages déjà
+        obtenues avec info['truncated'] = True.
+        """
+        params = {
+            "q": ticker,
+            "from": start_date.strftime("%Y-%m-%d"),
+            "to": end_date.strftime("%Y-%m-%d"),
+            "language": "en",
+            "sortBy": "publishedAt",
+            "pageSize": PAGE_SIZE,
+        }
+        key = hashlib.sha256(f"{self.base_url}\x00{json.dumps(params, sort_keys=True)}"
+                             .encode("utf-8")).hexdigest()
+        info = {'cached': False, 'pages': 0, 'requests': 0, 'retries': 0, 'truncated': False}
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            info['cached'] = True
+            return cached, info
+
+        articles = []
+        for page in range(1, self.max_pages + 1):
+            data = self._get(ticker, {**params, "page": page}, info)
+            if data is None:  # fin des résultats accessibles (plan gratuit : 100)
+                break
+            batch = data.get("articles", [])
+            articles.extend(batch)
+            info['pages'] = page
+            if len(batch) < PAGE_SIZE or len(articles) >= data.get("totalResults", 0):
+                break
+        else:
+            info['truncated'] = True
+
+        # Une plage close ne changera plus ; une troncature n'est pas mise en cache
+        if not info['truncated']:
+            closed = end_date.strftime("%Y-%m-%d") < _today()
+            self.cache.put(key, articles, closed)
+        return articles, info
+
+    def _get(self, ticker: str, params: Dict, info: Dict) -> Optional[Dict]:
+        """Une page, avec nouvelles tentatives ; None si NewsAPI n'en sert pas davantage."""
+        first_page = params["page"] == 1
+        for attempt in range(self.retries + 1):
+            if not self.budget.try_reserve(ticker, first_page=first_page and attempt == 0):
+                if first_page:
+                    raise BudgetExhausted(f"quota NewsAPI du jour épuisé ({ticker})")
+                info['truncated'] = True
+                return None
+            info['requests'] += 1
+            info['retries'] += attempt > 0
+
+            try:
+                resp = self.session.get(f"{self.base_url}/everything", params=params,
+                                        timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * 2 ** attempt)
+                continue
+
+            try:
+                data = resp.json()
+            except ValueError:  # page HTML d'un proxy, corps vide...
+                data = {}
+            if resp.status_code == 200 and data.get("status") == "ok":
+                return data
+
+            code = data.get("code", "")
+            if code == "maximumResultsReached":
+                return None
+            if code == "rateLimited":
+                self.budget.exhaust()
+                raise BudgetExhausted(f"quota NewsAPI atteint côté serveur : {data.get('message', '')}")
+            if resp.status_code in _RETRY_STATUS and attempt < self.retries:
+                retry_after = resp.headers.get("Retry-After", "")
+                delay = float(retry_after) if retry_after.isdigit() else self.backoff * 2 ** attempt
+                time.sleep(min(delay, MAX_BACKOFF))
+                continue
+            raise NewsApiError(f"HTTP {resp.status_code} {code}: {data.get('message', resp.reason)}")
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client(api_key: str) -> NewsApiClient:
+    """Client partagé du process (recréé si la clé change)."""
+    global _client
+    with _client_lock:
+        if _client is None or _client.session.headers.get("X-Api-Key") != api_key:
+            _client = NewsApiClient(api_key)
+        return _client
@@ -0,0 +1,154 @@
+import json
+import socket
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+from urllib.parse import urlparse, parse_qs
+
+import pandas as pd
+
+# ── Serveur NewsAPI local ─────────────────────────────────────────────────────
+# Imite GET /v2/everything (pagination, totalResults, limite de résultats du
+# plan gratuit, erreurs au format NewsAPI) avec des articles déterministes,
+# pour tester data/news_client.py sans réseau ni quota :
+#
+#   python -m data.newsapi_stub --port 8765
+#   NEWSAPI_BASE_URL=http://127.0.0.1:8765/v2 NEWSAPI_KEY=test streamlit run app.py
+#
+# Les compteurs (requêtes, connexions) et l'injection de pannes (fail_next)
+# servent aux tests et au benchmark.
+
+TEMPLATES = [
+    ("{t} shares rise after analysts raise price target",
+     "Several brokers lifted their targets on {t}, citing strong demand and margins."),
+    ("{t} faces regulatory probe over business practices",
+     "Authorities opened an inquiry into {t}, weighing on the stock in early trading."),
+    ("{t} reports quarterly results in line with expectations",
+     "Revenue and earnings for {t} matched consensus; guidance was left unchanged."),
+    ("{t} announces new product line and expanded buyback",
+     "{t} unveiled new products and increased its share repurchase program."),
+    ("{t} slips as supply chain issues persist",
+     "Ongoing component shortages could hurt {t} deliveries this quarter."),
+]
+
+
+class NewsApiStub(ThreadingHTTPServer):
+    """
+    Serveur de test. Attributs :
+      articles_per_day : articles générés par jour et par requête
+      max_results      : au-delà, erreur maximumResultsReached (plan gratuit : 100)
+      requests, connections : compteurs depuis le démarrage
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, articles_per_day: int = 6, max_results: int = 100):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.articles_per_day = articles_per_day
+        self.max_results = max_results
+        self.requests = 0
+        self.connections = 0
+        self._failures = []
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v2"
+
+    def fail_next(self, n: int, status: int = 503, code: str = "unexpectedError"):
+        """Les n prochaines requêtes reçoivent une erreur (status, code)."""
+        with self._lock:
+            self._failures += [(status, code)] * n
+
+    def _next_failure(self):
+        with self._lock:
+            return self._failures.pop(0) if self._failures else None
+
+    def articles(self, q: str, start: str, end: str):
+        """Articles déterministes pour (q, jour), du plus récent au plus ancien."""
+        out = []
+        for day in reversed(pd.date_range(start, end, freq="D")):
+            seed = zlib.crc32(f"{q}:{day.date()}".encode())
+            for k in range(self.articles_per_day):
+                title, description = TEMPLATES[(seed + k) % len(TEMPLATES)]
+                out.append({
+                    "source": {"id": None, "name": f"Wire {(seed >> 3) % 7}"},
+                    "title": title.format(t=q),
+                    "description": description.format(t=q),
+                    "publishedAt": f"{day.date()}T{(seed + 5 * k) % 24:02d}:{(seed // 7 + k) % 60:02d}:00Z",
+                })
+        return out
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive : les connexions du client sont réutilisées
+
+    def setup(self):
+        super().setup()
+        # En-têtes et corps partent en deux écritures : sans TCP_NODELAY, Nagle +
+        # ACK différé ajoutent ~40 ms par réponse sur une connexion réutilisée
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server._lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, code: str, message: str = ""):
+        self._send(status, {"status": "error", "code": code, "message": message or code})
+
+    def do_GET(self):
+        server = self.server
+        with server._lock:
+            server.requests += 1
+
+        url = urlparse(self.path)
+        if url.path != "/v2/everything":
+            return self._error(404, "notFound")
+        failure = server._next_failure()
+        if failure:
+            return self._error(*failure)
+
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if not (self.headers.get("X-Api-Key") or params.get("apiKey")):
+            return self._error(401, "apiKeyMissing")
+
+        page = int(params.get("page", 1))
+        size = min(int(params.get("pageSize", 100)), 100)
+        if (page - 1) * size >= server.max_results:
+            return self._error(426, "maximumResultsReached",
+                               f"Developer accounts are limited to {server.max_results} results.")
+
+        articles = server.articles(params.get("q", ""), params["from"], params["to"])
+        page_articles = articles[(page - 1) * size:min(page * size, server.max_results)]
+        self._send(200, {"status": "ok", "totalResults": len(articles), "articles": page_articles})
+
+
+def start_stub(**kwargs) -> Tuple[NewsApiStub, threading.Thread]:
+    """Démarre un serveur sur un port libre dans un thread ; server.shutdown() pour l'arrêter."""
+    server = NewsApiStub(**kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True, name="newsapi-stub")
+    thread.start()
+    return server, thread
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serveur NewsAPI local pour tests")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--articles-per-day", type=int, default=6)
+    parser.add_argument("--max-results", type=int, default=100)
+    args = parser.parse_args()
+    stub = NewsApiStub(args.port, args.articles_per_day, args.max_results)
+    print(f"NEWSAPI_BASE_URL={stub.base_url}")
+    stub.serve_forever()
@@ -0,0 +1,204 @@
+import os
+import json
+import threading
+import pandas as pd
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from utils.perf import stage
+
+# ── Stockage local incrémental des prix OHLCV ─────────────────────────────────
+# Un fichier Parquet par ticker + un fichier JSON décrivant la plage de dates
+# couverte. Seuls les segments manquants (avant / après la plage connue) sont
+# téléchargés ; la fenêtre demandée est ensuite servie depuis le disque.
+
+STORE_DIR = os.path.expanduser(os.getenv(
+    "PRICE_STORE_DIR", os.path.join("~", ".cache", "sentiment_trader", "prices")
+))
+COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Un provider prend (ticker, start, end exclusif) et retourne un DataFrame OHLCV.
+# Un DataFrame vide signifie "aucune barre sur ce segment" (confirmé) ; en cas
+# d'échec, ou si le vide est ambigu, le provider lève ProviderError et le
+# segment reste à télécharger.
+Provider = Callable[[str, pd.Timestamp, pd.Timestamp], pd.DataFrame]
+
+
+class ProviderError(ValueError):
+    """Téléchargement en échec, ou résultat vide dont on ne sait pas s'il est définitif."""
+
+
+def _clean(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        # Colonnes float : même dtype que les barres relues depuis Parquet
+        return pd.DataFrame({c: pd.Series(dtype=float) for c in COLUMNS},
+                            index=pd.DatetimeIndex([], name='Date'))
+
+    # Flatten multi-level columns si nécessaire
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.droplevel(1)
+
+    df = df[COLUMNS].dropna()
+    df.index = pd.to_datetime(df.index)
+    if df.index.tz is not None:
+        df.index = df.index.tz_localize(None)
+    df.index.name = 'Date'
+    return df
+
+
+def yfinance_provider(ticker: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    import yfinance as yf
+    df = yf.download(ticker, start=start, end=end, auto_adjust=True, progress=False)
+    if df.empty:
+        # Plage sans jour ouvré (week-end) : vide confirmé, le segment est couvert
+        if len(pd.bdate_range(start, end - pd.Timedelta(days=1))) == 0:
+            return _clean(df)
+        # Sinon yfinance rend un DataFrame vide aussi bien sur erreur réseau que
+        # sur un jour férié : rien ne permet de marquer le segment couvert
+        raise ProviderError(f"Aucune donnée trouvée pour {ticker} ({start.date()} → {end.date()})")
+    return _clean(df)
+
+
+class FixtureProvider:
+    """
+    Provider hors-ligne : lit <dossier>/<TICKER>.csv (colonnes Date, Open,
+    High, Low, Close, Volume). Utile pour les tests et les démos sans réseau.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def __call__(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        path = os.path.join(self.directory, f"{ticker}.csv")
+        df = pd.read_csv(path, index_col=0, parse_dates=True)
+        df = _clean(df)
+        return df[(df.index >= start) & (df.index < end)]
+
+
+def synthetic_provider(ticker: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    """Prix simulés déterministes (data/synthetic.py), sans réseau ni clé API."""
+    from data.synthetic import simulate_prices
+    return simulate_prices(ticker, start, end - pd.Timedelta(days=1))
+
+
+def get_provider(spec: str = None) -> Provider:
+    """
+    Provider désigné par PRICE_PROVIDER :
+      "yfinance" (défaut), "synthetic" ou "fixture:<dossier de CSV>"
+    """
+    spec = spec or os.getenv("PRICE_PROVIDER", "yfinance")
+    if spec == "yfinance":
+        return yfinance_provider
+    if spec == "synthetic":
+        return synthetic_provider
+    if spec.startswith("fixture:"):
+        return FixtureProvider(spec.split(":", 1)[1])
+    raise ValueError(f"PRICE_PROVIDER inconnu : {spec!r}")
+
+
+class PriceStore:
+    """Cache Parquet par ticker, complété uniquement sur les segments manquants."""
+
+    def __init__(self, root: str = STORE_DIR, provider: Provider = None):
+        self.root = root
+        self.provider = provider or get_provider()
+        self._lock = threading.Lock()
+
+    def _paths(self, ticker: str) -> Tuple[str, str]:
+        base = os.path.join(self.root, ticker.upper())
+        return base + ".parquet", base + ".json"
+
+    def coverage(self, ticker: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Plage [début, fin exclusive) déjà couverte sur disque, ou None."""
+        _, meta_path = self._paths(ticker)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return pd.Timestamp(meta['start']), pd.Timestamp(meta['end'])
+
+    def _load(self, ticker: str) -> pd.DataFrame:
+        data_path, _ = self._paths(ticker)
+        if not os.path.exists(data_path):
+            return _clean(pd.DataFrame())
+        return pd.read_parquet(data_path)
+
+    def _save(self, ticker: str, df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp):
+        os.makedirs(self.root, exist_ok=True)
+        data_path, meta_path = self._paths(ticker)
+        # Données d'abord, plage ensuite : un arrêt entre les deux ne fait
+        # que sous-estimer la couverture (re-téléchargement, pas de trou)
+        df.to_parquet(data_path + ".tmp")
+        os.replace(data_path + ".tmp", data_path)
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump({'start': start.isoformat(), 'end': end.isoformat()}, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def missing_segments(self, ticker: str, start: pd.Timestamp,
+                         end: pd.Timestamp) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        cov = self.coverage(ticker)
+        if cov is None:
+            return [(start, end)]
+        segments = []
+        if start < cov[0]:
+            segments.append((start, cov[0]))
+        if end > cov[1]:
+            segments.append((cov[1], end))
+        return segments
+
+    def get(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        """Fenêtre [start, end) servie depuis le disque après complétion éventuelle."""
+        with self._lock:
+            segments = self.missing_segments(ticker, start, end)
+            df = self._load(ticker)
+
+            if segments:
+                with stage("prices.download", ticker=ticker, segments=len(segments)) as record:
+                    new, confirmed = [], []
+                    for a, b in segments:
+                        try:
+                            new.append(self.provider(ticker, a, b))
+                            confirmed.append((a, b))
+                        except ProviderError as e:
+                            record['failed'] = record.get('failed', 0) + 1
+                            print(f"Prix {ticker} : {e}")
+                    record['bars'] = sum(len(n) for n in new)
+
+                frames = [f for f in [df] + new if not f.empty]
+                if frames:
+                    df = pd.concat(frames)
+                    df = df[~df.index.duplicated(keep='last')].sort_index()
+
+                # Couverture étendue aux seuls segments téléchargés avec succès.
+                # La barre du jour n'est pas définitive : la couverture s'arrête
+                # à aujourd'hui pour qu'elle soit re-téléchargée au prochain appel
+                if confirmed:
+                    today = pd.Timestamp.today().normalize()
+                    cov = self.coverage(ticker)
+                    new_start, new_end = cov if cov else (None, None)
+                    for a, b in confirmed:
+                        new_start = a if new_start is None else min(new_start, a)
+                        new_end = min(b, today) if new_end is None else max(new_end, min(b, today))
+                    self._save(ticker, df, new_start, max(new_end, new_start))
+
+        return df[(df.index >= start) & (df.index < end)]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> PriceStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PriceStore()
+    return _store
+
+
+def window(start_date: datetime, end_date: datetime) -> Tuple[pd.Timestamp, pd.Timestamp]:
+    """Fenêtre journalière [start, end) couvrant le jour de end_date inclus."""
+    start = pd.Timestamp(start_date).normalize()
+    end = pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)
+    return start, end
@@ -0,0 +1,65 @@
+import json
+import os
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+
+# ── Client Reddit de rejeu ────────────────────────────────────────────────────
+# Imite l'API PRAW utilisée par fetch_reddit (reddit.subreddit(nom).search(...))
+# à partir de résultats de recherche enregistrés dans un fichier JSON :
+#
+#   {"wallstreetbets": {"AAPL stock": [{"title": ..., "selftext": ...,
+#                                       "score": 12, "num_comments": 3,
+#                                       "created_utc": 1718000000.0}, ...]}}
+#
+# Activé via REDDIT_REPLAY_FILE=chemin/vers/fichier.json ; REDDIT_REPLAY_LATENCY
+# (secondes par recherche) simule l'aller-retour réseau de l'API.
+
+POST_FIELDS = ("title", "selftext", "score", "num_comments", "created_utc")
+
+
+class _ReplaySubreddit:
+    def __init__(self, results: Dict[str, List[dict]], latency: float):
+        self._results = results
+        self._latency = latency
+
+    def search(self, query: str, sort: str = "new", time_filter: str = "month", limit: int = 100):
+        if self._latency:
+            time.sleep(self._latency)
+        posts = self._results.get(query, [])
+        return [SimpleNamespace(**{f: p.get(f, "" if f in ("title", "selftext") else 0)
+                                   for f in POST_FIELDS})
+                for p in posts[:limit]]
+
+
+class ReplayReddit:
+    """Remplaçant hors-ligne de praw.Reddit pour les tests."""
+
+    def __init__(self, path: str, latency: float = None):
+        with open(path, encoding="utf-8") as f:
+            self._data = json.load(f)
+        self.latency = float(os.getenv("REDDIT_REPLAY_LATENCY", "0")) if latency is None else latency
+
+    def subreddit(self, name: str) -> _ReplaySubreddit:
+        return _ReplaySubreddit(self._data.get(name, {}), self.latency)
+
+
+def record_searches(reddit, subreddits: Dict[str, int], queries: List[str], path: str):
+    """
+    Enregistre de vraies recherches (client praw.Reddit) au format de rejeu.
+
+    Exemple
+    -------
+    record_searches(praw.Reddit(...), {"stocks": 50}, ["AAPL stock"], "aapl.json")
+    """
+    data = {}
+    for sub_name, limit in subreddits.items():
+        subreddit = reddit.subreddit(sub_name)
+        data[sub_name] = {
+            query: [{f: getattr(post, f, None) for f in POST_FIELDS}
+                    for post in subreddit.search(query, sort="new", time_filter="month",
+                                                 limit=limit)]
+            for query in queries
+        }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
@@ -0,0 +1,202 @@
+import hashlib
+import functools
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, List
+
+# ── Générateur de données synthétiques (démo sans clé API, tests de charge) ───
+# Entièrement vectorisé et déterministe :
+#  - graine stable par ticker (SHA-256, indépendante de PYTHONHASHSEED) ;
+#  - séries journalières générées depuis une origine fixe (EPOCH) puis
+#    découpées, pour qu'une date ait la même valeur quelle que soit la
+#    fenêtre demandée (cache, workers, re-runs) ;
+#  - tirages par post générés par année civile, chaque année ayant sa graine.
+# Chaque quantité a son propre flux, tiré en un seul appel (ou en bloc (n, k)) :
+# les n premières valeurs ne dépendent pas de la longueur totale demandée.
+# Les dates antérieures à EPOCH ne sont pas générées. NumPy seul : pas
+# d'import scipy (lent, et non sûr depuis plusieurs threads à la fois).
+
+EPOCH = pd.Timestamp("2000-01-03")
+
+# Flux aléatoires indépendants par usage
+_NEWS, _REDDIT_DAYS, _REDDIT_POSTS, _PRICES = 1, 2, 3, 4
+
+
+def ticker_seed(ticker: str) -> int:
+    """Graine stable entre process et machines (contrairement à hash())."""
+    return int.from_bytes(hashlib.sha256(ticker.upper().encode("utf-8")).digest()[:8], "little")
+
+
+def _rng(ticker: str, stream: int, *extra: int) -> np.random.Generator:
+    return np.random.default_rng([ticker_seed(ticker), stream, *extra])
+
+
+@functools.lru_cache(maxsize=32)
+def _business_days(end: pd.Timestamp) -> pd.DatetimeIndex:
+    days = pd.date_range(EPOCH, end, freq="D")
+    return days[days.dayofweek < 5]
+
+
+def _days(end_date) -> pd.DatetimeIndex:
+    """Jours ouvrés de EPOCH à end_date inclus."""
+    return _business_days(pd.Timestamp(end_date).normalize())
+
+
+def _window(days: pd.DatetimeIndex, start_date, end_date) -> slice:
+    lo = days.searchsorted(pd.Timestamp(start_date).normalize(), side="left")
+    hi = days.searchsorted(pd.Timestamp(end_date).normalize(), side="right")
+    return slice(lo, hi)
+
+
+def _ar1(noise: np.ndarray, phi: float = 0.6, scale: float = 0.4, block: int = 128) -> np.ndarray:
+    """
+    s_t = phi·s_{t-1} + scale·e_t, borné à [-1, 1] après filtrage.
+
+    Filtre calculé par blocs de `block` pas : produit par la matrice de
+    Toeplitz des puissances de phi à l'intérieur d'un bloc, seule la valeur
+    de fin de bloc est propagée séquentiellement (n / block tours).
+    """
+    x = scale * np.asarray(noise, dtype=float)
+    n = len(x)
+    powers = phi ** np.arange(block)
+    lags = np.subtract.outer(np.arange(block), np.arange(block))
+    toeplitz = np.where(lags >= 0, powers[np.clip(lags, 0, None)], 0.0)
+
+    # Un produit par bloc, de forme fixe : résultat bit à bit identique quelle
+    # que soit la longueur totale (un seul produit matriciel ne le garantit pas)
+    x = np.concatenate([x, np.zeros(-n % block)]).reshape(-1, block)
+    y = np.empty_like(x)
+    carry_gain = phi * powers  # phi^(t+1) : effet de l'état initial du bloc
+    carry = 0.0
+    for b in range(len(x)):
+        y[b] = toeplitz @ x[b] + carry * carry_gain
+        carry = y[b, -1]
+    return np.clip(y.ravel()[:n], -1, 1)
+
+
+def _news_scores(ticker: str, n_days: int) -> np.ndarray:
+    return _ar1(_rng(ticker, _NEWS).normal(0, 0.4, n_days))
+
+
+def simulate_news(ticker: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+    """
+    Un article simulé par jour ouvré, sentiment AR(1) autocorrélé.
+    Colonnes : date, text, sentiment_score, source.
+    """
+    days = _days(end_date)
+    if len(days) == 0:
+        return pd.DataFrame(columns=["date", "text", "sentiment_score", "source"])
+    scores = _news_scores(ticker, len(days))
+    # Heure de publication aléatoire dans la journée
+    seconds = _rng(ticker, _NEWS, 1).integers(0, 86_400, len(days))
+
+    w = _window(days, start_date, end_date)
+    return pd.DataFrame({
+        "date": days[w] + pd.to_timedelta(seconds[w], unit="s"),
+        "text": f"[Simulated] News about {ticker}",
+        "sentiment_score": scores[w].round(4),
+        "source": "news (simulated)"
+    })
+
+
+def simulate_reddit_posts(ticker: str, start_date: datetime, end_date: datetime,
+                          posts_per_day: float = 8.0) -> pd.DataFrame:
+    """
+    Posts Reddit simulés : nombre de posts par jour ~ Poisson(posts_per_day),
+    sentiment = tendance du jour + bruit propre au post (plus bruité que les news).
+    Colonnes : date, text, sentiment_score, upvotes, num_comments, source.
+    """
+    days = _days(end_date)
+    counts = _rng(ticker, _REDDIT_DAYS).poisson(posts_per_day, len(days))
+    day_base = 0.3 * _rng(ticker, _REDDIT_DAYS, 1).normal(0, 0.5, len(days))
+
+    w = _window(days, start_date, end_date)
+    win_days = np.arange(len(days))[w]
+    if len(win_days) == 0:
+        return pd.DataFrame(columns=["date", "text", "sentiment_score", "upvotes",
+                                     "num_comments", "source"])
+
+    # Tirages par post, année par année (graine propre à chaque année)
+    years = days.year.to_numpy()
+    parts = []
+    for year in np.unique(years[win_days]):
+        year_days = np.flatnonzero(years == year)
+        day_idx = np.repeat(year_days, counts[year_days])
+        u = _rng(ticker, _REDDIT_POSTS, int(year)).random((len(day_idx), 3))
+        noise = _rng(ticker, _REDDIT_POSTS, int(year), 1).normal(0, 0.3, len(day_idx))
+        parts.append((day_idx, u, noise))
+
+    day_idx, u, noise = (np.concatenate([p[k] for p in parts]) for k in range(3))
+    keep = (day_idx >= win_days[0]) & (day_idx <= win_days[-1])
+    day_idx, u, noise = day_idx[keep], u[keep], noise[keep]
+
+    upvotes = (-50 * np.log1p(-u[:, 0])).astype(np.int64)           # ~ Exp(50)
+    num_comments = (-(1 + upvotes / 10) * np.log1p(-u[:, 1])).astype(np.int64)
+    seconds = (u[:, 2] * 86_400).astype(np.int64)
+
+    return pd.DataFrame({
+        "date": days[day_idx] + pd.to_timedelta(seconds, unit="s"),
+        "text": f"[Simulated] Reddit post about ${ticker}",
+        "sentiment_score": np.clip(day_base[day_idx] + noise, -1, 1).round(4),
+        "upvotes": upvotes,
+        "num_comments": num_comments,
+        "source": "reddit (simulated)"
+    })
+
+
+def simulate_prices(ticker: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+    """
+    Barres OHLCV journalières simulées (jours ouvrés, end_date inclus).
+    Le rendement du jour dépend légèrement du sentiment news de la veille,
+    pour que les stratégies aient un signal à capter.
+    """
+    days = _days(end_date)
+    n = len(days)
+    if n == 0:
+        return pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"],
+                            index=pd.DatetimeIndex([], name="Date"))
+    z = _rng(ticker, _PRICES).standard_normal((n, 5))
+
+    news_prev = np.concatenate([[0.0], _news_scores(ticker, n)[:-1]])
+    ret = 0.0003 + 0.002 * news_prev + 0.015 * z[:, 0]
+    close = 100 * np.exp(np.cumsum(np.log1p(ret)))
+    prev_close = np.concatenate([[100.0], close[:-1]])
+    open_ = prev_close * (1 + 0.003 * z[:, 1])
+    high = np.maximum(open_, close) * (1 + np.abs(0.005 * z[:, 2]))
+    low = np.minimum(open_, close) * (1 - np.abs(0.005 * z[:, 3]))
+    volume = np.exp(15 + 0.4 * z[:, 4]).astype(np.int64)
+
+    w = _window(days, start_date, end_date)
+    return pd.DataFrame({
+        "Open": open_[w], "High": high[w], "Low": low[w], "Close": close[w], "Volume": volume[w]
+    }, index=pd.DatetimeIndex(days[w], name="Date"))
+
+
+def simulate_universe(tickers: List[str], start_date: datetime, end_date: datetime,
+                      posts_per_day: float = 8.0) -> Dict[str, pd.DataFrame]:
+    """
+    Jeu de données complet pour un univers de tickers.
+
+    Retourne
+    --------
+    dict avec :
+      closes : date × ticker, prix de clôture
+      news   : date × ticker, score news du jour
+      posts  : posts Reddit (format long, colonne ticker en plus)
+    """
+    closes, news, posts = {}, {}, []
+    for ticker in tickers:
+        closes[ticker] = simulate_prices(ticker, start_date, end_date)["Close"]
+        n = simulate_news(ticker, start_date, end_date)
+        news[ticker] = pd.Series(n["sentiment_score"].to_numpy(),
+                                 index=pd.DatetimeIndex(n["date"]).normalize())
+        p = simulate_reddit_posts(ticker, start_date, end_date, posts_per_day)
+        p["ticker"] = ticker
+        posts.append(p)
+
+    return {
+        "closes": pd.DataFrame(closes),
+        "news": pd.DataFrame(news),
+        "posts": pd.concat(posts, ignore_index=True),
+    }
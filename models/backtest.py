@@ -2,6 +2,30 @@ import pandas as pd
 import numpy as np
 from typing import Tuple, Dict
 
+from models.signal_generator import SIGNAL_BUY, SIGNAL_HOLD, encode_signals
+
+
+def _positions_from_signals(codes: np.ndarray) -> np.ndarray:
+    """
+    Machine à états long-only vectorisée, le long de l'axe 0 (le temps).
+
+    On entre sur BUY, on sort sur SELL ; un BUY déjà en position ou un SELL
+    hors position ne change rien. La position est donc simplement le dernier
+    événement non-HOLD rencontré (forward-fill) : 1 si BUY, 0 si SELL ou
+    avant le premier événement. Fonctionne pour des tableaux 1D ou nD
+    (ex. date × ticker).
+    """
+    codes = np.asarray(codes)
+    n = codes.shape[0]
+    steps = np.arange(n).reshape((n,) + (1,) * (codes.ndim - 1))
+
+    # Index du dernier événement à chaque date (-1 = aucun encore)
+    last = np.where(codes != SIGNAL_HOLD, steps, -1)
+    last = np.maximum.accumulate(last, axis=0)
+
+    last_code = np.take_along_axis(codes, np.maximum(last, 0), axis=0)
+    return ((last >= 0) & (last_code == SIGNAL_BUY)).astype(np.int64)
+
 
 def run_backtest(
     signal_df: pd.DataFrame,
@@ -35,15 +59,7 @@ def run_backtest(
 
     # Position : 1 = long, 0 = pas en position
     # On rentre au close du jour du signal, on sort le jour suivant
-    position = pd.Series(0, index=common_idx)
-    in_position = False
-
-    for i, (date, signal) in enumerate(sig.items()):
-        if signal == 'BUY' and not in_position:
-            in_position = True
-        elif signal == 'SELL' and in_position:
-            in_position = False
-        position.loc[date] = 1 if in_position else 0
+    position = pd.Series(_positions_from_signals(encode_signals(sig.to_numpy())), index=common_idx)
 
     # Décalage : on applique la position du jour J sur le rendement J+1
     position_shifted = position.shift(1).fillna(0)
@@ -0,0 +1,167 @@
+import os
+import re
+import zlib
+import numpy as np
+import pandas as pd
+from collections import defaultdict
+from typing import Callable, Dict, List, Tuple
+
+from data.items import ItemTable
+from models.score_cache import normalize_text
+
+# ── Regroupement des quasi-doublons avant scoring ─────────────────────────────
+# Les dépêches syndiquées reviennent plusieurs fois dans une réponse NewsAPI et
+# les cross-posts Reddit se répètent d'un subreddit à l'autre. Les textes sont
+# regroupés (identiques après normalisation, ou proches au sens de Jaccard sur
+# des shingles de mots, estimé par MinHash + LSH) ; chaque groupe est scoré une
+# fois et son score recopié sur tous ses membres.
+#
+# Comptage (DEDUP_MENTIONS) : une histoire reprise n'entre qu'une fois par jour
+# dans la moyenne ; mention_count compte toutes les copies ('copies', défaut)
+# ou une seule par histoire ('unique').
+
+ENABLED = os.getenv("DEDUP", "1") != "0"
+THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.7"))
+MENTIONS = os.getenv("DEDUP_MENTIONS", "copies")
+MENTION_POLICIES = ("copies", "unique")
+
+SHINGLE = 2               # mots par shingle
+NUM_PERM, BANDS = 64, 16  # 16 bandes de 4 lignes : candidats dès ~50 % de similarité
+
+# Permutations : hachage multiply-shift, h(x) = ((a·x + b) mod 2^64) >> 32, a impair
+_perm_rng = np.random.default_rng(20240229)
+_A = _perm_rng.integers(0, 2**64 - 1, NUM_PERM, dtype=np.uint64, endpoint=True) | np.uint64(1)
+_B = _perm_rng.integers(0, 2**64 - 1, NUM_PERM, dtype=np.uint64, endpoint=True)
+_WORD = re.compile(r"\w+")
+
+
+def _shingles(text: str) -> np.ndarray:
+    """Hash 32 bits des shingles de SHINGLE mots (texte en minuscules)."""
+    words = _WORD.findall(text.lower())
+    if len(words) <= SHINGLE:
+        grams = [" ".join(words)]
+    else:
+        grams = [" ".join(words[i:i + SHINGLE]) for i in range(len(words) - SHINGLE + 1)]
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in set(grams)),
+                       dtype=np.uint64)
+
+
+def minhash(text: str) -> np.ndarray:
+    """Signature MinHash : minimum de chaque permutation sur les shingles du texte."""
+    hashed = (_A[:, None] * _shingles(text)[None, :] + _B[:, None]) >> np.uint64(32)
+    return hashed.min(axis=1)
+
+
+def group_duplicates(texts: List[str], threshold: float = None) -> np.ndarray:
+    """
+    Groupe de chaque texte : indice de son premier représentant dans texts.
+
+    Les textes identiques après normalisation des espaces sont toujours
+    regroupés ; les autres le sont si leur similarité MinHash atteint
+    threshold (défaut DEDUP_THRESHOLD). Les paires candidates viennent du
+    LSH (signature découpée en BANDS bandes) puis sont vérifiées.
+    """
+    threshold = THRESHOLD if threshold is None else threshold
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        i, j = find(i), find(j)
+        if i != j:
+            parent[max(i, j)] = min(i, j)
+
+    # Doublons exacts
+    first = {}
+    distinct = []
+    for i, text in enumerate(texts):
+        key = normalize_text(text or "")
+        if key in first:
+            union(first[key], i)
+        else:
+            first[key] = i
+            distinct.append(i)
+
+    # Quasi-doublons (textes distincts seulement)
+    if threshold < 1 and len(distinct) > 1:
+        signatures = np.stack([minhash(texts[i] or "") for i in distinct])
+        rows = NUM_PERM // BANDS
+        candidates = set()
+        for band in range(BANDS):
+            buckets = defaultdict(list)
+            for k, key in enumerate(map(bytes, signatures[:, band * rows:(band + 1) * rows])):
+                buckets[key].append(k)
+            for members in buckets.values():
+                candidates.update((a, b) for n, a in enumerate(members) for b in members[n + 1:])
+        # Comparaison aux représentants des groupes (pas de chaînage A~B~C)
+        position = {i: k for k, i in enumerate(distinct)}
+        for a, b in sorted(candidates):
+            ra, rb = find(distinct[a]), find(distinct[b])
+            if ra != rb and np.mean(signatures[position[ra]] == signatures[position[rb]]) >= threshold:
+                union(ra, rb)
+
+    return np.array([find(i) for i in range(len(texts))], dtype=np.int64)
+
+
+def score_groups(texts: List[str], groups: np.ndarray,
+                 score_fn: Callable) -> Tuple[np.ndarray, Dict[int, str]]:
+    """
+    Score chaque groupe une fois, sur le texte de son représentant
+    (score_fn = score_texts), et recopie score et erreur sur ses membres.
+    Même retour que score_texts : (scores, errors) alignés sur texts.
+    """
+    reps, inverse = np.unique(groups, return_inverse=True)
+    rep_scores, rep_errors = score_fn([texts[i] for i in reps])
+    scores = np.asarray(rep_scores, dtype=float)[inverse]
+    errors = {i: rep_errors[k] for i, k in enumerate(inverse) if k in rep_errors}
+    return scores, errors
+
+
+def collapse_duplicates(df: pd.DataFrame, groups: np.ndarray, mentions: str = None) -> pd.DataFrame:
+    """
+    Une ligne par (jour, groupe de doublons) : le premier élément, avec le
+    maximum des upvotes / commentaires des copies (une histoire pèse comme
+    sa copie la plus suivie) et une colonne mentions (nombre de copies, ou 1
+    avec mentions='unique'), comptée par aggregate_daily dans mention_count.
+
+    df : éléments indexés par date, dans l'ordre de groups, ou ItemTable
+         (même résultat, en table).
+    """
+    mentions = mentions or MENTIONS
+    if mentions not in MENTION_POLICIES:
+        raise ValueError(f"Comptage inconnu : {mentions!r} (choix : {', '.join(MENTION_POLICIES)})")
+    if isinstance(df, ItemTable):
+        return _collapse_table(df, np.asarray(groups), mentions)
+
+    # Groupes dans l'ordre de première apparition, comme les lignes de head(1)
+    grouped = df.groupby([pd.DatetimeIndex(df.index).normalize(), groups], sort=False)
+    out = grouped.head(1).copy()
+    for col in ('upvotes', 'num_comments'):
+        if col in df.columns:
+            out[col] = grouped[col].max().to_numpy()
+    out['mentions'] = grouped.size().to_numpy() if mentions == "copies" else 1
+    return out
+
+
+def _collapse_table(table: ItemTable, groups: np.ndarray, mentions: str) -> ItemTable:
+    keys = np.stack([table.days(), groups.astype(np.int64)], axis=1)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    # Groupes dans l'ordre de première apparition
+    order = np.argsort(first, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    inverse = rank[inverse.ravel()]
+
+    out = table.take(first[order])
+    for col in ('upvotes', 'num_comments'):
+        values = getattr(table, col)
+        if values is not None:
+            np.maximum.at(getattr(out, col), inverse, values)
+    out.mentions = (np.bincount(inverse, minlength=len(order)).astype(np.int32) if mentions == "copies"
+                    else np.ones(len(order), dtype=np.int32))
+    out.dup_group = None
+    return out
@@ -0,0 +1,311 @@
+import numpy as np
+import pandas as pd
+from collections import deque
+from typing import Dict, Optional
+
+from data.items import ItemTable, WEIGHTING, post_weights
+from models.signal_generator import signal_codes, SIGNAL_HOLD, decode_signals
+
+# ── Moteur incrémental sentiment → signal ─────────────────────────────────────
+# Même résultat que aggregate_daily (news, Reddit) → aggregate_sentiment →
+# generate_signal recalculés en entier, mais mis à jour jour par jour avec des
+# accumulateurs : sommes journalières, fenêtres glissantes (MA, z-score 30 j),
+# historique de 3 jours pour le momentum. Coût O(1) par jour clos et O(n)
+# pour n nouveaux articles / posts.
+#
+# Le calendrier est celui des jours passés à close_day() / update() (jours de
+# bourse, comme l'index des prix en batch) : les éléments datés d'un autre
+# jour (week-end) sont ignorés, comme au reindex de aggregate_sentiment.
+
+FFILL_LIMIT = 3       # aggregate_sentiment : ffill(limit=3)
+MOMENTUM_LAG = 3      # generate_signal : diff(3)
+ZSCORE_WINDOW, ZSCORE_MIN = 30, 5
+
+
+class _Window:
+    """
+    Moyenne et écart-type glissants (add / remove de Welford, comme
+    pandas.rolling), avec évaluation "si on ajoutait x" sans modifier l'état.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque()
+        self.total = 0.0
+        self.mean = 0.0
+        self.ssq = 0.0
+        self.same_run = 0  # valeurs identiques consécutives en fin de fenêtre
+
+    def _after(self, x: float) -> tuple:
+        """État scalaire (n, total, mean, ssq, same_run) après ajout de x."""
+        same_run = self.same_run + 1 if self.values and x == self.values[-1] else 1
+        n = len(self.values) + 1
+        total = self.total + x
+        delta = x - self.mean
+        mean = self.mean + delta / n
+        ssq = self.ssq + delta * (x - mean)
+        if n > self.size:
+            old = self.values[0]
+            total -= old
+            n -= 1
+            delta = old - mean
+            mean -= delta / n
+            ssq -= delta * (old - mean)
+        return n, total, mean, ssq, min(same_run, n)
+
+    def push(self, x: float):
+        _, self.total, self.mean, self.ssq, self.same_run = self._after(x)
+        self.values.append(x)
+        if len(self.values) > self.size:
+            self.values.popleft()
+
+    def stats_after(self, x: float, min_periods: int) -> tuple:
+        """(moyenne, écart-type ddof=1) de la fenêtre si x y était ajouté ; NaN sous min_periods."""
+        n, total, _, ssq, same_run = self._after(x)
+        if n < min_periods:
+            return np.nan, np.nan
+        if n < 2:
+            return total / n, np.nan
+        std = 0.0 if same_run >= n else float(np.sqrt(max(ssq, 0.0) / (n - 1)))
+        return total / n, std
+
+    def to_dict(self) -> Dict:
+        return {'size': self.size, 'values': list(self.values), 'total': self.total,
+                'mean': self.mean, 'ssq': self.ssq, 'same_run': self.same_run}
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "_Window":
+        w = cls(state['size'])
+        w.values = deque(state['values'])
+        w.total, w.mean, w.ssq = state['total'], state['mean'], state['ssq']
+        w.same_run = state['same_run']
+        return w
+
+
+class _SourceFill:
+    """Dernière valeur observée d'une source et nombre de jours depuis (ffill limité)."""
+
+    def __init__(self):
+        self.score = None
+        self.count = None
+        self.age = 0
+
+    def value(self, observed: Optional[tuple]) -> tuple:
+        """(score, mentions) du jour : observé, sinon report sur FFILL_LIMIT jours, sinon 0."""
+        if observed is not None:
+            return observed
+        if self.score is not None and self.age + 1 <= FFILL_LIMIT:
+            return self.score, self.count
+        return 0.0, 0
+
+    def commit(self, observed: Optional[tuple]):
+        if observed is not None:
+            self.score, self.count = observed
+            self.age = 0
+        else:
+            self.age += 1
+
+
+class IncrementalEngine:
+    """
+    Agrégation et signaux mis à jour au fil de l'eau pour un ticker.
+
+    Usage
+    -----
+    engine = IncrementalEngine(threshold=0.6)
+    row = engine.update(day, news=new_articles, posts=new_posts)  # signal provisoire du jour
+    ...
+    state = engine.to_dict()                        # sérialisable (JSON)
+    engine = IncrementalEngine.from_dict(state)
+
+    update(day, ...) clôt automatiquement le jour précédent dès qu'un jour
+    plus récent est reçu. Les lignes des jours clos sont celles que
+    generate_signal() donnerait sur la série complète (à l'arrondi près).
+
+    Paramètres
+    ----------
+    threshold, ma_window, use_momentum : comme generate_signal()
+    news_weight, reddit_weight          : comme aggregate_sentiment()
+    sources      : sources actives ; en batch, une source entre dans la
+                   moyenne dès que son DataFrame n'est pas vide
+    weighting    : pondération des posts (cf. data.items.WEIGHTINGS)
+    """
+
+    def __init__(self, threshold: float = 0.6, ma_window: int = 7, use_momentum: bool = True,
+                 news_weight: float = 0.6, reddit_weight: float = 0.4,
+                 sources: tuple = ('news', 'reddit'), weighting: str = None):
+        self.threshold = threshold
+        self.ma_window = ma_window
+        self.use_momentum = use_momentum
+        self.weights = {'news': news_weight, 'reddit': reddit_weight}
+        self.sources = tuple(s for s in ('news', 'reddit') if s in sources)
+        self.weighting = weighting or WEIGHTING
+
+        # Accumulateurs des jours non clos : {jour: [Σ poids·score, Σ poids, nombre]}
+        self._pending = {s: {} for s in self.sources}
+        self._fill = {s: _SourceFill() for s in self.sources}
+        self._ma = _Window(ma_window)
+        self._z = _Window(ZSCORE_WINDOW)
+        self._lagged = deque(maxlen=MOMENTUM_LAG)
+        self._prev_raw = SIGNAL_HOLD
+        self.last_day: Optional[pd.Timestamp] = None
+        self.open_day: Optional[pd.Timestamp] = None
+        self.late_items = 0
+
+    # ── Entrées ──────────────────────────────────────────────────────────────
+    def add_news(self, news: pd.DataFrame):
+        """Articles indexés par date, colonne sentiment_score (moyenne simple par jour), ou ItemTable."""
+        if news is not None and not news.empty:
+            self._accumulate('news', news, np.ones(len(news)))
+
+    def add_posts(self, posts: pd.DataFrame):
+        """Posts indexés par date, colonnes sentiment_score, upvotes, num_comments, ou ItemTable."""
+        if posts is not None and not posts.empty:
+            self._accumulate('reddit', posts, post_weights(posts, self.weighting))
+
+    def _accumulate(self, source: str, df: pd.DataFrame, weights: np.ndarray):
+        if source not in self.sources:
+            return
+        if isinstance(df, ItemTable):
+            scores, dates = df.score.astype(float), df.dates
+            mentions = np.ones(len(df)) if df.mentions is None else df.mentions.astype(float)
+        else:
+            scores, dates = df['sentiment_score'].to_numpy(dtype=float), pd.DatetimeIndex(df.index)
+            mentions = (df['mentions'].to_numpy(dtype=float) if 'mentions' in df.columns
+                        else np.ones(len(df)))
+        valid = ~np.isnan(scores)
+        days = dates.normalize()[valid]
+        weights, scores, mentions = weights[valid], scores[valid], mentions[valid]
+
+        if self.last_day is not None:
+            late = days <= self.last_day
+            self.late_items += int(late.sum())
+            days, weights, scores, mentions = days[~late], weights[~late], scores[~late], mentions[~late]
+        if len(days) == 0:
+            return
+
+        # Sommes par jour en NumPy (lots de quelques éléments : pas de groupby)
+        uniq, inv = np.unique(days.to_numpy(), return_inverse=True)
+        ws = np.bincount(inv, weights=weights * scores)
+        w = np.bincount(inv, weights=weights)
+        n = np.bincount(inv, weights=mentions)
+        pending = self._pending[source]
+        for k, day in enumerate(uniq):
+            day = pd.Timestamp(day)
+            acc = pending.setdefault(day, [0.0, 0.0, 0])
+            acc[0] += float(ws[k])
+            acc[1] += float(w[k])
+            acc[2] += int(n[k])
+
+    # ── Jours ────────────────────────────────────────────────────────────────
+    def preview(self, day) -> Dict:
+        """Ligne provisoire du jour avec les éléments reçus jusqu'ici (état inchangé)."""
+        return self._evaluate(pd.Timestamp(day).normalize())[0]
+
+    def close_day(self, day) -> Dict:
+        """Clôt un jour de bourse (postérieur au dernier clos) et retourne sa ligne."""
+        day = pd.Timestamp(day).normalize()
+        if self.last_day is not None and day <= self.last_day:
+            raise ValueError(f"Jour {day.date()} déjà clos (dernier : {self.last_day.date()})")
+        row, observed, score, raw = self._evaluate(day)
+
+        for source in self.sources:
+            self._fill[source].commit(observed[source])
+            # Les jours hors calendrier (week-ends) antérieurs sont abandonnés
+            pending = self._pending[source]
+            for d in [d for d in pending if d <= day]:
+                del pending[d]
+        self._ma.push(score)
+        self._z.push(score)
+        self._lagged.append(score)
+        self._prev_raw = raw
+        self.last_day = day
+        if self.open_day is not None and self.open_day <= day:
+            self.open_day = None
+        return row
+
+    def update(self, day, news: pd.DataFrame = None, posts: pd.DataFrame = None) -> Dict:
+        """
+        Ajoute les nouveaux éléments et retourne la ligne provisoire de `day`.
+        Si un jour plus ancien était ouvert, il est clos d'abord.
+        """
+        day = pd.Timestamp(day).normalize()
+        if self.open_day is not None and day > self.open_day:
+            self.close_day(self.open_day)
+        self.add_news(news)
+        self.add_posts(posts)
+        self.open_day = day
+        return self.preview(day)
+
+    def _evaluate(self, day: pd.Timestamp):
+        observed, weighted, total_weight, mentions = {}, 0.0, 0, 0
+        for source in self.sources:
+            acc = self._pending[source].get(day)
+            observed[source] = (acc[0] / acc[1], acc[2]) if acc else None
+            value, count = self._fill[source].value(observed[source])
+            weighted += value * self.weights[source]
+            total_weight += self.weights[source]
+            mentions += count
+        score = weighted / total_weight if total_weight > 0 else 0.0
+
+        # Fenêtres glissantes évaluées sans modifier l'état
+        ma, _ = self._ma.stats_after(score, 1)
+        momentum = score - self._lagged[0] if len(self._lagged) == MOMENTUM_LAG else np.nan
+        z_mean, z_std = self._z.stats_after(score, ZSCORE_MIN)
+        zscore = (score - z_mean) / (1.0 if z_std == 0 else z_std)
+
+        raw = int(signal_codes(np.array([ma]), np.array([momentum]),
+                               self.threshold, self.use_momentum)[0])
+        # Filtre anti-répétition : comparé au signal brut de la veille
+        code = SIGNAL_HOLD if raw == self._prev_raw and raw != SIGNAL_HOLD else raw
+
+        row = {
+            'date': day,
+            'sentiment_score': score,
+            'sentiment_ma': ma,
+            'sentiment_zscore': zscore,
+            'signal': decode_signals([code])[0],
+            'mention_count': mentions,
+        }
+        return row, observed, score, raw
+
+    # ── Sérialisation ────────────────────────────────────────────────────────
+    def to_dict(self) -> Dict:
+        """État complet en types simples (json.dumps), reprise exacte via from_dict()."""
+        day = lambda d: None if d is None else d.isoformat()
+        return {
+            'params': {
+                'threshold': self.threshold, 'ma_window': self.ma_window,
+                'use_momentum': self.use_momentum,
+                'news_weight': self.weights['news'], 'reddit_weight': self.weights['reddit'],
+                'sources': list(self.sources), 'weighting': self.weighting,
+            },
+            'pending': {s: {d.isoformat(): acc for d, acc in p.items()}
+                        for s, p in self._pending.items()},
+            'fill': {s: [f.score, f.count, f.age] for s, f in self._fill.items()},
+            'ma': self._ma.to_dict(),
+            'z': self._z.to_dict(),
+            'lagged': list(self._lagged),
+            'prev_raw': self._prev_raw,
+            'last_day': day(self.last_day),
+            'open_day': day(self.open_day),
+            'late_items': self.late_items,
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "IncrementalEngine":
+        params = dict(state['params'])
+        params['sources'] = tuple(params['sources'])
+        engine = cls(**params)
+        engine._pending = {s: {pd.Timestamp(d): list(acc) for d, acc in p.items()}
+                           for s, p in state['pending'].items()}
+        for s, (score, count, age) in state['fill'].items():
+            engine._fill[s].score, engine._fill[s].count, engine._fill[s].age = score, count, age
+        engine._ma = _Window.from_dict(state['ma'])
+        engine._z = _Window.from_dict(state['z'])
+        engine._lagged.extend(state['lagged'])
+        engine._prev_raw = state['prev_raw']
+        engine.last_day = state['last_day'] and pd.Timestamp(state['last_day'])
+        engine.open_day = state['open_day'] and pd.Timestamp(state['open_day'])
+        engine.late_items = state['late_items']
+        return engine
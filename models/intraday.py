@@ -0,0 +1,185 @@
+import re
+import numpy as np
+import pandas as pd
+from typing import Tuple, Union
+
+from data.items import ItemTable, WEIGHTING, post_weights
+
+# ── Agrégation intraday par barres ────────────────────────────────────────────
+# Même logique que aggregate_daily → aggregate_sentiment, mais sur des barres
+# intraday (1m, 5m, 1h...) alignées sur l'index des prix, avec l'horodatage
+# complet des articles / posts (ItemTable, secondes UTC).
+#
+# Chaque élément est rangé par searchsorted dans le tableau trié des bornes
+# de barres, puis les sommes par barre sont faites par np.bincount : O(n log m)
+# pour n éléments et m barres, sans groupby ni fonction Python par groupe.
+#
+# Une barre étiquetée t couvre [t, t + interval). Les éléments publiés hors
+# séance (nuit, week-end) comptent dans la barre suivante (carry=True) : ils
+# sont connus à l'ouverture. Avec carry=False ils sont ignorés, comme les
+# articles du week-end au reindex de aggregate_sentiment.
+
+DEFAULT_INTERVAL = "5m"
+FFILL = "1h"          # report du dernier score d'une source sans nouvel élément
+MA_WINDOW = 7         # barres, comme sentiment_ma journalier (7 jours)
+
+_INTERVAL = re.compile(r"^(\d+)\s*([smhd])$")
+_UNIT_SECONDS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86_400}
+
+Interval = Union[str, int, pd.Timedelta]
+
+
+def interval_seconds(interval: Interval) -> int:
+    """'1m', '5m', '1h', '1d', secondes ou Timedelta → secondes."""
+    if isinstance(interval, (int, np.integer)):
+        seconds = int(interval)
+    else:
+        match = _INTERVAL.match(str(interval).strip().lower())
+        if match:
+            seconds = int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+        else:
+            seconds = int(pd.Timedelta(interval).total_seconds())
+    if seconds <= 0:
+        raise ValueError(f"Intervalle invalide : {interval!r}")
+    return seconds
+
+
+def bar_grid(start_date, end_date, interval: Interval = DEFAULT_INTERVAL,
+             session: Tuple[str, str] = ("09:30", "16:00"), tz: str = "America/New_York") -> pd.DatetimeIndex:
+    """
+    Débuts des barres de séance des jours ouvrés de start_date à end_date
+    inclus (heures de session dans le fuseau tz), quand aucun index de prix
+    intraday n'est disponible.
+    """
+    step = interval_seconds(interval)
+    days = pd.bdate_range(pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize())
+    open_, close = (pd.Timedelta(f"{t}:00").total_seconds() for t in session)
+    offsets = np.arange(open_, close, step).astype(np.int64)
+    seconds = days.values.astype('datetime64[s]').astype(np.int64)[:, None] + offsets[None, :]
+    bars = pd.DatetimeIndex(seconds.ravel().astype('datetime64[s]').astype('datetime64[ns]'))
+    return bars.tz_localize(tz) if tz else bars
+
+
+def _epoch(bars: pd.DatetimeIndex) -> np.ndarray:
+    """Secondes UTC des barres (les barres sans fuseau sont supposées en UTC, comme les éléments)."""
+    bars = pd.DatetimeIndex(bars)
+    if bars.tz is not None:
+        bars = bars.tz_convert("UTC").tz_localize(None)
+    return bars.values.astype('datetime64[s]').astype(np.int64)
+
+
+def bucket_index(ts: np.ndarray, bars: pd.DatetimeIndex, interval: Interval = DEFAULT_INTERVAL,
+                 carry: bool = True) -> np.ndarray:
+    """
+    Barre de chaque horodatage ts (secondes UTC), -1 si hors barres : avant
+    la première, après la fin de la dernière, ou hors séance avec carry=False.
+    bars : débuts de barres triés.
+    """
+    starts = _epoch(bars)
+    if len(starts) > 1 and (np.diff(starts) <= 0).any():
+        raise ValueError("Les barres doivent être triées et distinctes")
+    ends = starts + interval_seconds(interval)
+    if len(starts) > 1 and (ends[:-1] > starts[1:]).any():
+        raise ValueError("Barres plus rapprochées que l'intervalle")
+    ts = np.asarray(ts, dtype=np.int64)
+    if carry:
+        # Première barre qui se termine après ts (la barre en cours, ou la suivante hors séance)
+        idx = np.searchsorted(ends, ts, side='right')
+        outside = (idx >= len(starts)) | (ts < starts[0] if len(starts) else True)
+    else:
+        idx = np.searchsorted(starts, ts, side='right') - 1
+        outside = (idx < 0) | (ts >= ends[np.clip(idx, 0, None)] if len(starts) else True)
+    return np.where(outside, -1, idx)
+
+
+def bucket_sums(items: ItemTable, bars: pd.DatetimeIndex, interval: Interval = DEFAULT_INTERVAL,
+                weights: np.ndarray = None, carry: bool = True) -> pd.DataFrame:
+    """
+    Sommes par barre : Σ poids × score, Σ poids, mentions (colonnes
+    weighted, weight, mention_count), indexées par bars. Poids 1 par défaut.
+    """
+    n = len(bars)
+    idx = bucket_index(items.ts, bars, interval, carry)
+    keep = (idx >= 0) & ~np.isnan(items.score)
+    idx = idx[keep]
+    scores = items.score[keep].astype(float)
+    weights = np.ones(len(idx)) if weights is None else np.asarray(weights, dtype=float)[keep]
+    mentions = np.ones(len(idx)) if items.mentions is None else items.mentions[keep]
+    return pd.DataFrame({
+        'weighted': np.bincount(idx, weights=weights * scores, minlength=n),
+        'weight': np.bincount(idx, weights=weights, minlength=n),
+        'mention_count': np.bincount(idx, weights=mentions, minlength=n).astype(np.int64),
+    }, index=bars)
+
+
+def aggregate_intraday(
+    news: ItemTable,
+    posts: ItemTable,
+    bars: pd.DatetimeIndex,
+    interval: Interval = DEFAULT_INTERVAL,
+    news_weight: float = 0.6,
+    reddit_weight: float = 0.4,
+    ffill: Interval = FFILL,
+    ma_window: int = MA_WINDOW,
+    weighting: str = None,
+    carry: bool = True
+) -> pd.DataFrame:
+    """
+    Fusionne le sentiment news et Reddit en un score par barre intraday.
+
+    Paramètres
+    ----------
+    news, posts   : articles / posts d'un ticker (ItemTable, cf. get_news_items /
+                    get_reddit_items ; ou DataFrame d'éléments), None si absents
+    bars          : index des barres de prix (débuts de barres, avec ou sans
+                    fuseau ; sans fuseau = UTC), cf. bar_grid
+    interval      : durée d'une barre ('1m', '5m', '1h'...)
+    news_weight, reddit_weight : poids des sources, comme aggregate_sentiment
+    ffill         : durée de report d'un score sans nouvel élément, comptée
+                    en barres (le temps hors séance ne compte pas)
+    ma_window     : fenêtre de sentiment_ma, en barres
+    weighting     : pondération des posts (cf. data.items.WEIGHTINGS)
+    carry         : éléments hors séance comptés dans la barre suivante
+
+    Retourne
+    --------
+    DataFrame indexé par bars, mêmes colonnes que aggregate_sentiment :
+      sentiment_score, sentiment_ma, mention_count, source
+    generate_signal() s'y applique tel quel (fenêtres en barres).
+    """
+    step = interval_seconds(interval)
+    limit = max(interval_seconds(ffill) // step, 0) if ffill else 0
+
+    merged = pd.DataFrame(index=bars)
+    weighted_scores = np.zeros(len(bars))
+    total_weight = 0
+    present = []
+
+    for name, items, weight in (('news', news, news_weight), ('reddit', posts, reddit_weight)):
+        if isinstance(items, pd.DataFrame):
+            items = ItemTable.from_frame(items) if not items.empty else None
+        if items is None or items.empty:
+            continue
+        item_weights = post_weights(items, weighting or WEIGHTING) if name == 'reddit' else None
+        sums = bucket_sums(items, bars, step, item_weights, carry)
+        # Barres sans élément : NaN, puis report comme au reindex journalier
+        observed = pd.DataFrame({'score': np.nan, 'count': np.nan}, index=bars)
+        has = sums['weight'].to_numpy() > 0
+        observed.loc[has, 'score'] = (sums['weighted'] / sums['weight']).to_numpy()[has]
+        observed.loc[has, 'count'] = sums['mention_count'].to_numpy()[has]
+        # Report sur `limit` barres au plus, puis 0 (comme ffill(limit=3).fillna(0))
+        reindexed = (observed.ffill(limit=limit) if limit else observed).fillna(0)
+        merged[f"{name}_score"] = reindexed['score'].to_numpy()
+        merged[f"{name}_count"] = reindexed['count'].to_numpy()
+        weighted_scores += reindexed['score'].to_numpy() * weight
+        total_weight += weight
+        present.append(name)
+
+    merged['sentiment_score'] = weighted_scores / total_weight if total_weight > 0 else 0.0
+    merged['sentiment_ma'] = merged['sentiment_score'].rolling(ma_window, min_periods=1).mean()
+
+    count_cols = [f"{name}_count" for name in present]
+    merged['mention_count'] = merged[count_cols].sum(axis=1) if count_cols else 0
+    merged['source'] = 'news+reddit' if len(present) == 2 else (present[0] if present else 'reddit')
+
+    return merged[['sentiment_score', 'sentiment_ma', 'mention_count', 'source']]
@@ -0,0 +1,129 @@
+import pandas as pd
+import numpy as np
+from typing import Tuple, Dict
+
+from models.signal_generator import encode_signals, SIGNAL_HOLD
+from models.backtest import _positions_from_signals
+
+
+def run_portfolio_backtest(
+    signals: pd.DataFrame,
+    closes: pd.DataFrame,
+    weighting: str = 'equal',
+    scores: pd.DataFrame = None,
+    transaction_cost: float = 0.001,
+    initial_capital: float = 10_000.0
+) -> Tuple[pd.DataFrame, pd.DataFrame, Dict]:
+    """
+    Backtest multi-tickers long-only sur des matrices date × ticker.
+
+    Même logique que run_backtest() appliquée à chaque titre (entrée sur BUY,
+    sortie sur SELL, position du jour J appliquée au rendement J+1), puis
+    allocation du capital entre les titres en position. Tout est calculé en
+    opérations matricielles : pas de boucle sur les dates ni sur les titres.
+
+    Paramètres
+    ----------
+    signals          : date × ticker, libellés 'BUY'/'SELL'/'HOLD' ou codes int8
+    closes           : date × ticker, prix de clôture
+    weighting        : 'equal'  → poids égaux entre titres en position
+                       'score'  → poids ∝ score de sentiment positif de la veille
+                                  (repli sur 'equal' si aucun score positif)
+    scores           : date × ticker, requis si weighting='score'
+    transaction_cost : coût par transaction (proportion du montant échangé, par sens)
+    initial_capital  : capital initial en $
+
+    Retourne
+    --------
+    (portfolio_df, attribution_df, perf_dict)
+    portfolio_df   : mêmes colonnes que run_backtest() (utilisable par compute_metrics)
+    attribution_df : par ticker — contribution, costs, net, avg_weight, days_held, nb_trades
+    perf_dict      : total_return_strategy, total_return_bh, nb_trades, avg_names_held
+    """
+    if weighting not in ('equal', 'score'):
+        raise ValueError(f"weighting inconnu : {weighting!r} ('equal' ou 'score')")
+    if weighting == 'score' and scores is None:
+        raise ValueError("weighting='score' nécessite la matrice scores")
+
+    # Alignement sur les dates et tickers communs
+    dates = signals.index.intersection(closes.index)
+    tickers = signals.columns.intersection(closes.columns)
+    sig = signals.loc[dates, tickers].to_numpy()
+    if np.issubdtype(sig.dtype, np.number):
+        # Codes numériques (float64 si un reindex a introduit des NaN) : NaN = HOLD
+        codes = np.nan_to_num(sig.astype(float), nan=SIGNAL_HOLD).astype(np.int8)
+    else:
+        codes = encode_signals(sig)
+    close = closes.loc[dates, tickers].to_numpy(dtype=float)
+    n, k = close.shape
+
+    # Rendements journaliers (NaN si prix manquant, traité comme rendement nul)
+    raw_ret = np.full((n, k), np.nan)
+    raw_ret[1:] = close[1:] / close[:-1] - 1
+    ret = np.nan_to_num(raw_ret, nan=0.0, posinf=0.0, neginf=0.0)
+
+    # Positions par titre, décalées d'un jour
+    position = _positions_from_signals(codes)
+    held = np.zeros((n, k))
+    held[1:] = position[:-1]
+
+    # Allocation
+    if weighting == 'score':
+        sc = scores.reindex(index=dates, columns=tickers).to_numpy(dtype=float)
+        sc_prev = np.zeros((n, k))
+        sc_prev[1:] = np.nan_to_num(sc[:-1])
+        raw = held * np.clip(sc_prev, 0, None)
+        no_score = raw.sum(axis=1) == 0
+        raw[no_score] = held[no_score]
+    else:
+        raw = held
+    total = raw.sum(axis=1, keepdims=True)
+    weights = np.divide(raw, total, out=np.zeros((n, k)), where=total > 0)
+
+    # Rendement net des coûts (1re ligne NaN, comme le diff() de run_backtest)
+    contrib = weights * ret
+    costs = np.full((n, k), np.nan)
+    costs[1:] = np.abs(np.diff(weights, axis=0)) * transaction_cost
+    strategy_ret = pd.Series(contrib.sum(axis=1) - costs.sum(axis=1), index=dates)
+
+    # Buy & Hold : univers équipondéré, sur les titres cotés ce jour-là
+    valid = ~np.isnan(raw_ret)
+    n_valid = valid.sum(axis=1)
+    bh = np.divide(np.where(valid, raw_ret, 0.0).sum(axis=1), n_valid,
+                   out=np.zeros(n), where=n_valid > 0)
+    daily_ret_bh = pd.Series(bh, index=dates)
+
+    cumret_strategy = (1 + strategy_ret).cumprod() - 1
+    cumret_bh = (1 + daily_ret_bh).cumprod() - 1
+
+    name_trades = np.abs(np.diff(held, axis=0)).sum(axis=0)
+    names_held = held.sum(axis=1)
+
+    portfolio_df = pd.DataFrame({
+        'position': (names_held > 0).astype(float),
+        'daily_ret_bh': daily_ret_bh,
+        'daily_ret_strategy': strategy_ret,
+        'cumret_strategy': cumret_strategy,
+        'cumret_bh': cumret_bh,
+        'portfolio_value': initial_capital * (1 + cumret_strategy),
+        'names_held': names_held
+    }, index=dates)
+
+    name_costs = np.nansum(costs, axis=0)
+    attribution_df = pd.DataFrame({
+        'contribution': contrib.sum(axis=0),
+        'costs': name_costs,
+        'net': contrib.sum(axis=0) - name_costs,
+        'avg_weight': weights.mean(axis=0),
+        'days_held': held.sum(axis=0).astype(int),
+        'nb_trades': name_trades.astype(int)
+    }, index=tickers)
+
+    perf = {
+        'total_return_strategy': float(cumret_strategy.iloc[-1]),
+        'total_return_bh': float(cumret_bh.iloc[-1]),
+        'nb_trades': int(name_trades.sum()),
+        'avg_names_held': float(names_held.mean()),
+    }
+
+    return portfolio_df, attribution_df, perf
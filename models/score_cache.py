@@ -0,0 +1,153 @@
+import os
+import sqlite3
+import hashlib
+import threading
+import time
+from typing import Dict, List, Optional
+
+# ── Cache persistant des scores de sentiment ──────────────────────────────────
+# Un texte donné a toujours le même score pour un modèle donné : on stocke
+# les scores dans SQLite, indexés par hash(modèle + texte normalisé).
+
+CACHE_PATH = os.path.expanduser(os.getenv(
+    "SENTIMENT_CACHE_PATH", os.path.join("~", ".cache", "sentiment_trader", "scores.sqlite")
+))
+MAX_ENTRIES = int(os.getenv("SENTIMENT_CACHE_MAX_ENTRIES", "500000"))
+ENABLED = os.getenv("SENTIMENT_CACHE", "1") != "0"
+
+# Nombre max de paramètres par requête SQLite (limite historique : 999)
+_SQL_CHUNK = 900
+
+
+def normalize_text(text: str) -> str:
+    """Normalise les espaces (sans effet sur la tokenisation BERT)."""
+    return " ".join(text.split())
+
+
+def text_key(text: str, model_id: str) -> bytes:
+    """Clé de cache : SHA-256 de l'identifiant modèle et du texte normalisé."""
+    return hashlib.sha256(f"{model_id}\x00{normalize_text(text)}".encode("utf-8")).digest()
+
+
+class ScoreCache:
+    """
+    Cache clé → score sur disque, avec éviction LRU par nombre d'entrées.
+
+    Les compteurs hits / misses couvrent la durée de vie du process.
+    Toute erreur SQLite est loggée et traitée comme un miss : le cache ne
+    doit jamais empêcher le scoring.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, max_entries: int = MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._size = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                " key BLOB PRIMARY KEY, score REAL NOT NULL, last_used INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON scores(last_used)")
+            self._size = conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, float]:
+        """Retourne {clé: score} pour les clés présentes ; met à jour leur date d'usage."""
+        found = {}
+        with self._lock:
+            try:
+                conn = self._connect()
+                for start in range(0, len(keys), _SQL_CHUNK):
+                    chunk = keys[start:start + _SQL_CHUNK]
+                    rows = conn.execute(
+                        f"SELECT key, score FROM scores WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ).fetchall()
+                    found.update(rows)
+                if found:
+                    now = int(time.time())
+                    conn.executemany("UPDATE scores SET last_used = ? WHERE key = ?",
+                                     [(now, k) for k in found])
+                    conn.commit()
+            except sqlite3.Error as e:
+                print(f"Score cache error: {e}")
+                found = {}
+
+            n_hits = sum(1 for k in keys if k in found)
+            self.hits += n_hits
+            self.misses += len(keys) - n_hits
+        return found
+
+    def put_many(self, items: Dict[bytes, float]):
+        if not items:
+            return
+        with self._lock:
+            try:
+                conn = self._connect()
+                now = int(time.time())
+                cur = conn.executemany(
+                    "INSERT OR IGNORE INTO scores (key, score, last_used) VALUES (?, ?, ?)",
+                    [(k, float(v), now) for k, v in items.items()]
+                )
+                self._size += max(cur.rowcount, 0)
+                if self._size > self.max_entries:
+                    self._evict(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Score cache error: {e}")
+
+    def _evict(self, conn: sqlite3.Connection):
+        # On redescend à 90% de la capacité pour ne pas évincer à chaque écriture
+        n_drop = self._size - int(self.max_entries * 0.9)
+        conn.execute(
+            "DELETE FROM scores WHERE key IN "
+            "(SELECT key FROM scores ORDER BY last_used ASC LIMIT ?)",
+            (n_drop,)
+        )
+        self.evictions += n_drop
+        self._size -= n_drop
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM scores")
+            conn.commit()
+            self._size = 0
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': self._size,
+            'evictions': self.evictions,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[ScoreCache]:
+    """Cache partagé du process, ou None si désactivé (SENTIMENT_CACHE=0)."""
+    global _cache
+    if not ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ScoreCache()
+    return _cache
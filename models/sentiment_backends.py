@@ -0,0 +1,270 @@
+import os
+import re
+import inspect
+import time
+import numpy as np
+from typing import Dict, List
+
+# ── Backends d'inférence CPU pour FinBERT ─────────────────────────────────────
+# Trois implémentations interchangeables, sélectionnées par SENTIMENT_BACKEND :
+#   torch       : modèle PyTorch fp32 (référence)
+#   torch-int8  : même modèle, couches Linear quantifiées dynamiquement en int8
+#   onnx        : graphe exporté une fois en ONNX puis exécuté par onnxruntime
+#
+# Chaque backend s'appelle comme le pipeline HuggingFace "text-classification"
+# (top_k=None) : backend(textes) -> [[{'label': ..., 'score': ...}, ...], ...]
+#
+# Batching : les textes sont tokenisés une fois (troncature à la vraie limite
+# en tokens du modèle), triés par longueur puis regroupés en batchs dont le
+# volume paddé (nb de textes × plus longue séquence) tient dans un budget de
+# tokens : les titres ne sont plus paddés à la longueur des posts Reddit.
+
+BACKENDS = ("torch", "torch-int8", "onnx")
+BACKEND = os.getenv("SENTIMENT_BACKEND", "torch")
+ONNX_DIR = os.path.expanduser(os.getenv(
+    "SENTIMENT_ONNX_DIR", os.path.join("~", ".cache", "sentiment_trader", "onnx")
+))
+MAX_LENGTH = 512
+TOKEN_BUDGET = int(os.getenv("SENTIMENT_TOKEN_BUDGET", "8192"))
+# Tranches de longueur (tokens) : un batch ne mélange pas deux tranches
+LENGTH_BUCKETS = (32, 64, 128, 256)
+
+# Corpus fixe pour le contrôle de dérive des backends approchés
+PARITY_CORPUS = [
+    "Apple shares surge after record quarterly earnings beat analyst estimates.",
+    "Tesla stock plunges as deliveries miss expectations and margins shrink.",
+    "Microsoft announces a quarterly dividend in line with last year.",
+    "Nvidia raises full-year guidance on strong data center demand.",
+    "Amazon faces antitrust lawsuit that could weigh on its retail business.",
+    "JPMorgan reports stable net interest income, shares little changed.",
+    "Meta cuts 10,000 jobs to reduce costs amid slowing ad revenue.",
+    "AMD gains market share in server CPUs, analysts upgrade to buy.",
+    "Netflix subscriber growth stalls, stock falls in after-hours trading.",
+    "Alphabet to hold its annual shareholder meeting on June 2.",
+    "Fed signals rates will stay higher for longer, equities slide.",
+    "Company completes merger ahead of schedule and reaffirms outlook.",
+]
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    z = logits - logits.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+def plan_batches(lengths, token_budget: int = None, max_batch: int = None) -> List[np.ndarray]:
+    """
+    Découpe des textes en batchs de longueurs voisines.
+
+    Les indices sont triés par longueur (en tokens) et répartis par tranches
+    de LENGTH_BUCKETS ; dans une tranche, un batch est fermé dès que le texte
+    suivant ferait dépasser token_budget au volume paddé (nb de textes × plus
+    longue séquence) ou max_batch textes. Un texte plus long que le budget
+    forme son propre batch.
+
+    Retourne la liste des indices (dans lengths) de chaque batch.
+    """
+    token_budget = token_budget or TOKEN_BUDGET
+    lengths = np.asarray(lengths, dtype=np.int64)
+    order = np.argsort(lengths, kind="stable")
+    bucket = np.searchsorted(LENGTH_BUCKETS, lengths[order])
+    batches, start = [], 0
+    for end in range(1, len(order) + 1):
+        size = end - start
+        if end == len(order) or bucket[end] != bucket[start] \
+                or (size + 1) * lengths[order[end]] > token_budget \
+                or (max_batch and size >= max_batch):
+            batches.append(order[start:end])
+            start = end
+    return batches
+
+
+class _Backend:
+    """Base commune : tokenisation, batching par longueur, sorties façon pipeline."""
+
+    name = None
+
+    def __init__(self, model_name: str, revision: str):
+        from transformers import AutoTokenizer
+        self.model_name = model_name
+        self.revision = revision
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, revision=revision)
+        # model_max_length vaut une valeur sentinelle énorme si non renseignée
+        self.max_length = min(MAX_LENGTH, self.tokenizer.model_max_length)
+        self.labels = []
+
+    def logits(self, encoded: Dict[str, np.ndarray]) -> np.ndarray:
+        raise NotImplementedError
+
+    def encode(self, texts: List[str]) -> Dict[str, list]:
+        """Tokenise sans padding, tronqué à max_length tokens (une fois par texte)."""
+        return dict(self.tokenizer(list(texts), truncation=True, max_length=self.max_length))
+
+    def predict(self, encoded: Dict[str, list], idx) -> List[List[Dict]]:
+        """Sorties des textes idx de encoded, paddés ensemble en un seul batch."""
+        batch = self.tokenizer.pad({k: [v[i] for i in idx] for k, v in encoded.items()},
+                                   return_tensors="np")
+        probs = _softmax(self.logits(dict(batch)))
+        return [
+            [{'label': label, 'score': float(p)} for label, p in zip(self.labels, row)]
+            for row in probs
+        ]
+
+    def __call__(self, texts: List[str], batch_size: int = None,
+                 token_budget: int = None) -> List[List[Dict]]:
+        encoded = self.encode(texts)
+        lengths = [len(ids) for ids in encoded['input_ids']]
+        results = [None] * len(lengths)
+        for idx in plan_batches(lengths, token_budget, batch_size):
+            for i, result in zip(idx, self.predict(encoded, idx)):
+                results[i] = result
+        return results
+
+
+class TorchBackend(_Backend):
+    """PyTorch fp32, ou int8 dynamique si quantize=True."""
+
+    def __init__(self, model_name: str, revision: str, quantize: bool = False):
+        super().__init__(model_name, revision)
+        import torch
+        from transformers import AutoModelForSequenceClassification
+
+        self._torch = torch
+        model = AutoModelForSequenceClassification.from_pretrained(model_name, revision=revision)
+        model.eval()
+        if quantize:
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        self.model = model
+        self.name = "torch-int8" if quantize else "torch"
+        self.labels = [model.config.id2label[i] for i in range(model.config.num_labels)]
+
+    def logits(self, encoded: Dict[str, np.ndarray]) -> np.ndarray:
+        torch = self._torch
+        inputs = {k: torch.from_numpy(np.asarray(v, dtype=np.int64)) for k, v in encoded.items()}
+        with torch.inference_mode():
+            return self.model(**inputs).logits.float().numpy()
+
+
+class OnnxBackend(_Backend):
+    """
+    Graphe ONNX exécuté par onnxruntime (CPU).
+    L'export depuis PyTorch n'a lieu qu'une fois par (modèle, révision) ;
+    les lancements suivants ne chargent ni torch ni les poids fp32.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_name: str, revision: str):
+        super().__init__(model_name, revision)
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("Backend 'onnx' : pip install onnxruntime onnx") from e
+
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{model_name}@{revision}")
+        path = os.path.join(ONNX_DIR, f"{slug}.onnx")
+        if not os.path.exists(path):
+            self._export(path)
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(path, opts, providers=["CPUExecutionProvider"])
+        self._input_names = [i.name for i in self.session.get_inputs()]
+
+        from transformers import AutoConfig
+        config = AutoConfig.from_pretrained(model_name, revision=revision)
+        self.labels = [config.id2label[i] for i in range(config.num_labels)]
+
+    def _export(self, path: str):
+        import torch
+        from transformers import AutoModelForSequenceClassification
+
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_name,
+                                                                   revision=self.revision)
+        model.eval()
+        sample = self.tokenizer(["export sample"], return_tensors="pt")
+        # Les entrées du graphe suivent l'ordre de la signature de forward()
+        params = inspect.signature(model.forward).parameters
+        names = [n for n in params if n in sample]
+        axes = {n: {0: "batch", 1: "sequence"} for n in names}
+        axes["logits"] = {0: "batch"}
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        # Exporteur TorchScript : dynamo=False seulement si torch le connaît (torch >= 2.5)
+        options = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+        torch.onnx.export(
+            model, ({n: sample[n] for n in names},), tmp,
+            input_names=names, output_names=["logits"],
+            dynamic_axes=axes, opset_version=17, **options
+        )
+        os.replace(tmp, path)  # évite un fichier partiel si l'export échoue
+
+    def logits(self, encoded: Dict[str, np.ndarray]) -> np.ndarray:
+        feed = {n: np.asarray(encoded[n], dtype=np.int64) for n in self._input_names}
+        return self.session.run(["logits"], feed)[0]
+
+
+def load_backend(name: str, model_name: str, revision: str) -> _Backend:
+    if name == "torch":
+        return TorchBackend(model_name, revision)
+    if name == "torch-int8":
+        return TorchBackend(model_name, revision, quantize=True)
+    if name == "onnx":
+        return OnnxBackend(model_name, revision)
+    raise ValueError(f"SENTIMENT_BACKEND inconnu : {name!r} (choix : {', '.join(BACKENDS)})")
+
+
+def _scores(backend: _Backend, texts: List[str]) -> np.ndarray:
+    out = []
+    for result in backend(texts):
+        probs = {r['label']: r['score'] for r in result}
+        out.append(probs.get('positive', 0) - probs.get('negative', 0))
+    return np.array(out)
+
+
+def check_parity(name: str, model_name: str, revision: str,
+                 corpus: List[str] = None, tolerance: float = 0.05) -> Dict:
+    """
+    Compare les scores d'un backend à ceux du modèle fp32 sur un corpus fixe.
+
+    Retourne
+    --------
+    dict avec max_abs_drift, mean_abs_drift, ok (max_abs_drift <= tolerance)
+    et le débit (textes/s) des deux backends.
+    """
+    corpus = corpus or PARITY_CORPUS
+    reference = TorchBackend(model_name, revision)
+    candidate = load_backend(name, model_name, revision)
+
+    t0 = time.perf_counter()
+    ref_scores = _scores(reference, corpus)
+    t1 = time.perf_counter()
+    cand_scores = _scores(candidate, corpus)
+    t2 = time.perf_counter()
+
+    drift = np.abs(cand_scores - ref_scores)
+    return {
+        'backend': name,
+        'max_abs_drift': float(drift.max()),
+        'mean_abs_drift': float(drift.mean()),
+        'tolerance': tolerance,
+        'ok': bool(drift.max() <= tolerance),
+        'texts_per_sec_fp32': len(corpus) / max(t1 - t0, 1e-9),
+        'texts_per_sec': len(corpus) / max(t2 - t1, 1e-9),
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    from models.sentiment_model import MODEL_NAME, MODEL_REVISION
+
+    names = sys.argv[1:] or ["torch-int8", "onnx"]
+    failed = False
+    for backend_name in names:
+        report = check_parity(backend_name, MODEL_NAME, MODEL_REVISION)
+        print(report)
+        failed |= not report['ok']
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,180 @@
+import os
+import threading
+import numpy as np
+from typing import Tuple, Dict
+
+from models.score_cache import get_cache, text_key
+from models.sentiment_backends import BACKEND, load_backend, plan_batches
+from models import sentiment_pool
+from utils.perf import stage
+
+# ── Service FinBERT partagé ───────────────────────────────────────────────────
+# Un seul modèle par process, chargé au premier score demandé. Les imports
+# transformers / torch sont différés pour que `import app` reste rapide.
+
+MODEL_NAME = os.getenv("FINBERT_MODEL", "ProsusAI/finbert")
+MODEL_REVISION = os.getenv("FINBERT_REVISION", "main")
+# Nombre max de textes par batch ; le volume paddé est borné par SENTIMENT_TOKEN_BUDGET
+BATCH_SIZE = int(os.getenv("FINBERT_BATCH_SIZE", "64"))
+
+_finbert = None
+_load_lock = threading.Lock()
+# Les tokenizers "fast" ne supportent pas les appels concurrents
+_infer_lock = threading.Lock()
+
+
+def get_finbert():
+    """
+    Retourne le modèle FinBERT du process (chargé une seule fois, thread-safe),
+    avec le backend d'inférence choisi par SENTIMENT_BACKEND.
+    """
+    global _finbert
+    if _finbert is None:
+        with _load_lock:
+            if _finbert is None:
+                with stage("finbert.load", backend=BACKEND):
+                    _finbert = load_backend(BACKEND, MODEL_NAME, MODEL_REVISION)
+    return _finbert
+
+
+def is_loaded() -> bool:
+    return _finbert is not None
+
+
+def model_id() -> str:
+    """
+    Identifiant du modèle utilisé comme préfixe des clés de cache.
+    Inclut le backend : int8 / ONNX ne donnent pas exactement les scores fp32.
+    """
+    return f"{MODEL_NAME}@{MODEL_REVISION}:{BACKEND}"
+
+
+def _label_score(result) -> float:
+    """Convertit la sortie FinBERT (liste label/score) en P(positive) - P(negative)."""
+    scores = {r['label']: r['score'] for r in result}
+    return round(float(scores.get('positive', 0) - scores.get('negative', 0)), 4)
+
+
+def score_texts(texts: list, batch_size: int = None, use_cache: bool = True,
+                workers: int = None) -> Tuple[np.ndarray, Dict[int, str]]:
+    """
+    Score une liste de textes par batchs FinBERT.
+
+    Les textes sont tokenisés une fois, tronqués à la limite du modèle (512
+    tokens), puis regroupés en batchs de longueurs voisines sous un budget
+    de tokens (cf. sentiment_backends.plan_batches) ; les scores sont rendus
+    dans l'ordre de texts.
+
+    Les textes vides ou trop courts (< 10 caractères) valent 0.0 sans passer
+    par le modèle. Les scores déjà connus sont lus en bloc dans le cache
+    persistant ; seuls les textes manquants sont envoyés au modèle. Si un
+    batch échoue, ses textes sont re-scorés un par un pour isoler ceux qui
+    posent problème (les erreurs ne sont pas mises en cache).
+
+    Avec workers > 1 (défaut SENTIMENT_WORKERS), les textes manquants sont
+    répartis sur un pool de process (cf. models.sentiment_pool) dès qu'ils
+    dépassent une tranche.
+
+    Retourne
+    --------
+    (scores, errors)
+    scores : np.ndarray aligné sur texts (NaN pour les textes en erreur)
+    errors : dict {index du texte: message d'erreur}
+    """
+    with stage("finbert.score", texts=len(texts)) as record:
+        scores, errors = _score_all(texts, batch_size, use_cache, workers, record)
+        record['errors'] = len(errors)
+    return scores, errors
+
+
+def _score_all(texts: list, batch_size: int, use_cache: bool, workers: int,
+               record: dict) -> Tuple[np.ndarray, Dict[int, str]]:
+    batch_size = batch_size or BATCH_SIZE
+    scores = np.zeros(len(texts), dtype=float)
+    errors = {}
+
+    todo = [i for i, t in enumerate(texts) if t and len(t.strip()) >= 10]
+
+    cache = get_cache() if use_cache else None
+    keys = {}
+    if cache is not None and todo:
+        mid = model_id()
+        keys = {i: text_key(texts[i], mid) for i in todo}
+        cached = cache.get_many(list(set(keys.values())))
+        for i in todo:
+            if keys[i] in cached:
+                scores[i] = cached[keys[i]]
+        todo = [i for i in todo if keys[i] not in cached]
+        record['cache_hits'] = len(keys) - len(todo)
+        record['cache_hit_rate'] = round(record['cache_hits'] / len(keys), 4)
+    record['model_texts'] = len(todo)
+
+    if not todo:
+        return scores, errors
+
+    workers = workers or sentiment_pool.WORKERS
+    if workers > 1 and len(todo) > sentiment_pool.CHUNK_SIZE:
+        record['workers'] = workers
+        try:
+            sub_scores, sub_errors, _ = sentiment_pool.score_texts_parallel(
+                [texts[i] for i in todo], workers=workers, batch_size=batch_size
+            )
+        except Exception as e:
+            # Pool cassé (worker tué, spawn impossible...) : scoring dans ce
+            # process plutôt qu'une exception qui ferait basculer le fetcher
+            # sur des données simulées
+            print(f"Pool de scoring indisponible ({type(e).__name__}: {e}) — scoring local")
+            record['pool_error'] = f"{type(e).__name__}: {e}"
+        else:
+            scores[todo] = sub_scores
+            errors.update({todo[j]: msg for j, msg in sub_errors.items()})
+            if cache is not None:
+                cache.put_many({keys[i]: scores[i] for i in todo if i not in errors})
+            return scores, errors
+
+    try:
+        finbert = get_finbert()
+    except Exception as e:
+        scores[todo] = np.nan
+        errors.update({i: f"chargement FinBERT : {e}" for i in todo})
+        return scores, errors
+
+    # Tokenisation unique (troncature en tokens), puis batchs de longueurs voisines
+    with _infer_lock:
+        encoded = finbert.encode([texts[i] for i in todo])
+    lengths = [len(ids) for ids in encoded['input_ids']]
+    batches = plan_batches(lengths, max_batch=batch_size)
+    record['batches'] = len(batches)
+    record['tokens'] = int(sum(lengths))
+    record['padded_tokens'] = int(sum(len(b) * lengths[b[-1]] for b in batches))
+
+    for batch in batches:
+        idx = [todo[j] for j in batch]
+        with _infer_lock:
+            try:
+                results = finbert.predict(encoded, batch)
+            except Exception:
+                results = []
+                for i in idx:
+                    try:
+                        results.append(finbert([texts[i]])[0])
+                    except Exception as e:
+                        results.append(None)
+                        errors[i] = str(e)
+
+        for i, result in zip(idx, results):
+            scores[i] = np.nan if result is None else _label_score(result)
+
+    if cache is not None:
+        cache.put_many({keys[i]: scores[i] for i in todo if i not in errors})
+
+    return scores, errors
+
+
+def score_text(text: str) -> float:
+    """
+    Retourne un score entre -1 (très bearish) et +1 (très bullish).
+    FinBERT classe en : positive / negative / neutral.
+    """
+    scores, errors = score_texts([text])
+    return 0.0 if errors else float(scores[0])
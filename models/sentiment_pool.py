@@ -0,0 +1,169 @@
+import os
+import time
+import atexit
+import threading
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Tuple, Dict, List
+
+# ── Scoring multi-process pour les gros backfills ─────────────────────────────
+# Chaque worker charge le modèle une seule fois (initializer) puis score des
+# tranches de textes ; les résultats sont replacés dans l'ordre d'entrée.
+# Le cache persistant reste géré par le process parent (pas d'écritures
+# SQLite concurrentes).
+
+WORKERS = int(os.getenv("SENTIMENT_WORKERS", "1"))
+# Threads torch par worker (0 = cœurs disponibles / nombre de workers)
+TORCH_THREADS = int(os.getenv("SENTIMENT_TORCH_THREADS", "0"))
+CHUNK_SIZE = int(os.getenv("SENTIMENT_CHUNK_SIZE", "256"))
+
+_pool = None
+_pool_config = None
+_pool_lock = threading.Lock()
+_last_stats = {}
+
+
+def _default_threads(workers: int) -> int:
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def _init_worker(torch_threads: int):
+    # Fixé avant le chargement de torch pour ne pas sur-souscrire les cœurs
+    os.environ["OMP_NUM_THREADS"] = str(torch_threads)
+    os.environ["MKL_NUM_THREADS"] = str(torch_threads)
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+
+    from models.sentiment_model import get_finbert
+    try:
+        get_finbert()
+    except Exception as e:
+        # L'erreur sera remontée texte par texte par score_texts()
+        print(f"Worker {os.getpid()} : échec du chargement FinBERT : {e}")
+
+
+def _score_chunk(start: int, texts: List[str], batch_size: int):
+    from models.sentiment_model import score_texts
+
+    t0 = time.perf_counter()
+    scores, errors = score_texts(texts, batch_size=batch_size, use_cache=False, workers=1)
+    return start, scores, errors, os.getpid(), time.perf_counter() - t0
+
+
+def _get_pool(workers: int, torch_threads: int) -> ProcessPoolExecutor:
+    """Pool longue durée : recréé uniquement si la configuration change."""
+    global _pool, _pool_config
+    with _pool_lock:
+        if _pool is None or _pool_config != (workers, torch_threads):
+            if _pool is not None:
+                _pool.shutdown(wait=True)
+            # spawn : un fork après l'initialisation de torch peut bloquer
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(torch_threads,)
+            )
+            _pool_config = (workers, torch_threads)
+    return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Oublie un pool cassé (worker mort) : le prochain appel en recrée un."""
+    global _pool, _pool_config
+    with _pool_lock:
+        if _pool is pool:
+            _pool, _pool_config = None, None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pool():
+    global _pool, _pool_config
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+        _pool, _pool_config = None, None
+
+
+atexit.register(shutdown_pool)
+
+
+def score_texts_parallel(
+    texts: list,
+    workers: int = None,
+    torch_threads: int = None,
+    chunk_size: int = None,
+    batch_size: int = None
+) -> Tuple[np.ndarray, Dict[int, str], Dict]:
+    """
+    Score une liste de textes sur un pool de process.
+
+    Paramètres
+    ----------
+    texts         : textes à scorer
+    workers       : nombre de process (défaut SENTIMENT_WORKERS)
+    torch_threads : threads torch par process (défaut cœurs / workers)
+    chunk_size    : nombre de textes par tâche envoyée à un worker
+    batch_size    : taille de batch FinBERT dans chaque worker
+
+    Retourne
+    --------
+    (scores, errors, stats)
+    scores, errors : même contrat que sentiment_model.score_texts()
+    stats          : débit global et par worker (textes/s)
+
+    Lève BrokenProcessPool si un worker meurt (le pool est alors abandonné
+    et recréé à l'appel suivant).
+    """
+    workers = workers or WORKERS
+    torch_threads = torch_threads or TORCH_THREADS or _default_threads(workers)
+    chunk_size = chunk_size or CHUNK_SIZE
+
+    scores = np.zeros(len(texts), dtype=float)
+    errors = {}
+    per_worker = {}
+
+    t0 = time.perf_counter()
+    pool = _get_pool(workers, torch_threads)
+    futures = [
+        pool.submit(_score_chunk, start, texts[start:start + chunk_size], batch_size)
+        for start in range(0, len(texts), chunk_size)
+    ]
+    for future in futures:
+        try:
+            start, chunk_scores, chunk_errors, pid, busy = future.result()
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            raise
+        scores[start:start + len(chunk_scores)] = chunk_scores
+        errors.update({start + i: msg for i, msg in chunk_errors.items()})
+
+        w = per_worker.setdefault(pid, {'texts': 0, 'busy_sec': 0.0})
+        w['texts'] += len(chunk_scores)
+        w['busy_sec'] += busy
+    elapsed = time.perf_counter() - t0
+
+    for w in per_worker.values():
+        w['texts_per_sec'] = w['texts'] / w['busy_sec'] if w['busy_sec'] > 0 else 0.0
+
+    stats = {
+        'workers': workers,
+        'torch_threads': torch_threads,
+        'texts': len(texts),
+        'elapsed_sec': elapsed,
+        'texts_per_sec': len(texts) / elapsed if elapsed > 0 else 0.0,
+        'per_worker': per_worker,
+    }
+    _last_stats.clear()
+    _last_stats.update(stats)
+    return scores, errors, stats
+
+
+def last_stats() -> Dict:
+    """Statistiques du dernier appel à score_texts_parallel()."""
+    return dict(_last_stats)
@@ -1,6 +1,47 @@
 import pandas as pd
 import numpy as np
 
+# Codes compacts des signaux (int8) pour les calculs vectorisés
+SIGNAL_HOLD, SIGNAL_BUY, SIGNAL_SELL = 0, 1, -1
+SIGNAL_CODES = {'HOLD': SIGNAL_HOLD, 'BUY': SIGNAL_BUY, 'SELL': SIGNAL_SELL}
+
+
+def encode_signals(labels) -> np.ndarray:
+    """'BUY' / 'SELL' / 'HOLD' → codes int8 (toute autre valeur → HOLD)."""
+    labels = np.asarray(labels, dtype=object)
+    return np.where(labels == 'BUY', SIGNAL_BUY,
+                    np.where(labels == 'SELL', SIGNAL_SELL, SIGNAL_HOLD)).astype(np.int8)
+
+
+def decode_signals(codes) -> np.ndarray:
+    """Codes int8 → libellés 'BUY' / 'SELL' / 'HOLD'."""
+    codes = np.asarray(codes)
+    return np.where(codes == SIGNAL_BUY, 'BUY',
+                    np.where(codes == SIGNAL_SELL, 'SELL', 'HOLD')).astype(object)
+
+
+def signal_codes(ma, momentum, threshold, use_momentum=True) -> np.ndarray:
+    """
+    Logique de generate_signal() sur des tableaux NumPy (temps sur l'axe 0).
+
+    Tous les arguments sont diffusés (broadcasting) entre eux, ce qui permet
+    d'évaluer d'un coup plusieurs seuils / fenêtres / filtres momentum.
+    Applique aussi le filtre anti-répétition. Retourne des codes int8.
+    """
+    ma = np.asarray(ma)
+    momentum = np.asarray(momentum)
+    use_momentum = np.asarray(use_momentum, dtype=bool)
+
+    bull = (ma > threshold) & (~use_momentum | (momentum > 0))
+    bear = (ma < -threshold) & (~use_momentum | (momentum < 0))
+    codes = np.where(bear, SIGNAL_SELL, np.where(bull, SIGNAL_BUY, SIGNAL_HOLD)).astype(np.int8)
+
+    # Filtre : ne pas répéter le même signal consécutif
+    prev = np.empty_like(codes)
+    prev[:1] = SIGNAL_HOLD
+    prev[1:] = codes[:-1]
+    return np.where((codes == prev) & (codes != SIGNAL_HOLD), SIGNAL_HOLD, codes).astype(np.int8)
+
 
 def generate_signal(
     sentiment_df: pd.DataFrame,
@@ -44,20 +85,54 @@ def generate_signal(
     roll_std = df['sentiment_score'].rolling(30, min_periods=5).std().replace(0, 1)
     df['sentiment_zscore'] = (df['sentiment_score'] - roll_mean) / roll_std
 
-    # Condition de signal
-    bull_condition = df['sentiment_ma'] > threshold
-    bear_condition = df['sentiment_ma'] < -threshold
+    # Conditions de signal + filtre anti-répétition (évite le surtrading)
+    codes = signal_codes(df['sentiment_ma'].to_numpy(), df['sentiment_momentum'].to_numpy(),
+                         threshold, use_momentum)
+    df['signal'] = decode_signals(codes)
 
-    if use_momentum:
-        bull_condition &= df['sentiment_momentum'] > 0
-        bear_condition &= df['sentiment_momentum'] < 0
+    return df[['sentiment_score', 'sentiment_ma', 'sentiment_zscore', 'signal']]
 
-    df['signal'] = 'HOLD'
-    df.loc[bull_condition, 'signal'] = 'BUY'
-    df.loc[bear_condition, 'signal'] = 'SELL'
 
-    # Filtre : ne pas répéter le même signal consécutif (évite le surtrading)
-    prev_signal = df['signal'].shift(1)
-    df.loc[(df['signal'] == prev_signal) & (df['signal'] != 'HOLD'), 'signal'] = 'HOLD'
+def generate_signals_matrix(
+    sentiment_wide: pd.DataFrame,
+    threshold: float = 0.6,
+    ma_window: int = 7,
+    use_momentum: bool = True,
+    with_stats: bool = False
+):
+    """
+    Variante cross-sectionnelle de generate_signal() pour tout un univers.
 
-    return df[['sentiment_score', 'sentiment_ma', 'sentiment_zscore', 'signal']]
+    Les statistiques glissantes (MA, momentum 3 jours, z-score 30 jours) et
+    les signaux sont calculés en une passe sur la matrice date × ticker ;
+    chaque colonne donne exactement le résultat de generate_signal() sur le
+    ticker correspondant.
+
+    Paramètres
+    ----------
+    sentiment_wide : DataFrame date × ticker des scores de sentiment
+    threshold, ma_window, use_momentum : comme generate_signal()
+    with_stats     : retourne aussi les matrices sentiment_ma et sentiment_zscore
+
+    Retourne
+    --------
+    DataFrame date × ticker de codes int8 (SIGNAL_BUY / SIGNAL_SELL / SIGNAL_HOLD),
+    ou (codes, {'sentiment_ma': ..., 'sentiment_zscore': ...}) si with_stats
+    """
+    scores = sentiment_wide.astype(float)
+
+    ma = scores.rolling(ma_window, min_periods=1).mean()
+    momentum = scores.diff(3)
+    codes = signal_codes(ma.to_numpy(), momentum.to_numpy(), threshold, use_momentum)
+    codes = pd.DataFrame(codes, index=scores.index, columns=scores.columns)
+
+    if not with_stats:
+        return codes
+
+    roll_mean = scores.rolling(30, min_periods=5).mean()
+    roll_std = scores.rolling(30, min_periods=5).std().replace(0, 1)
+    stats = {
+        'sentiment_ma': ma,
+        'sentiment_zscore': (scores - roll_mean) / roll_std,
+    }
+    return codes, stats
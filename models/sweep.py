@@ -0,0 +1,86 @@
+import pandas as pd
+import numpy as np
+from typing import Sequence
+
+from models.signal_generator import signal_codes
+from models.backtest import _positions_from_signals
+from utils.metrics import compute_metrics_arrays
+
+
+def run_sweep(
+    sentiment_df: pd.DataFrame,
+    prices_df: pd.DataFrame,
+    thresholds: Sequence[float],
+    ma_windows: Sequence[int] = (7,),
+    momentum: Sequence[bool] = (True,),
+    costs: Sequence[float] = (0.001,),
+    risk_free_rate: float = 0.05
+) -> pd.DataFrame:
+    """
+    Balayage de paramètres : seuil × fenêtre MA × filtre momentum × coût.
+
+    Équivalent à enchaîner generate_signal() → run_backtest() → compute_metrics()
+    pour chaque combinaison, mais calculé sur des tableaux NumPy partagés :
+    une seule passe par fenêtre MA, tous les seuils / filtres / coûts en
+    parallèle sur les axes du tableau.
+
+    Paramètres
+    ----------
+    sentiment_df : sortie de aggregate_sentiment()
+    prices_df    : OHLCV
+    thresholds   : seuils de signal à tester
+    ma_windows   : fenêtres de lissage
+    momentum     : valeurs de use_momentum (True / False)
+    costs        : coûts de transaction par sens
+
+    Retourne
+    --------
+    DataFrame "tidy" : une ligne par combinaison, colonnes
+      threshold, ma_window, use_momentum, transaction_cost + métriques de compute_metrics()
+    """
+    thresholds = np.asarray(thresholds, dtype=float)
+    flags = np.asarray(momentum, dtype=bool)
+    cost_arr = np.asarray(costs, dtype=float)
+
+    score = sentiment_df['sentiment_score']
+    momentum_3d = score.diff(3).to_numpy()
+
+    # Alignement sur les jours de bourse communs (comme run_backtest)
+    common_idx = sentiment_df.index.intersection(prices_df.index)
+    rows = sentiment_df.index.get_indexer(common_idx)
+    daily_ret = prices_df.loc[common_idx, 'Close'].pct_change().fillna(0).to_numpy()
+
+    # Axes : (temps, seuil, momentum, coût)
+    t_axis = thresholds[None, :, None]
+    m_axis = flags[None, None, :]
+    c_axis = cost_arr[None, None, None, :]
+
+    results = []
+    for window in ma_windows:
+        ma = score.rolling(window, min_periods=1).mean().to_numpy()
+        codes = signal_codes(ma[:, None, None], momentum_3d[:, None, None], t_axis, m_axis)
+        position = _positions_from_signals(codes[rows])
+
+        # Position du jour J appliquée au rendement J+1 ; la 1re ligne du
+        # backtest est NaN (diff) et ignorée par compute_metrics
+        pos = position[:-1, ..., None].astype(float)
+        prev = np.concatenate([np.zeros_like(pos[:1]), pos[:-1]], axis=0)
+        trades = np.abs(pos - prev)
+        strategy_ret = pos * daily_ret[1:, None, None, None] - trades * c_axis
+
+        metrics = compute_metrics_arrays(
+            strategy_ret, daily_ret, np.broadcast_to(pos, strategy_ret.shape), risk_free_rate
+        )
+
+        grid_t, grid_m, grid_c = np.meshgrid(thresholds, flags, cost_arr, indexing='ij')
+        frame = pd.DataFrame({
+            'threshold': grid_t.ravel(),
+            'ma_window': window,
+            'use_momentum': grid_m.ravel(),
+            'transaction_cost': grid_c.ravel(),
+        })
+        for name, values in metrics.items():
+            frame[name] = np.broadcast_to(values, grid_t.shape).ravel()
+        results.append(frame)
+
+    return pd.concat(results, ignore_index=True)
@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-from typing import Dict
+from typing import Dict, Optional
 
 
 def compute_metrics(backtest_df: pd.DataFrame, risk_free_rate: float = 0.05) -> Dict:
@@ -66,3 +66,287 @@ def compute_metrics(backtest_df: pd.DataFrame, risk_free_rate: float = 0.05) ->
     metrics['nb_trades'] = int(trades.sum())
 
     return metrics
+
+
+def compute_metrics_arrays(
+    ret: np.ndarray,
+    ret_bh: np.ndarray,
+    position: np.ndarray,
+    risk_free_rate: float = 0.05
+) -> Dict[str, np.ndarray]:
+    """
+    Version vectorisée de compute_metrics() pour de nombreuses stratégies.
+
+    Le temps est sur l'axe 0 ; les autres axes (paramètres, tickers...) sont
+    traités en une seule passe. Les tableaux ne contiennent pas de NaN
+    (équivalent des .dropna() de compute_metrics).
+
+    Paramètres
+    ----------
+    ret            : rendements journaliers de la stratégie, shape (n, ...)
+    ret_bh         : rendements Buy & Hold, shape (n_bh,) ou compatible
+    position       : positions alignées sur ret (départ implicite à 0)
+    risk_free_rate : taux sans risque annualisé
+
+    Retourne
+    --------
+    dict de tableaux (shape = ret.shape[1:]) avec les mêmes clés que compute_metrics()
+    """
+    ret = np.asarray(ret, dtype=float)
+    ret_bh = np.asarray(ret_bh, dtype=float)
+    position = np.asarray(position, dtype=float)
+    n = ret.shape[0]
+    rf_daily = risk_free_rate / 252
+
+    def _sharpe(r):
+        excess = r - rf_daily
+        std = excess.std(axis=0, ddof=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(std > 1e-8, np.sqrt(252) * excess.mean(axis=0) / std, 0.0)
+
+    wealth = np.cumprod(1 + ret, axis=0)
+    total_return = wealth[-1] - 1
+    wealth = 1 + (wealth - 1)  # même arrondi que 1 + cumret dans compute_metrics
+    rolling_max = np.maximum.accumulate(wealth, axis=0)
+    max_dd = ((wealth - rolling_max) / rolling_max).min(axis=0)
+
+    ann_ret = (1 + total_return) ** (252 / max(n, 1)) - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        calmar = np.where(max_dd != 0, ann_ret / np.abs(max_dd), 0.0)
+
+    in_pos = position == 1
+    n_in_pos = in_pos.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        win_rate = np.where(n_in_pos > 0, (in_pos & (ret > 0)).sum(axis=0) / n_in_pos, 0.5)
+
+    prev = np.concatenate([np.zeros_like(position[:1]), position[:-1]], axis=0)
+    nb_trades = np.abs(position - prev).sum(axis=0).astype(np.int64)
+
+    return {
+        'total_return': total_return,
+        'sharpe': _sharpe(ret),
+        'sharpe_bh': np.broadcast_to(_sharpe(ret_bh), total_return.shape),
+        'volatility': ret.std(axis=0, ddof=1) * np.sqrt(252),
+        'max_dd': max_dd,
+        'calmar': calmar,
+        'win_rate': win_rate,
+        'nb_trades': nb_trades,
+    }
+
+
+# ── Métriques en flux ─────────────────────────────────────────────────────────
+# Mêmes métriques que compute_metrics(), mises à jour rendement par rendement
+# (ou tableau par tableau) sans garder la courbe de capital : moyenne / variance
+# de Welford, capital cumulé, plus haut et drawdown courants, compteurs de
+# jours gagnants et de trades. Deux accumulateurs de périodes consécutives
+# se fusionnent (merge), ce qui permet de traiter des tranches en parallèle.
+#
+# Pour que la fusion reste exacte, chaque accumulateur garde ses plus hauts
+# successifs (niveau, plus bas atteint avant, pire drawdown jusqu'au plus haut
+# suivant) : quelques dizaines de valeurs sur 10 ans, pas la courbe entière.
+
+class StreamingMetrics:
+    """
+    Accumulateur de compute_metrics() en flux.
+
+    Les rendements NaN sont ignorés (équivalent des .dropna()) ; les positions
+    comptent même si le rendement du jour est NaN, comme dans compute_metrics().
+
+    Exemple
+    -------
+    m = StreamingMetrics()
+    for ret, ret_bh, pos in flux:
+        m.update(ret, ret_bh, pos)
+    m.result()                     # même dict que compute_metrics()
+
+    parts = [StreamingMetrics.from_backtest(df.iloc[a:b]) for a, b in tranches]
+    functools.reduce(StreamingMetrics.merge, parts).result()
+    """
+
+    def __init__(self, risk_free_rate: float = 0.05):
+        self.risk_free_rate = risk_free_rate
+        # Welford : rendements stratégie et Buy & Hold
+        self.n, self.mean, self.m2 = 0, 0.0, 0.0
+        self.n_bh, self.mean_bh, self.m2_bh = 0, 0.0, 0.0
+        # Capital (base 1 au début de l'accumulateur) et drawdown
+        self.growth = 1.0
+        self.low = np.inf
+        self.max_dd = np.nan
+        self._levels = []   # plus hauts successifs du capital
+        self._lows = []     # plus bas du capital avant chaque plus haut
+        self._dds = []      # pire drawdown entre ce plus haut et le suivant
+        # Positions
+        self.n_in_pos = 0
+        self.wins = 0
+        self.nb_trades = 0
+        self.first_pos = None
+        self.last_pos = None
+
+    @classmethod
+    def from_backtest(cls, backtest_df: pd.DataFrame, risk_free_rate: float = 0.05) -> 'StreamingMetrics':
+        """Accumulateur initialisé sur une sortie de run_backtest() / run_portfolio_backtest()."""
+        m = cls(risk_free_rate)
+        m.update_arrays(backtest_df['daily_ret_strategy'].to_numpy(dtype=float),
+                        backtest_df['daily_ret_bh'].to_numpy(dtype=float),
+                        backtest_df['position'].to_numpy(dtype=float))
+        return m
+
+    # ── Mise à jour ───────────────────────────────────────────────────────────
+    def update(self, ret: float, ret_bh: float = np.nan, position: Optional[float] = None):
+        """Ajoute un jour : rendement stratégie, rendement Buy & Hold, position."""
+        if position is not None:
+            self._add_position(position, position, int(position == 1), int(position == 1 and ret > 0), 0)
+        if ret_bh == ret_bh:
+            self.n_bh, self.mean_bh, self.m2_bh = _welford_merge(
+                (self.n_bh, self.mean_bh, self.m2_bh), (1, ret_bh, 0.0))
+        if ret != ret:
+            return
+        self.n, self.mean, self.m2 = _welford_merge((self.n, self.mean, self.m2), (1, ret, 0.0))
+
+        self.growth *= 1 + ret
+        wealth = 1 + (self.growth - 1)  # même arrondi que 1 + cumret dans compute_metrics
+        if not self._levels or wealth > self._levels[-1]:
+            self._levels.append(wealth)
+            self._lows.append(self.low)
+            self._dds.append(0.0)
+            dd = 0.0
+        else:
+            peak = self._levels[-1]
+            dd = (wealth - peak) / peak
+            if dd < self._dds[-1]:
+                self._dds[-1] = dd
+        self.low = min(self.low, wealth)
+        self.max_dd = float(np.fmin(self.max_dd, dd))
+
+    def update_arrays(self, ret: np.ndarray, ret_bh: Optional[np.ndarray] = None,
+                      position: Optional[np.ndarray] = None):
+        """Ajoute une tranche de jours consécutifs (vectorisé) ; position alignée sur ret."""
+        ret = np.asarray(ret, dtype=float)
+        if position is not None:
+            position = np.asarray(position, dtype=float)
+            if len(position):
+                in_pos = position == 1
+                self._add_position(position[0], position[-1], int(in_pos.sum()),
+                                   int((in_pos & (ret > 0)).sum()), int(np.abs(np.diff(position)).sum()))
+        if ret_bh is not None:
+            ret_bh = np.asarray(ret_bh, dtype=float)
+            self.n_bh, self.mean_bh, self.m2_bh = _welford_merge(
+                (self.n_bh, self.mean_bh, self.m2_bh), _welford_chunk(ret_bh[~np.isnan(ret_bh)]))
+
+        ret = ret[~np.isnan(ret)]
+        if not len(ret):
+            return
+        self.n, self.mean, self.m2 = _welford_merge((self.n, self.mean, self.m2), _welford_chunk(ret))
+
+        # Produit cumulé amorcé par le capital courant : même arrondi qu'au fil de l'eau
+        growth = np.cumprod(np.concatenate([[self.growth], 1 + ret]))[1:]
+        wealth = 1 + (growth - 1)
+        peak = self._levels[-1] if self._levels else -np.inf
+        running = np.maximum.accumulate(np.concatenate([[peak], wealth]))
+        new_high = wealth > running[:-1]
+        peaks = running[1:]
+        dd = (wealth - peaks) / peaks
+
+        starts = np.flatnonzero(new_high)
+        head = starts[0] if len(starts) else len(wealth)
+        if head:  # suite du dernier plus haut déjà connu
+            self._dds[-1] = min(self._dds[-1], float(dd[:head].min()))
+        if len(starts):
+            lows = np.minimum.accumulate(np.concatenate([[self.low], wealth]))[:-1]
+            self._levels += wealth[starts].tolist()
+            self._lows += lows[starts].tolist()
+            self._dds += np.minimum.reduceat(dd, starts).tolist()
+
+        self.growth = float(growth[-1])
+        self.low = min(self.low, float(wealth.min()))
+        self.max_dd = float(np.fmin(self.max_dd, dd.min()))
+
+    def _add_position(self, first: float, last: float, n_in_pos: int, wins: int, trades: int):
+        """Compteurs de position d'une période qui suit celle déjà accumulée."""
+        if self.last_pos is not None:
+            trades += abs(first - self.last_pos)
+        else:
+            self.first_pos = first
+        self.last_pos = last
+        self.n_in_pos += n_in_pos
+        self.wins += wins
+        self.nb_trades += trades
+
+    # ── Fusion ────────────────────────────────────────────────────────────────
+    def merge(self, other: 'StreamingMetrics') -> 'StreamingMetrics':
+        """
+        Ajoute à self la période suivante, accumulée séparément par other
+        (tranches traitées en parallèle). Modifie et retourne self.
+        """
+        if other.first_pos is not None:
+            self._add_position(other.first_pos, other.last_pos,
+                               other.n_in_pos, other.wins, other.nb_trades)
+        self.n_bh, self.mean_bh, self.m2_bh = _welford_merge(
+            (self.n_bh, self.mean_bh, self.m2_bh), (other.n_bh, other.mean_bh, other.m2_bh))
+        if not other.n:
+            return self
+        self.n, self.mean, self.m2 = _welford_merge((self.n, self.mean, self.m2), (other.n, other.mean, other.m2))
+
+        g = self.growth
+        levels = np.asarray(other._levels) * g
+        if self._levels:
+            # Les plus hauts de other sous le plus haut courant n'en sont plus :
+            # leurs jours sont des drawdowns mesurés depuis ce plus haut
+            peak = self._levels[-1]
+            k = int(np.searchsorted(levels, peak, side='right'))
+            low_before = other._lows[k] * g if k < len(levels) else other.low * g
+            self._dds[-1] = min(self._dds[-1], (low_before - peak) / peak)
+            self.max_dd = float(np.fmin(self.max_dd, self._dds[-1]))
+        else:
+            k = 0
+        self._levels += levels[k:].tolist()
+        self._lows += np.minimum(np.asarray(other._lows[k:]) * g, self.low).tolist()
+        self._dds += other._dds[k:]
+        if k < len(levels):
+            self.max_dd = float(np.fmin(self.max_dd, min(other._dds[k:])))
+
+        self.growth = g * other.growth
+        self.low = min(self.low, other.low * g)
+        return self
+
+    # ── Résultat ──────────────────────────────────────────────────────────────
+    def result(self) -> Dict:
+        """Mêmes clés et mêmes conventions (cas vides compris) que compute_metrics()."""
+        rf_daily = self.risk_free_rate / 252
+
+        def _sharpe(n, mean, m2):
+            std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+            return float(np.sqrt(252) * (mean - rf_daily) / std if std > 1e-8 else 0.0)
+
+        metrics = {}
+        metrics['total_return'] = float(self.growth - 1) if self.n else 0.0
+        metrics['sharpe'] = _sharpe(self.n, self.mean, self.m2)
+        metrics['sharpe_bh'] = _sharpe(self.n_bh, self.mean_bh, self.m2_bh)
+        metrics['volatility'] = float(np.sqrt(self.m2 / (self.n - 1)) * np.sqrt(252)) if self.n > 1 else np.nan
+        metrics['max_dd'] = float(self.max_dd)
+        ann_ret = (1 + metrics['total_return']) ** (252 / max(self.n, 1)) - 1
+        metrics['calmar'] = float(ann_ret / abs(metrics['max_dd'])) if metrics['max_dd'] != 0 else 0.0
+        metrics['win_rate'] = float(self.wins / self.n_in_pos) if self.n_in_pos else 0.5
+        metrics['nb_trades'] = int(self.nb_trades)
+        return metrics
+
+
+def _welford_chunk(x: np.ndarray) -> tuple:
+    """(n, moyenne, somme des carrés des écarts) d'une tranche."""
+    if not len(x):
+        return 0, 0.0, 0.0
+    mean = float(x.mean())
+    return len(x), mean, float(((x - mean) ** 2).sum())
+
+
+def _welford_merge(a: tuple, b: tuple) -> tuple:
+    """Combinaison de deux états (n, moyenne, M2) (Chan et al.)."""
+    n_a, mean_a, m2_a = a
+    n_b, mean_b, m2_b = b
+    n = n_a + n_b
+    if not n_b:
+        return a
+    if not n_a:
+        return b
+    delta = mean_b - mean_a
+    return n, mean_a + delta * n_b / n, m2_a + m2_b + delta * delta * n_a * n_b / n
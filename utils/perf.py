@@ -0,0 +1,136 @@
+import os
+import sys
+import json
+import time
+import uuid
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ── Instrumentation légère du pipeline ────────────────────────────────────────
+# Une Trace regroupe les étapes d'une analyse (temps, volumes, pic mémoire).
+# Elle est portée par une ContextVar : les fetchers enregistrent leurs étapes
+# sans paramètre supplémentaire, et stage() ne coûte presque rien hors trace.
+# Les threads de fetch_all reçoivent une copie du contexte (cf. in_context).
+#
+# Export : logger "sentiment_trader.perf" (une ligne JSON par étape) et, si
+# PERF_LOG_FILE est défini, ajout des mêmes lignes à ce fichier (JSONL).
+
+logger = logging.getLogger("sentiment_trader.perf")
+LOG_FILE = os.path.expanduser(os.getenv("PERF_LOG_FILE", ""))
+
+_current = contextvars.ContextVar("perf_trace", default=None)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Pic de mémoire résidente du process depuis son lancement (Mo)."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Octets sous macOS, kilo-octets sous Linux
+    return rss / 2**20 if sys.platform == "darwin" else rss / 1024
+
+
+class Trace:
+    """Étapes chronométrées d'une exécution du pipeline (thread-safe)."""
+
+    def __init__(self, **meta):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.meta = meta
+        self.records: List[Dict] = []
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, record: Dict):
+        with self._lock:
+            self.records.append(record)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._t0
+
+    def to_records(self) -> List[Dict]:
+        """Étapes triées par début, avec run_id et méta-données de la trace."""
+        with self._lock:
+            records = sorted(self.records, key=lambda r: r['start'])
+        return [{'run_id': self.run_id, **self.meta, **r} for r in records]
+
+    def to_jsonl(self) -> str:
+        return "".join(json.dumps(r, default=str) + "\n" for r in self.to_records())
+
+    def emit(self):
+        """Publie les étapes dans le logger perf (et PERF_LOG_FILE si défini)."""
+        lines = self.to_jsonl()
+        for line in lines.splitlines():
+            logger.info(line)
+        if LOG_FILE:
+            try:
+                with open(LOG_FILE, "a", encoding="utf-8") as f:
+                    f.write(lines)
+            except OSError as e:
+                print(f"Perf log error: {e}")
+
+
+@contextmanager
+def trace(**meta):
+    """Active une nouvelle Trace pour le contexte courant."""
+    t = Trace(**meta)
+    token = _current.set(t)
+    try:
+        yield t
+    finally:
+        _current.reset(token)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+@contextmanager
+def stage(name: str, **attrs):
+    """
+    Chronomètre une étape de la trace courante.
+
+    Le dict produit peut être complété dans le bloc (volumes, taux de cache) ;
+    une exception est enregistrée dans 'error' puis relevée. Sans trace
+    active, le bloc s'exécute normalement et rien n'est enregistré.
+
+    Exemple
+    -------
+    with stage("news.api", ticker=ticker) as s:
+        raw = ...
+        s['articles'] = len(raw)
+    """
+    t = _current.get()
+    record = {'stage': name, **attrs}
+    if t is None:
+        yield record
+        return
+
+    start = time.perf_counter()
+    try:
+        yield record
+    except BaseException as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        record['start'] = round(start - t._t0, 6)
+        record['seconds'] = round(time.perf_counter() - start, 6)
+        record['peak_rss_mb'] = peak_rss_mb()
+        t.add(record)
+
+
+def in_context(fn):
+    """
+    Enveloppe fn pour l'exécuter dans une copie du contexte courant (trace
+    comprise) ; à utiliser pour les tâches soumises à un ThreadPoolExecutor.
+    """
+    ctx = contextvars.copy_context()
+    return lambda *args, **kwargs: ctx.run(fn, *args, **kwargs)